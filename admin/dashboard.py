@@ -15,6 +15,8 @@ from core.services.auth_service import AuthService
 from core.services.financial_service import FinancialService
 from core.services.subscription_service import SubscriptionService
 from config.supabase_config import get_supabase_client
+from services.admin_service import AdminService
+from services.repository import Repository, SUBSCRIPTION_LIST
 
 class AdminDashboard:
     """Admin dashboard for BusinessThis"""
@@ -24,6 +26,8 @@ class AdminDashboard:
         self.financial_service = FinancialService()
         self.subscription_service = SubscriptionService()
         self.supabase = get_supabase_client()
+        self.admin_service = AdminService()
+        self.repository = Repository(self.supabase)
     
     def run(self):
         """Run the admin dashboard"""
@@ -74,6 +78,15 @@ class AdminDashboard:
             churn_rate = self.get_churn_rate()
             st.metric("Churn Rate", f"{churn_rate:.1f}%")
         
+        # Daily activity from the rollup tables
+        st.subheader("Daily Activity")
+        days = st.selectbox("Range", [7, 30, 90, 365], index=1)
+        daily_metrics = self.get_daily_activity(days)
+        if daily_metrics is not None:
+            st.line_chart(daily_metrics)
+        else:
+            st.info("No activity data")
+        
         # Recent activity
         st.subheader("Recent Activity")
         recent_activity = self.get_recent_activity()
@@ -96,14 +109,33 @@ class AdminDashboard:
         with col3:
             search_term = st.text_input("Search by email")
         
+        # Reset paging whenever the filters change
+        filters = (subscription_filter, status_filter, search_term)
+        if st.session_state.get('user_filters') != filters:
+            st.session_state['user_filters'] = filters
+            st.session_state['user_cursors'] = [None]
+        cursors = st.session_state['user_cursors']
+        
         # Get users
-        users = self.get_users(subscription_filter, status_filter, search_term)
+        page = self.get_users(subscription_filter, status_filter, search_term, cursors[-1])
+        users = page.get('users', [])
         
         if users:
             df = pd.DataFrame(users)
             st.dataframe(df, use_container_width=True)
+            st.caption(f"Page {len(cursors)} · about {page['estimated_total']:,} matching users")
         else:
             st.info("No users found")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if len(cursors) > 1 and st.button("← Previous"):
+                cursors.pop()
+                st.rerun()
+        with col2:
+            if page.get('next_cursor') and st.button("Next →"):
+                cursors.append(page['next_cursor'])
+                st.rerun()
     
     def show_subscriptions(self):
         """Show subscription management"""
@@ -220,25 +252,26 @@ class AdminDashboard:
         except:
             return []
     
-    def get_users(self, subscription_filter, status_filter, search_term):
-        """Get filtered users"""
+    def get_users(self, subscription_filter, status_filter, search_term, cursor=None):
+        """Get one page of filtered users"""
         try:
-            query = self.supabase.table('users').select('*')
-            
-            if subscription_filter != "All":
-                query = query.eq('subscription_tier', subscription_filter.lower())
-            
-            if status_filter != "All":
-                is_active = status_filter == "Active"
-                query = query.eq('is_active', is_active)
+            result = self.admin_service.get_user_list(
+                limit=50,
+                search=search_term,
+                cursor=cursor,
+                subscription_tier=None if subscription_filter == "All" else subscription_filter.lower(),
+                is_active=None if status_filter == "All" else status_filter == "Active"
+            )
+            if 'error' in result:
+                return {'users': []}
             
-            if search_term:
-                query = query.ilike('email', f'%{search_term}%')
-            
-            result = query.execute()
-            return result.data
+            return {
+                'users': result['users'],
+                'next_cursor': result['pagination']['next_cursor'],
+                'estimated_total': result['pagination']['estimated_total']
+            }
         except:
-            return []
+            return {'users': []}
     
     def get_subscription_count(self, tier):
         """Get subscription count by tier"""
@@ -251,41 +284,40 @@ class AdminDashboard:
     def get_subscription_details(self):
         """Get subscription details"""
         try:
-            result = self.supabase.table('subscriptions').select('*').execute()
-            return result.data
+            return self.repository.fetch(SUBSCRIPTION_LIST)
         except:
             return []
     
+    def get_daily_activity(self, days):
+        """Get daily signups, cancellations, AI calls and achieved goals"""
+        try:
+            result = self.admin_service.get_daily_metrics(
+                days, ['signups', 'cancellations', 'ai_calls', 'goals_achieved']
+            )
+            if 'error' in result:
+                return None
+            
+            data = {metric: values['total'] for metric, values in result['series'].items()}
+            return pd.DataFrame(data, index=pd.to_datetime(result['dates']))
+        except:
+            return None
+    
     def get_financial_health_distribution(self):
         """Get financial health score distribution"""
         try:
-            result = self.supabase.table('financial_health_scores').select('overall_score').execute()
-            if not result.data:
+            distribution = self.admin_service.get_health_score_distribution()
+            if 'error' in distribution or not any(distribution.values()):
                 return []
             
-            # Group scores into ranges
-            ranges = {
-                'Excellent (90-100)': 0,
-                'Good (75-89)': 0,
-                'Fair (60-74)': 0,
-                'Poor (40-59)': 0,
-                'Critical (0-39)': 0
+            labels = {
+                'excellent': 'Excellent (90-100)',
+                'good': 'Good (75-89)',
+                'fair': 'Fair (60-74)',
+                'poor': 'Poor (40-59)',
+                'critical': 'Critical (0-39)'
             }
             
-            for score_data in result.data:
-                score = score_data['overall_score']
-                if score >= 90:
-                    ranges['Excellent (90-100)'] += 1
-                elif score >= 75:
-                    ranges['Good (75-89)'] += 1
-                elif score >= 60:
-                    ranges['Fair (60-74)'] += 1
-                elif score >= 40:
-                    ranges['Poor (40-59)'] += 1
-                else:
-                    ranges['Critical (0-39)'] += 1
-            
-            return [{'health_level': k, 'count': v} for k, v in ranges.items()]
+            return [{'health_level': labels[bucket], 'count': count} for bucket, count in distribution.items()]
         except:
             return []
     
@@ -34,6 +34,7 @@ from core.utils.validators import validate_email, validate_financial_data, valid
 from core.utils.decorators import require_auth, require_subscription
 from core.utils.security import rate_limit, add_security_headers, log_security_event
 from core.utils.error_handler import handle_errors, ValidationError, AuthenticationError
+from core.utils.identity_map import add_identity_map_headers
 
 # Validate environment before starting
 try:
@@ -57,6 +58,8 @@ CORS(app, origins=cors_origins)
 # Add security headers to all responses
 @app.after_request
 def after_request(response):
+    if app.debug:
+        response = add_identity_map_headers(response)
     return add_security_headers(response)
 
 # Initialize services
@@ -73,6 +76,10 @@ course_service = CourseService()
 multi_user_service = MultiUserService()
 advisor_service = AdvisorService()
 
+# Keep cached profiles and goals fresh across workers when realtime is available;
+# subscribes in the background so worker startup does not wait for it
+financial_service.start_cache_invalidation()
+
 # JWT token configuration
 JWT_SECRET = app.config['SECRET_KEY']
 JWT_ALGORITHM = 'HS256'
@@ -101,6 +108,7 @@ def verify_jwt_token(token: str) -> dict:
 from backend.routes.auth import auth_bp
 from backend.routes.profile import profile_bp
 from backend.routes.goals import goals_bp
+from backend.routes.debts import debts_bp
 from backend.routes.calculator import calculator_bp
 from backend.routes.subscription import subscription_bp
 from backend.routes.investment import investment_bp
@@ -116,6 +124,7 @@ from backend.routes.advisor import advisor_bp
 app.register_blueprint(auth_bp, url_prefix='/api/auth')
 app.register_blueprint(profile_bp, url_prefix='/api/financial-profile')
 app.register_blueprint(goals_bp, url_prefix='/api/savings-goals')
+app.register_blueprint(debts_bp, url_prefix='/api/debts')
 app.register_blueprint(calculator_bp, url_prefix='/api/calculator')
 app.register_blueprint(subscription_bp, url_prefix='/api/subscription')
 app.register_blueprint(investment_bp, url_prefix='/api/investment')
@@ -181,6 +190,17 @@ def supabase_health_check():
             'version': '2.22.2'
         }), 503
 
+@app.route('/api/health/cache', methods=['GET'])
+def cache_health_check():
+    """Profile, goal and calculation cache statistics"""
+    from services.financial_service import get_cache_stats
+    from services.investment_service import get_memo_stats
+    return jsonify({
+        'cache': get_cache_stats(),
+        'investment_memo': get_memo_stats(),
+        'timestamp': datetime.utcnow().isoformat()
+    }), 200
+
 @app.route('/api/health/ollama', methods=['GET'])
 def ollama_health_check():
     """Check Ollama service health"""
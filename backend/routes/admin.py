@@ -18,20 +18,53 @@ def get_admin_dashboard():
     result = admin_service.get_dashboard_metrics()
     return jsonify({'dashboard': result}), 200
 
+@admin_bp.route('/metrics/daily', methods=['GET'])
+@require_auth
+@handle_errors
+def get_admin_daily_metrics():
+    """Get per-day metric series for dashboard charts"""
+    user_id = request.user_id
+    if not admin_service.is_admin(user_id):
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    days = int(request.args.get('days', 30))
+    metrics = [metric for metric in request.args.get('metrics', '').split(',') if metric]
+    
+    result = admin_service.get_daily_metrics(days, metrics or None)
+    return jsonify({'metrics': result}), 200
+
+@admin_bp.route('/analytics/usage', methods=['GET'])
+@require_auth
+@handle_errors
+def get_admin_usage_analytics():
+    """Get estimated unique users and top AI features/spending categories"""
+    user_id = request.user_id
+    if not admin_service.is_admin(user_id):
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    days = int(request.args.get('days', 30))
+    k = int(request.args.get('k', 10))
+    
+    result = admin_service.get_usage_analytics(days, k)
+    return jsonify({'analytics': result}), 200
+
 @admin_bp.route('/users', methods=['GET'])
 @require_auth
 @handle_errors
 def get_admin_users():
-    """Get paginated user list"""
+    """Get user list page by page (pass ``cursor`` from the previous page)"""
     user_id = request.user_id
     if not admin_service.is_admin(user_id):
         return jsonify({'error': 'Admin access required'}), 403
     
-    page = int(request.args.get('page', 1))
     limit = int(request.args.get('limit', 50))
     search = request.args.get('search', '')
+    cursor = request.args.get('cursor')
+    tier = request.args.get('tier')
     
-    result = admin_service.get_user_list(page, limit, search)
+    result = admin_service.get_user_list(limit, search, cursor, tier)
+    if result.get('error') == 'Invalid cursor':
+        return jsonify({'error': 'Invalid cursor'}), 400
     return jsonify({'users': result}), 200
 
 @admin_bp.route('/users/<user_id>', methods=['GET'])
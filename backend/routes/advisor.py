@@ -92,6 +92,23 @@ def generate_client_report(client_id):
     result = advisor_service.generate_client_report(user_id, client_id, report_type)
     return jsonify({'report': result}), 200
 
+@advisor_bp.route('/clients/goal-projections', methods=['POST'])
+@require_auth
+@handle_errors
+def project_client_goals():
+    """Project goal completion for many clients at once"""
+    user_id = request.user_id
+    data = request.get_json()
+    
+    result = advisor_service.project_client_goals(
+        user_id,
+        data.get('clients', []),
+        data.get('annual_rate', 0.0)
+    )
+    if 'error' in result:
+        return jsonify(result), 400
+    return jsonify({'projections': result}), 200
+
 @advisor_bp.route('/dashboard', methods=['GET'])
 @require_auth
 @handle_errors
@@ -3,12 +3,36 @@ from core.utils.decorators import require_auth, require_subscription
 from core.utils.error_handler import handle_errors
 from services.ai_service import AIService
 from services.financial_service import FinancialService
+from services.analytics_sketch_service import get_sketch_service
 
 
 ai_bp = Blueprint('ai', __name__)
 ai_service = AIService()
 financial_service = FinancialService()
 
+# View name -> ai_usage.request_type, so live sketch counts and the ones
+# backfilled from ai_usage land under the same feature names
+AI_REQUEST_TYPES = {
+    'get_ai_coaching': 'coaching',
+    'get_spending_recommendations': 'spending',
+    'get_daily_tip': 'daily_tip',
+    'get_goal_analysis': 'goal_analysis',
+    'get_investment_advice': 'investment_advice',
+}
+
+
+@ai_bp.after_request
+def track_ai_usage(response):
+    """Feed successful AI requests into the usage sketches"""
+    user_id = getattr(request, 'user_id', None)
+    request_type = AI_REQUEST_TYPES.get((request.endpoint or '').split('.')[-1])
+    if response.status_code == 200 and user_id and request_type:
+        try:
+            get_sketch_service().record_ai_usage(user_id, request_type)
+        except Exception:
+            pass
+    return response
+
 
 @ai_bp.route('/coaching', methods=['POST'])
 @require_auth
@@ -39,7 +63,8 @@ def get_spending_recommendations():
         return jsonify({'error': 'Financial profile not found'}), 404
     profile = profile_response['profile']
     try:
-        recent_transactions = financial_service.get_recent_transactions(user_id, limit=5)
+        # Spending totals cover the whole frame; the prompt lists only the latest transactions
+        recent_transactions = financial_service.get_transaction_frame(user_id)
     except Exception:
         recent_transactions = []
     result = ai_service.get_spending_recommendations(profile, recent_transactions)
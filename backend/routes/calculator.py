@@ -26,6 +26,17 @@ def calculate_safe_spend():
     return jsonify({'safe_spending': result}), 200
 
 
+@calculator_bp.route('/safe-spend/batch', methods=['POST'])
+@require_auth
+@handle_errors
+def calculate_safe_spend_batch():
+    data = request.get_json() or {}
+    result = financial_service.calculate_safe_spending_batch(data)
+    if 'error' in result:
+        return jsonify(result), 400
+    return jsonify({'safe_spending': result}), 200
+
+
 @calculator_bp.route('/financial-health', methods=['GET'])
 @require_auth
 @handle_errors
@@ -35,3 +46,14 @@ def calculate_financial_health():
     return jsonify({'financial_health': result}), 200
 
 
+@calculator_bp.route('/financial-health/trend', methods=['GET'])
+@require_auth
+@handle_errors
+def get_financial_health_trend():
+    user_id = request.user_id
+    result = financial_service.get_financial_health_trend(user_id, request.args.get('points', 12, type=int))
+    if 'error' in result:
+        return jsonify(result), 400
+    return jsonify({'financial_health_trend': result}), 200
+
+
@@ -0,0 +1,79 @@
+from flask import Blueprint, request, jsonify
+from core.utils.decorators import require_auth
+from core.utils.error_handler import handle_errors
+from models.debt import Debt
+from services.debt_service import DebtService
+
+
+debts_bp = Blueprint('debts', __name__)
+debt_service = DebtService()
+
+
+@debts_bp.route('', methods=['GET'])
+@require_auth
+@handle_errors
+def get_debts():
+    user_id = request.user_id
+    debts = debt_service.get_debts(user_id)
+    return jsonify({'debts': [debt.to_dict() for debt in debts]}), 200
+
+
+@debts_bp.route('', methods=['POST'])
+@require_auth
+@handle_errors
+def create_debt():
+    user_id = request.user_id
+    data = request.get_json()
+    if not data.get('name') or data.get('balance') is None:
+        return jsonify({'error': 'Debt name and balance are required'}), 400
+
+    result = debt_service.create_debt(user_id, data)
+    if result['success']:
+        return jsonify({'message': 'Debt created successfully', 'debt': result['debt']}), 201
+    return jsonify({'error': result['error']}), 400
+
+
+@debts_bp.route('/<debt_id>', methods=['PUT'])
+@require_auth
+@handle_errors
+def update_debt(debt_id):
+    user_id = request.user_id
+    data = request.get_json()
+    result = debt_service.update_debt(user_id, debt_id, data)
+    if result['success']:
+        return jsonify({'message': 'Debt updated successfully', 'debt': result['debt']}), 200
+    return jsonify({'error': result['error']}), 400
+
+
+@debts_bp.route('/<debt_id>', methods=['DELETE'])
+@require_auth
+@handle_errors
+def delete_debt(debt_id):
+    user_id = request.user_id
+    result = debt_service.delete_debt(user_id, debt_id)
+    if result['success']:
+        return jsonify({'message': 'Debt deleted successfully'}), 200
+    return jsonify({'error': result['error']}), 400
+
+
+@debts_bp.route('/payoff-plan', methods=['POST'])
+@require_auth
+@handle_errors
+def compare_payoff_strategies():
+    user_id = request.user_id
+    data = request.get_json() or {}
+    if data.get('debts'):
+        # What-if debts from the request instead of the stored ones
+        debts = [Debt.from_dict({'id': str(i), 'user_id': user_id, 'name': f'Debt {i + 1}', **debt}) for i, debt in enumerate(data['debts'])]
+    else:
+        debts = debt_service.get_debts(user_id)
+
+    result = debt_service.compare_payoff_strategies(
+        debts,
+        data.get('extra_payments'),
+        data.get('strategies'),
+        data.get('custom_order')
+    )
+    if 'error' in result:
+        return jsonify(result), 400
+    return jsonify({'payoff_plan': result}), 200
@@ -32,6 +32,38 @@ def create_savings_goal():
     return jsonify({'error': result['error']}), 400
 
 
+@goals_bp.route('/bulk', methods=['POST'])
+@require_auth
+@handle_errors
+def create_savings_goals_bulk():
+    user_id = request.user_id
+    data = request.get_json()
+    goals = data.get('goals')
+    if not goals or not isinstance(goals, list):
+        return jsonify({'error': 'A list of goals is required'}), 400
+
+    result = financial_service.create_savings_goals(user_id, goals)
+    if 'error' in result:
+        return jsonify({'error': result['error']}), 400
+    status = 201 if result['success'] else 207
+    return jsonify(result), status
+
+
+@goals_bp.route('/projection', methods=['GET'])
+@require_auth
+@handle_errors
+def project_savings_goals():
+    user_id = request.user_id
+    result = financial_service.project_savings_goals(
+        user_id,
+        annual_rate=request.args.get('annual_rate', 0.0, type=float),
+        monthly_surplus=request.args.get('monthly_surplus', type=float)
+    )
+    if 'error' in result:
+        return jsonify(result), 400
+    return jsonify({'projection': result}), 200
+
+
 @goals_bp.route('/<goal_id>', methods=['PUT'])
 @require_auth
 @handle_errors
@@ -23,12 +23,48 @@ def calculate_asset_allocation():
     return jsonify({'asset_allocation': result}), 200
 
 
+@investment_bp.route('/glide-path', methods=['POST'])
+@require_auth
+@require_subscription('premium')
+@handle_errors
+def get_glide_path():
+    data = request.get_json()
+    result = investment_service.get_glide_path(
+        data.get('current_age', 30),
+        data.get('retirement_age', 65),
+        data.get('risk_tolerance'),
+        data.get('investment_amount', 0),
+        data.get('rebalancing')
+    )
+    if 'error' in result:
+        return jsonify(result), 400
+    return jsonify({'glide_path': result}), 200
+
+
 @investment_bp.route('/retirement-planning', methods=['POST'])
 @require_auth
 @require_subscription('premium')
 @handle_errors
 def calculate_retirement_planning():
     data = request.get_json()
+    if request.args.get('mode') == 'montecarlo':
+        result = investment_service.simulate_retirement_monte_carlo(
+            data.get('current_age', 30),
+            data.get('retirement_age', 65),
+            data.get('current_savings', 0),
+            data.get('monthly_income', 5000),
+            data.get('desired_retirement_income', 0),
+            monthly_contribution=data.get('monthly_contribution'),
+            annual_return=data.get('annual_return', 0.07),
+            annual_volatility=data.get('annual_volatility', 0.15),
+            distribution=data.get('distribution', 'normal'),
+            paths=data.get('paths', 10000),
+            seed=data.get('seed')
+        )
+        if 'error' in result:
+            return jsonify(result), 400
+        return jsonify({'retirement_planning': result}), 200
+
     result = investment_service.calculate_retirement_needs(
         data.get('current_age', 30),
         data.get('retirement_age', 65),
@@ -53,6 +89,24 @@ def calculate_compound_interest():
     return jsonify({'compound_interest': result}), 200
 
 
+@investment_bp.route('/compound-interest/schedule', methods=['POST'])
+@require_auth
+@handle_errors
+def get_compound_interest_schedule():
+    data = request.get_json()
+    result = investment_service.get_compound_interest_schedule(
+        data.get('principal', 0),
+        data.get('monthly_contribution', 0),
+        data.get('annual_rate', 0.07),
+        data.get('years', 10),
+        offset=request.args.get('offset', 0, type=int),
+        limit=request.args.get('limit', 120, type=int)
+    )
+    if 'error' in result:
+        return jsonify(result), 400
+    return jsonify({'compound_interest_schedule': result}), 200
+
+
 @investment_bp.route('/tax-optimization', methods=['POST'])
 @require_auth
 @require_subscription('premium')
@@ -63,17 +117,46 @@ def calculate_tax_optimization():
         data.get('income', 50000),
         data.get('filing_status', 'single'),
         data.get('deductions', 0),
-        data.get('credits', 0)
+        data.get('credits', 0),
+        data.get('tax_year')
     )
     return jsonify({'tax_optimization': result}), 200
 
 
+@investment_bp.route('/tax-curve', methods=['POST'])
+@require_auth
+@require_subscription('premium')
+@handle_errors
+def calculate_tax_curve():
+    data = request.get_json()
+    result = investment_service.calculate_tax_curve(
+        data.get('filing_status', 'single'),
+        data.get('tax_year'),
+        data.get('incomes'),
+        data.get('deductions', 0),
+        data.get('credits', 0)
+    )
+    if 'error' in result:
+        return jsonify(result), 400
+    return jsonify({'tax_curve': result}), 200
+
+
 @investment_bp.route('/what-if-scenarios', methods=['POST'])
 @require_auth
 @require_subscription('premium')
 @handle_errors
 def calculate_what_if_scenarios():
     data = request.get_json()
+    if request.args.get('mode') == 'grid':
+        result = investment_service.calculate_what_if_grid(
+            data.get('base_income', 5000),
+            data.get('base_expenses', 3000),
+            data.get('grid', {})
+        )
+        if 'error' in result:
+            return jsonify(result), 400
+        return jsonify({'what_if_grid': result}), 200
+
     result = investment_service.calculate_what_if_scenarios(
         data.get('base_income', 5000),
         data.get('base_expenses', 3000),
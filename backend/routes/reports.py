@@ -64,7 +64,8 @@ def generate_email_summary():
     goals_response, goals_status = financial_service.get_savings_goals(user_id)
     goals = goals_response if goals_status == 200 else []
     try:
-        transactions = financial_service.get_user_transactions(user_id)
+        # Columnar frame: the summary only aggregates spending per category
+        transactions = financial_service.get_transaction_frame(user_id)
     except Exception:
         transactions = []
     summary = reports_service.generate_email_summary(profile, goals, transactions)
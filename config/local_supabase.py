@@ -0,0 +1,668 @@
+"""
+Local SQLite-backed Supabase stand-in for BusinessThis
+Implements the PostgREST query-builder surface used by the services so the
+backend can be exercised and benchmarked without a live Supabase project.
+
+Enable it for the whole app with SUPABASE_LOCAL_DB=:memory: (or a file path).
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+from config.query_audit import audit_select
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCHEMA_PATH = Path(__file__).parent.parent / 'database' / 'schema-fixed.sql'
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+# Postgres -> SQLite type translations applied to CREATE TABLE statements
+# (type keywords are upper case in the schema, column names are lower case)
+_TYPE_TRANSLATIONS = [
+    (re.compile(r'UUID\s+DEFAULT\s+uuid_generate_v4\(\)'), 'TEXT'),
+    (re.compile(r'TIMESTAMP\s+WITH\s+TIME\s+ZONE\s+DEFAULT\s+NOW\(\)'),
+     "TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))"),
+    (re.compile(r'TIMESTAMP\s+WITH\s+TIME\s+ZONE'), 'TEXT'),
+    (re.compile(r'DEFAULT\s+NOW\(\)'), "DEFAULT (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))"),
+    (re.compile(r'\bDECIMAL\(\d+\s*,\s*\d+\)'), 'REAL'),
+    (re.compile(r'\bVARCHAR\(\d+\)'), 'TEXT'),
+    (re.compile(r'\b(UUID|JSONB|INET|DATE)\b'), 'TEXT'),
+]
+
+_FILTER_OPERATORS = {
+    'eq': '=',
+    'neq': '!=',
+    'gt': '>',
+    'gte': '>=',
+    'lt': '<',
+    'lte': '<=',
+    'like': 'LIKE',
+}
+
+def _quote(identifier: str) -> str:
+    """Quote a column or table name, rejecting anything that is not an identifier"""
+    if not _IDENTIFIER.match(identifier):
+        raise ValueError(f"Invalid identifier: {identifier}")
+    return f'"{identifier}"'
+
+def _split_top_level(text: str) -> List[str]:
+    """Split on commas that are not inside parentheses or double quotes"""
+    parts, depth, current, quoted, previous = [], 0, '', False, ''
+    for char in text:
+        if char == '"' and previous != '\\':
+            quoted = not quoted
+        elif not quoted and char == '(':
+            depth += 1
+        elif not quoted and char == ')':
+            depth -= 1
+        previous = char
+        if char == ',' and depth == 0 and not quoted:
+            parts.append(current.strip())
+            current = ''
+        else:
+            current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+class LocalAPIResponse:
+    """Mirrors the ``data``/``count`` attributes of postgrest's APIResponse"""
+
+    def __init__(self, data: List[Dict[str, Any]], count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+class LocalQueryBuilder:
+    """Chainable query builder compatible with the postgrest-py call chain"""
+
+    def __init__(self, client: 'LocalSupabaseClient', table: str):
+        self._client = client
+        self._table = table
+        self._operation = 'select'
+        self._columns = '*'
+        self._count = None
+        self._payload: Any = None
+        self._on_conflict = ''
+        self._filters: List[Tuple[str, List[Any]]] = []
+        self._filter_operators: Dict[str, str] = {}
+        self._orders: List[str] = []
+        self._limit: Optional[int] = None
+        self._offset: Optional[int] = None
+
+    # Operations
+    def select(self, *columns: str, count: Optional[str] = None) -> 'LocalQueryBuilder':
+        self._operation = 'select'
+        self._columns = ','.join(columns) if columns else '*'
+        self._count = count
+        return self
+
+    def insert(self, json_data: Any, **kwargs) -> 'LocalQueryBuilder':
+        self._operation = 'insert'
+        self._payload = json_data
+        return self
+
+    def upsert(self, json_data: Any, on_conflict: str = '', **kwargs) -> 'LocalQueryBuilder':
+        self._operation = 'upsert'
+        self._payload = json_data
+        self._on_conflict = on_conflict
+        return self
+
+    def update(self, json_data: Dict[str, Any], **kwargs) -> 'LocalQueryBuilder':
+        self._operation = 'update'
+        self._payload = json_data
+        return self
+
+    def delete(self, **kwargs) -> 'LocalQueryBuilder':
+        self._operation = 'delete'
+        return self
+
+    # Filters
+    def _add_filter(self, column: str, operator: str, value: Any) -> 'LocalQueryBuilder':
+        self._filters.append(self._client._compile_filter(self._table, column, operator, value))
+        self._filter_operators[column] = f'{operator}.'
+        return self
+
+    def eq(self, column: str, value: Any) -> 'LocalQueryBuilder':
+        return self._add_filter(column, 'eq', value)
+
+    def neq(self, column: str, value: Any) -> 'LocalQueryBuilder':
+        return self._add_filter(column, 'neq', value)
+
+    def gt(self, column: str, value: Any) -> 'LocalQueryBuilder':
+        return self._add_filter(column, 'gt', value)
+
+    def gte(self, column: str, value: Any) -> 'LocalQueryBuilder':
+        return self._add_filter(column, 'gte', value)
+
+    def lt(self, column: str, value: Any) -> 'LocalQueryBuilder':
+        return self._add_filter(column, 'lt', value)
+
+    def lte(self, column: str, value: Any) -> 'LocalQueryBuilder':
+        return self._add_filter(column, 'lte', value)
+
+    def like(self, column: str, pattern: str) -> 'LocalQueryBuilder':
+        return self._add_filter(column, 'like', pattern)
+
+    def ilike(self, column: str, pattern: str) -> 'LocalQueryBuilder':
+        return self._add_filter(column, 'ilike', pattern)
+
+    def is_(self, column: str, value: Any) -> 'LocalQueryBuilder':
+        return self._add_filter(column, 'is', value)
+
+    def in_(self, column: str, values: List[Any]) -> 'LocalQueryBuilder':
+        return self._add_filter(column, 'in', list(values))
+
+    def or_(self, filters: str, **kwargs) -> 'LocalQueryBuilder':
+        """PostgREST ``or`` filter, e.g. ``email.ilike.%a%,and(tier.eq.pro,age.gt.30)``"""
+        self._filters.append(self._compile_logic(filters, 'OR'))
+        return self
+
+    def _compile_logic(self, filters: str, joiner: str) -> Tuple[str, List[Any]]:
+        """Compile a comma-separated PostgREST logic tree (nested and()/or(), quoted values)"""
+        clauses, params = [], []
+        for condition in _split_top_level(filters):
+            nested = re.match(r'^(and|or)\((.*)\)$', condition, re.S)
+            if nested:
+                clause, clause_params = self._compile_logic(nested.group(2), nested.group(1).upper())
+            else:
+                column, operator, value = condition.split('.', 2)
+                if operator == 'in':
+                    value = [item.strip().strip('"') for item in value.strip('()').split(',')]
+                elif len(value) >= 2 and value.startswith('"') and value.endswith('"'):
+                    value = value[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+                clause, clause_params = self._client._compile_filter(self._table, column, operator, value)
+            clauses.append(clause)
+            params.extend(clause_params)
+        return '(' + f' {joiner} '.join(clauses) + ')', params
+
+    # Modifiers
+    def order(self, column: str, desc: bool = False, nullsfirst: Optional[bool] = None, **kwargs) -> 'LocalQueryBuilder':
+        clause = f"{_quote(column)} {'DESC' if desc else 'ASC'}"
+        if nullsfirst is not None:
+            clause += ' NULLS FIRST' if nullsfirst else ' NULLS LAST'
+        self._orders.append(clause)
+        return self
+
+    def limit(self, size: int, **kwargs) -> 'LocalQueryBuilder':
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int, **kwargs) -> 'LocalQueryBuilder':
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    def execute(self) -> LocalAPIResponse:
+        return self._client._execute(self)
+
+class LocalSupabaseClient:
+    """In-process SQLite database exposing the Supabase ``table()``/``rpc()`` surface"""
+
+    def __init__(self, database: str = ':memory:', schema_path: Optional[str] = None,
+                 simulated_latency_ms: float = 0):
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(database, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute('PRAGMA foreign_keys = ON')
+        self._columns: Dict[str, Dict[str, str]] = {}
+        self._rpc_functions: Dict[str, Callable] = {}
+        self.simulated_latency_ms = simulated_latency_ms
+        self.query_count = 0
+
+        # Services that touch these attributes degrade the same way they do
+        # when the corresponding Supabase feature is unavailable
+        self.auth = None
+        self.storage = None
+        self.realtime = None
+        self.functions = None
+
+        self.load_schema(schema_path or DEFAULT_SCHEMA_PATH)
+        self._rpc_functions.update(LOCAL_RPC_FUNCTIONS)
+        with self._lock:
+            self._connection.executescript(LOCAL_TRIGGERS)
+
+    # Schema loading
+    def load_schema(self, schema_path) -> None:
+        """Load CREATE TABLE / CREATE INDEX / INSERT statements from a Postgres schema file"""
+        sql = Path(schema_path).read_text()
+        sql = re.sub(r'--[^\n]*', '', sql)
+        sql = re.sub(r'\$\$.*?\$\$', '', sql, flags=re.S)
+
+        with self._lock:
+            for statement in sql.split(';'):
+                statement = statement.strip()
+                if not statement:
+                    continue
+                statement = re.sub(r'\bpublic\.', '', statement)
+                upper = statement.upper()
+                if upper.startswith('CREATE TABLE'):
+                    self._create_table(statement)
+                elif upper.startswith(('CREATE INDEX', 'CREATE UNIQUE INDEX', 'INSERT INTO')):
+                    self._connection.execute(self._translate_values(statement))
+            self._connection.commit()
+
+    def _create_table(self, statement: str):
+        """Translate and run a Postgres CREATE TABLE statement"""
+        match = re.match(r'CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)\s*\((.*)\)\s*$', statement, re.S | re.I)
+        if not match:
+            logger.warning(f"Skipping unsupported statement: {statement[:60]}")
+            return
+        table, body = match.group(1), match.group(2)
+
+        columns = {}
+        for definition in _split_top_level(body):
+            parts = definition.split()
+            if len(parts) < 2 or parts[0].upper() in ('UNIQUE', 'PRIMARY', 'CONSTRAINT', 'CHECK', 'FOREIGN'):
+                continue
+            column_type = parts[1].upper()
+            if column_type.startswith('BOOLEAN'):
+                columns[parts[0]] = 'bool'
+            elif column_type.startswith('JSON'):
+                columns[parts[0]] = 'json'
+            elif column_type.startswith('UUID') and 'PRIMARY KEY' in definition.upper():
+                columns[parts[0]] = 'uuid'
+            else:
+                columns[parts[0]] = 'value'
+        self._columns[table] = columns
+
+        translated = body
+        for pattern, replacement in _TYPE_TRANSLATIONS:
+            translated = pattern.sub(replacement, translated)
+        translated = self._translate_values(translated)
+        self._connection.execute(f'CREATE TABLE IF NOT EXISTS {table} ({translated})')
+
+    def _translate_values(self, sql: str) -> str:
+        return re.sub(r'\bTRUE\b', '1', re.sub(r'\bFALSE\b', '0', sql, flags=re.I), flags=re.I)
+
+    # Public API
+    def table(self, table_name: str) -> LocalQueryBuilder:
+        if table_name not in self._columns:
+            raise ValueError(f'relation "public.{table_name}" does not exist')
+        return LocalQueryBuilder(self, table_name)
+
+    def from_(self, table_name: str) -> LocalQueryBuilder:
+        return self.table(table_name)
+
+    def register_rpc(self, name: str, function: Callable[[sqlite3.Connection, Dict[str, Any]], Any]):
+        """Register a Python implementation of a Postgres function for ``rpc()``"""
+        self._rpc_functions[name] = function
+
+    def rpc(self, fn: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> 'LocalRPCCall':
+        if fn not in self._rpc_functions:
+            raise ValueError(f'function public.{fn} does not exist')
+        return LocalRPCCall(self, fn, params or {})
+
+    def execute_sql(self, sql: str, params: Tuple = ()) -> List[Dict[str, Any]]:
+        """Run raw SQL against the local database (for seeding and RPC implementations)"""
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+            self._connection.commit()
+        return [dict(row) for row in rows]
+
+    # Internals
+    def _simulate_latency(self):
+        self.query_count += 1
+        if self.simulated_latency_ms:
+            time.sleep(self.simulated_latency_ms / 1000.0)
+
+    def _compile_filter(self, table: str, column: str, operator: str, value: Any) -> Tuple[str, List[Any]]:
+        quoted = _quote(column)
+        if operator in ('like', 'ilike'):
+            pattern = str(value).replace('*', '%')
+            if operator == 'ilike':
+                return f'LOWER({quoted}) LIKE LOWER(?)', [pattern]
+            return f'{quoted} LIKE ?', [pattern]
+        if operator == 'is':
+            if value in (None, 'null'):
+                return f'{quoted} IS NULL', []
+            return f'{quoted} IS ?', [self._to_db(table, column, value in (True, 'true'))]
+        if operator == 'in':
+            if not value:
+                return '0', []
+            placeholders = ', '.join('?' for _ in value)
+            return f'{quoted} IN ({placeholders})', [self._to_db(table, column, item) for item in value]
+        if operator not in _FILTER_OPERATORS:
+            raise ValueError(f'Unsupported filter operator: {operator}')
+        if value is None and operator in ('eq', 'neq'):
+            return f"{quoted} IS {'NOT ' if operator == 'neq' else ''}NULL", []
+        return f'{quoted} {_FILTER_OPERATORS[operator]} ?', [self._to_db(table, column, value)]
+
+    def _to_db(self, table: str, column: str, value: Any) -> Any:
+        kind = self._columns.get(table, {}).get(column)
+        if kind == 'json' and value is not None and not isinstance(value, str):
+            return json.dumps(value)
+        if kind == 'bool' and isinstance(value, str):
+            return 1 if value.lower() == 'true' else 0
+        if isinstance(value, bool):
+            return int(value)
+        return value
+
+    def _from_db(self, table: str, row: sqlite3.Row) -> Dict[str, Any]:
+        columns = self._columns.get(table, {})
+        data = dict(row)
+        for column, value in data.items():
+            if value is None:
+                continue
+            kind = columns.get(column)
+            if kind == 'bool':
+                data[column] = bool(value)
+            elif kind == 'json' and isinstance(value, str):
+                data[column] = json.loads(value)
+        return data
+
+    def _where(self, query: LocalQueryBuilder) -> Tuple[str, List[Any]]:
+        if not query._filters:
+            return '', []
+        clauses = [clause for clause, _ in query._filters]
+        params = [param for _, clause_params in query._filters for param in clause_params]
+        return ' WHERE ' + ' AND '.join(clauses), params
+
+    def _prepare_row(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        prepared = {column: self._to_db(table, column, value) for column, value in row.items()}
+        for column, kind in self._columns[table].items():
+            if kind == 'uuid' and prepared.get(column) is None:
+                prepared[column] = str(uuid.uuid4())
+        return prepared
+
+    def _execute(self, query: LocalQueryBuilder) -> LocalAPIResponse:
+        self._simulate_latency()
+        with self._lock:
+            try:
+                if query._operation == 'select':
+                    response = self._select(query)
+                elif query._operation in ('insert', 'upsert'):
+                    response = self._insert(query)
+                elif query._operation == 'update':
+                    response = self._update(query)
+                else:
+                    response = self._delete(query)
+                self._connection.commit()
+                return response
+            except Exception:
+                self._connection.rollback()
+                raise
+
+    def _select(self, query: LocalQueryBuilder) -> LocalAPIResponse:
+        audit_select(query._table, query._columns, query._limit, filters=query._filter_operators)
+        table = _quote(query._table)
+        columns, embeds = [], []
+        for column in _split_top_level(query._columns):
+            embed = re.match(r'^(\w+)\((.*)\)$', column, re.S)
+            if embed:
+                embeds.append((embed.group(1), embed.group(2).strip() or '*'))
+            elif column == '*':
+                columns.append('*')
+            else:
+                columns.append(_quote(column))
+        if embeds and '*' not in columns and '"id"' not in columns:
+            columns.append('"id"')
+
+        where, params = self._where(query)
+        sql = f"SELECT {', '.join(columns) or '*'} FROM {table}{where}"
+        if query._orders:
+            sql += ' ORDER BY ' + ', '.join(query._orders)
+        if query._limit is not None:
+            sql += f' LIMIT {int(query._limit)}'
+            if query._offset:
+                sql += f' OFFSET {int(query._offset)}'
+
+        rows = [self._from_db(query._table, row) for row in self._connection.execute(sql, params)]
+
+        for child_table, child_columns in embeds:
+            foreign_key = 'user_id' if query._table == 'users' else f"{query._table.rstrip('s')}_id"
+            for row in rows:
+                child = LocalQueryBuilder(self, child_table).select(child_columns).eq(foreign_key, row.get('id'))
+                row[child_table] = self._select(child).data
+
+        count = None
+        if query._count in ('exact', 'planned', 'estimated'):
+            count = self._connection.execute(f'SELECT COUNT(*) FROM {table}{where}', params).fetchone()[0]
+        return LocalAPIResponse(rows, count)
+
+    def _insert(self, query: LocalQueryBuilder) -> LocalAPIResponse:
+        payload = query._payload if isinstance(query._payload, list) else [query._payload]
+        table = _quote(query._table)
+        inserted = []
+        for row in payload:
+            prepared = self._prepare_row(query._table, row)
+            columns = ', '.join(_quote(column) for column in prepared)
+            placeholders = ', '.join('?' for _ in prepared)
+            sql = f'INSERT INTO {table} ({columns}) VALUES ({placeholders})'
+            if query._operation == 'upsert':
+                conflict = query._on_conflict or 'id'
+                conflict_columns = ', '.join(_quote(column.strip()) for column in conflict.split(','))
+                updates = ', '.join(f'{_quote(column)} = excluded.{_quote(column)}' for column in prepared)
+                sql += f' ON CONFLICT ({conflict_columns}) DO UPDATE SET {updates}'
+            sql += ' RETURNING *'
+            inserted.extend(self._from_db(query._table, result)
+                            for result in self._connection.execute(sql, list(prepared.values())))
+        return LocalAPIResponse(inserted)
+
+    def _update(self, query: LocalQueryBuilder) -> LocalAPIResponse:
+        prepared = {column: self._to_db(query._table, column, value) for column, value in query._payload.items()}
+        assignments = ', '.join(f'{_quote(column)} = ?' for column in prepared)
+        where, params = self._where(query)
+        sql = f'UPDATE {_quote(query._table)} SET {assignments}{where} RETURNING *'
+        rows = self._connection.execute(sql, list(prepared.values()) + params).fetchall()
+        return LocalAPIResponse([self._from_db(query._table, row) for row in rows])
+
+    def _delete(self, query: LocalQueryBuilder) -> LocalAPIResponse:
+        where, params = self._where(query)
+        rows = self._connection.execute(f'DELETE FROM {_quote(query._table)}{where} RETURNING *', params).fetchall()
+        return LocalAPIResponse([self._from_db(query._table, row) for row in rows])
+
+class LocalRPCCall:
+    """Deferred ``rpc()`` call, executed like a query builder"""
+
+    def __init__(self, client: LocalSupabaseClient, fn: str, params: Dict[str, Any]):
+        self._client = client
+        self._fn = fn
+        self._params = params
+
+    def execute(self) -> LocalAPIResponse:
+        self._client._simulate_latency()
+        with self._client._lock:
+            data = self._client._rpc_functions[self._fn](self._client._connection, self._params)
+            self._client._connection.commit()
+        return LocalAPIResponse(data)
+
+def _admin_dashboard_metrics(connection: sqlite3.Connection, params: Dict[str, Any]) -> Dict[str, Any]:
+    """SQLite version of get_admin_dashboard_metrics() from schema-fixed.sql"""
+    row = connection.execute("""
+        SELECT
+            (SELECT COUNT(*) FROM users) AS total_users,
+            (SELECT COUNT(*) FROM users WHERE created_at >= :month_start) AS new_users_this_month,
+            (SELECT COUNT(*) FROM users WHERE last_login >= :active_since) AS active_users,
+            (SELECT COUNT(*) FROM users WHERE subscription_tier = 'free') AS free_users,
+            (SELECT COUNT(*) FROM users WHERE subscription_tier = 'premium') AS premium_users,
+            (SELECT COUNT(*) FROM users WHERE subscription_tier = 'pro') AS pro_users,
+            (SELECT COUNT(*) FROM users
+             WHERE subscription_status = 'cancelled' AND updated_at >= :churn_since) AS churned_users,
+            (SELECT COUNT(*) FROM financial_profiles) AS users_with_profiles,
+            (SELECT COALESCE(AVG(overall_score), 0) FROM financial_health_latest_scores) AS average_health_score,
+            (SELECT COUNT(*) FROM savings_goals) AS total_goals,
+            (SELECT COUNT(*) FROM savings_goals WHERE is_achieved) AS achieved_goals,
+            (SELECT COUNT(*) FROM ai_usage) AS total_ai_usage,
+            (SELECT COUNT(*) FROM ai_usage WHERE created_at >= :month_start) AS monthly_ai_usage,
+            (SELECT COUNT(DISTINCT user_id) FROM ai_usage) AS unique_ai_users
+    """, params).fetchone()
+    return dict(row)
+
+def _transaction_summary(connection: sqlite3.Connection, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """SQLite version of get_transaction_summary() from schema-fixed.sql"""
+    rows = connection.execute("""
+        WITH bounds AS (
+            SELECT
+                CASE WHEN :p_start = date(:p_start, 'start of month') THEN :p_start
+                     ELSE date(:p_start, 'start of month', '+1 month') END AS full_start,
+                CASE WHEN date(:p_end, '+1 day') = date(:p_end, '+1 day', 'start of month') THEN date(:p_end, '+1 day')
+                     ELSE date(:p_end, 'start of month') END AS full_end
+        ),
+        totals AS (
+            SELECT r.transaction_type, r.category, r.total_cents, r.transaction_count
+            FROM transaction_monthly_rollups r, bounds b
+            WHERE r.user_id = :p_user_id AND r.month >= b.full_start AND r.month < b.full_end
+            UNION ALL
+            SELECT COALESCE(t.transaction_type, ''), COALESCE(t.category, ''),
+                   CAST(ROUND(SUM(t.amount) * 100) AS INTEGER), COUNT(*)
+            FROM transactions t, bounds b
+            WHERE t.user_id = :p_user_id AND t.date BETWEEN :p_start AND :p_end
+              AND NOT (t.date >= b.full_start AND t.date < b.full_end)
+            GROUP BY 1, 2
+        )
+        SELECT transaction_type, category, SUM(total_cents) AS total_cents, SUM(transaction_count) AS transaction_count
+        FROM totals
+        GROUP BY 1, 2
+        HAVING SUM(transaction_count) > 0
+    """, params).fetchall()
+    return [dict(row) for row in rows]
+
+def _rebuild_transaction_rollups(connection: sqlite3.Connection, params: Dict[str, Any]) -> None:
+    """SQLite version of rebuild_transaction_rollups() from schema-fixed.sql"""
+    connection.execute('DELETE FROM transaction_monthly_rollups')
+    connection.execute("""
+        INSERT INTO transaction_monthly_rollups (user_id, month, transaction_type, category, total_cents, transaction_count)
+        SELECT user_id, date(date, 'start of month'), COALESCE(transaction_type, ''), COALESCE(category, ''),
+               CAST(ROUND(SUM(amount) * 100) AS INTEGER), COUNT(*)
+        FROM transactions
+        WHERE user_id IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+    """)
+
+_LATEST_SCORE_COLUMNS = ('user_id, score_id, overall_score, savings_rate_score, debt_ratio_score, '
+                         'emergency_fund_score, investment_score, created_at')
+_SCORE_COLUMNS = ('user_id, id, overall_score, savings_rate_score, debt_ratio_score, '
+                  'emergency_fund_score, investment_score, created_at')
+
+def _rebuild_latest_health_scores(connection: sqlite3.Connection, params: Dict[str, Any]) -> None:
+    """SQLite version of rebuild_latest_health_scores() from schema-fixed.sql"""
+    connection.execute('DELETE FROM financial_health_latest_scores')
+    connection.execute(f"""
+        INSERT INTO financial_health_latest_scores ({_LATEST_SCORE_COLUMNS})
+        SELECT {_SCORE_COLUMNS} FROM (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY created_at DESC, id DESC) AS position
+            FROM financial_health_scores WHERE user_id IS NOT NULL
+        ) WHERE position = 1
+    """)
+
+# Local implementations of the Postgres functions defined in schema-fixed.sql
+LOCAL_RPC_FUNCTIONS: Dict[str, Callable[[sqlite3.Connection, Dict[str, Any]], Any]] = {
+    'get_admin_dashboard_metrics': _admin_dashboard_metrics,
+    'get_transaction_summary': _transaction_summary,
+    'rebuild_transaction_rollups': _rebuild_transaction_rollups,
+    'rebuild_latest_health_scores': _rebuild_latest_health_scores,
+}
+
+def _bump_metric(metric: str, dimension: str) -> str:
+    return (
+        "INSERT INTO daily_metrics (metric_date, metric, dimension, value) "
+        f"VALUES (date('now'), '{metric}', COALESCE({dimension}, ''), 1) "
+        "ON CONFLICT (metric_date, metric, dimension) DO UPDATE SET value = value + 1;"
+    )
+
+def _bump_transaction_rollup(row: str, sign: int, condition: str = '1') -> str:
+    return (
+        "INSERT INTO transaction_monthly_rollups "
+        "(user_id, month, transaction_type, category, total_cents, transaction_count) "
+        f"SELECT {row}.user_id, date({row}.date, 'start of month'), COALESCE({row}.transaction_type, ''), "
+        f"COALESCE({row}.category, ''), {sign} * CAST(ROUND({row}.amount * 100) AS INTEGER), {sign} WHERE {condition} "
+        "ON CONFLICT (user_id, month, transaction_type, category) DO UPDATE SET "
+        "total_cents = total_cents + excluded.total_cents, "
+        "transaction_count = transaction_count + excluded.transaction_count;"
+    )
+
+_HEALTH_SCORE_BUCKET = """CASE
+    WHEN NEW.overall_score >= 90 THEN 'excellent'
+    WHEN NEW.overall_score >= 75 THEN 'good'
+    WHEN NEW.overall_score >= 60 THEN 'fair'
+    WHEN NEW.overall_score >= 40 THEN 'poor'
+    ELSE 'critical' END"""
+
+# SQLite versions of the daily_metrics, latest health score and transaction rollup triggers in schema-fixed.sql
+LOCAL_TRIGGERS = f"""
+CREATE TRIGGER IF NOT EXISTS rollup_users_insert AFTER INSERT ON users
+BEGIN {_bump_metric('signups', 'NEW.subscription_tier')} END;
+
+CREATE TRIGGER IF NOT EXISTS rollup_users_tier AFTER UPDATE OF subscription_tier ON users
+WHEN NEW.subscription_tier IS NOT OLD.subscription_tier
+BEGIN {_bump_metric('tier_changes', 'NEW.subscription_tier')} END;
+
+CREATE TRIGGER IF NOT EXISTS rollup_users_cancel AFTER UPDATE OF subscription_status ON users
+WHEN NEW.subscription_status = 'cancelled' AND OLD.subscription_status IS NOT 'cancelled'
+BEGIN {_bump_metric('cancellations', 'NEW.subscription_tier')} END;
+
+CREATE TRIGGER IF NOT EXISTS rollup_goals_insert AFTER INSERT ON savings_goals
+WHEN NEW.is_achieved
+BEGIN {_bump_metric('goals_achieved', "''")} END;
+
+CREATE TRIGGER IF NOT EXISTS rollup_goals_update AFTER UPDATE OF is_achieved ON savings_goals
+WHEN NEW.is_achieved AND NOT COALESCE(OLD.is_achieved, 0)
+BEGIN {_bump_metric('goals_achieved', "''")} END;
+
+CREATE TRIGGER IF NOT EXISTS rollup_ai_usage_insert AFTER INSERT ON ai_usage
+BEGIN {_bump_metric('ai_calls', 'NEW.request_type')} END;
+
+CREATE TRIGGER IF NOT EXISTS rollup_health_scores_insert AFTER INSERT ON financial_health_scores
+BEGIN {_bump_metric('health_scores', _HEALTH_SCORE_BUCKET)} END;
+
+CREATE TRIGGER IF NOT EXISTS track_latest_health_score_insert AFTER INSERT ON financial_health_scores
+WHEN NEW.user_id IS NOT NULL
+BEGIN
+    INSERT INTO financial_health_latest_scores ({_LATEST_SCORE_COLUMNS})
+    VALUES (NEW.user_id, NEW.id, NEW.overall_score, NEW.savings_rate_score, NEW.debt_ratio_score,
+            NEW.emergency_fund_score, NEW.investment_score, NEW.created_at)
+    ON CONFLICT (user_id) DO UPDATE SET
+        score_id = excluded.score_id, overall_score = excluded.overall_score,
+        savings_rate_score = excluded.savings_rate_score, debt_ratio_score = excluded.debt_ratio_score,
+        emergency_fund_score = excluded.emergency_fund_score, investment_score = excluded.investment_score,
+        created_at = excluded.created_at
+    WHERE excluded.created_at >= financial_health_latest_scores.created_at;
+END;
+
+CREATE TRIGGER IF NOT EXISTS track_latest_health_score_delete AFTER DELETE ON financial_health_scores
+WHEN OLD.id = (SELECT score_id FROM financial_health_latest_scores WHERE user_id = OLD.user_id)
+BEGIN
+    DELETE FROM financial_health_latest_scores WHERE user_id = OLD.user_id;
+    INSERT INTO financial_health_latest_scores ({_LATEST_SCORE_COLUMNS})
+    SELECT {_SCORE_COLUMNS} FROM financial_health_scores
+    WHERE user_id = OLD.user_id ORDER BY created_at DESC, id DESC LIMIT 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS rollup_transactions_insert AFTER INSERT ON transactions
+WHEN NEW.user_id IS NOT NULL
+BEGIN {_bump_transaction_rollup('NEW', 1)} END;
+
+CREATE TRIGGER IF NOT EXISTS rollup_transactions_delete AFTER DELETE ON transactions
+WHEN OLD.user_id IS NOT NULL
+BEGIN {_bump_transaction_rollup('OLD', -1)} END;
+
+CREATE TRIGGER IF NOT EXISTS rollup_transactions_update
+AFTER UPDATE OF user_id, amount, category, transaction_type, date ON transactions
+BEGIN
+    {_bump_transaction_rollup('OLD', -1, 'OLD.user_id IS NOT NULL')}
+    {_bump_transaction_rollup('NEW', 1, 'NEW.user_id IS NOT NULL')}
+END;
+"""
+
+_local_client: Optional[LocalSupabaseClient] = None
+_local_client_lock = threading.Lock()
+
+def get_local_supabase_client() -> LocalSupabaseClient:
+    """Get the process-wide local client configured by SUPABASE_LOCAL_DB"""
+    global _local_client
+    if _local_client is None:
+        with _local_client_lock:
+            if _local_client is None:
+                _local_client = LocalSupabaseClient(
+                    database=os.getenv('SUPABASE_LOCAL_DB', ':memory:'),
+                    simulated_latency_ms=float(os.getenv('SUPABASE_LOCAL_LATENCY_MS', '0'))
+                )
+                logger.info("Local SQLite Supabase client created")
+    return _local_client
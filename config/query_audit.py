@@ -0,0 +1,80 @@
+"""
+Query auditing for BusinessThis
+Flags unbounded select('*') reads of large tables, which transfer every
+column of every matching row and get slower as the table grows
+"""
+import os
+import threading
+import logging
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Tables whose row counts grow with users or activity
+LARGE_TABLES = frozenset(
+    table.strip() for table in os.getenv(
+        'QUERY_AUDIT_LARGE_TABLES',
+        'users,transactions,subscriptions,ai_usage,financial_health_scores,'
+        'transaction_monthly_rollups,daily_metrics,support_tickets,admin_logs'
+    ).split(',') if table.strip()
+)
+
+_lock = threading.Lock()
+_unbounded_selects: Dict[str, int] = {}
+
+def audit_select(table: str, columns: Optional[str], limit: Optional[Any] = None,
+                 single_row: bool = False, filters: Optional[Dict[str, Any]] = None):
+    """Warn (once per table and filter shape) about an unbounded select('*') of a large table
+
+    A read is bounded when it has a row limit, asks for a single object or
+    filters on the primary key.
+    """
+    if table not in LARGE_TABLES or limit is not None or single_row:
+        return
+    if (columns or '*').replace(' ', '') not in ('*', ''):
+        return
+    filters = filters or {}
+    if str(filters.get('id', '')).startswith('eq.'):
+        return
+
+    shape = f"{table}({','.join(sorted(filters))})"
+    with _lock:
+        seen = shape in _unbounded_selects
+        _unbounded_selects[shape] = _unbounded_selects.get(shape, 0) + 1
+    if not seen:
+        logger.warning(
+            f"Unbounded select('*') on large table '{table}' (filters: {', '.join(sorted(filters)) or 'none'}); "
+            f"declare the columns and a limit for this read"
+        )
+
+def audit_request(request: httpx.Request):
+    """Audit a PostgREST read from its URL (``/rest/v1/<table>?select=...``)"""
+    if request.method != 'GET':
+        return
+    path = urlsplit(str(request.url)).path
+    if '/rest/v1/' not in path:
+        return
+    table = path.rsplit('/rest/v1/', 1)[1].strip('/')
+    if not table or table.startswith('rpc/'):
+        return
+
+    params = dict(request.url.params)
+    columns = params.pop('select', '*')
+    limit = params.pop('limit', None)
+    params.pop('offset', None)
+    params.pop('order', None)
+    single_row = 'vnd.pgrst.object' in request.headers.get('accept', '')
+    if request.headers.get('range'):
+        limit = request.headers['range']
+    audit_select(table, columns, limit, single_row, params)
+
+async def audit_async_request(request: httpx.Request):
+    """``audit_request`` as an httpx.AsyncClient request hook"""
+    audit_request(request)
+
+def get_query_audit_stats() -> Dict[str, int]:
+    """Unbounded select('*') counts per table and filter shape since startup"""
+    with _lock:
+        return dict(_unbounded_selects)
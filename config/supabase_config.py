@@ -4,69 +4,361 @@ Enhanced with latest Supabase Python client features (v2.22.2)
 """
 import os
 import asyncio
-from supabase import create_client, Client
-from supabase.client import ClientOptions
-from typing import Optional, Dict, Any
+import threading
+import httpx
+from supabase import create_client, acreate_client, Client
+from supabase.client import ClientOptions, AsyncClientOptions
+from config.local_supabase import get_local_supabase_client
+from config.query_audit import audit_request, audit_async_request, get_query_audit_stats
+from typing import Optional, Dict, Any, Callable
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def get_pool_config() -> Dict[str, Any]:
+    """Get HTTP connection pool configuration for Supabase clients"""
+    return {
+        'max_connections': int(os.getenv('SUPABASE_POOL_SIZE', '20')),
+        'max_keepalive_connections': int(os.getenv('SUPABASE_POOL_KEEPALIVE', '10')),
+        'keepalive_expiry': float(os.getenv('SUPABASE_POOL_KEEPALIVE_EXPIRY', '30')),
+        'connect_timeout': float(os.getenv('SUPABASE_CONNECT_TIMEOUT', '5')),
+        'read_timeout': float(os.getenv('SUPABASE_READ_TIMEOUT', '30')),
+        'pool_timeout': float(os.getenv('SUPABASE_POOL_TIMEOUT', '10'))
+    }
+
+class _CountingTransport(httpx.HTTPTransport):
+    """HTTP transport that records pool usage for the client registry"""
+    
+    def __init__(self, registry: 'SupabaseClientRegistry', **kwargs):
+        super().__init__(**kwargs)
+        self._registry = registry
+    
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        audit_request(request)
+        self._registry._record_request_start()
+        try:
+            response = super().handle_request(request)
+        except Exception:
+            self._registry._record_request_end(failed=True)
+            raise
+        self._registry._record_request_end(failed=False)
+        return response
+    
+    def open_connections(self) -> int:
+        """Number of connections currently held by the pool"""
+        pool = getattr(self, '_pool', None)
+        return len(getattr(pool, 'connections', []) or [])
+
+class SupabaseClientRegistry:
+    """Thread-safe registry of shared Supabase clients
+    
+    All clients handed out by the registry share one keep-alive HTTP
+    connection pool, so TLS handshakes are paid once per connection rather
+    than once per service instance.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[str, Client] = {}
+        self._http_client: Optional[httpx.Client] = None
+        self._transport: Optional[_CountingTransport] = None
+        self._stats = {
+            'clients_created': 0,
+            'client_requests': 0,
+            'client_reuses': 0,
+            'http_requests': 0,
+            'http_errors': 0,
+            'in_flight': 0,
+            'peak_in_flight': 0
+        }
+    
+    def _get_http_client(self) -> httpx.Client:
+        """Get the shared pooled HTTP client (caller must hold the lock)"""
+        if self._http_client is None:
+            config = get_pool_config()
+            limits = httpx.Limits(
+                max_connections=config['max_connections'],
+                max_keepalive_connections=config['max_keepalive_connections'],
+                keepalive_expiry=config['keepalive_expiry']
+            )
+            timeout = httpx.Timeout(
+                config['read_timeout'],
+                connect=config['connect_timeout'],
+                pool=config['pool_timeout']
+            )
+            self._transport = _CountingTransport(self, limits=limits)
+            self._http_client = httpx.Client(
+                transport=self._transport,
+                timeout=timeout,
+                follow_redirects=True
+            )
+            logger.info(
+                f"Supabase HTTP pool created (max_connections={config['max_connections']}, "
+                f"keepalive={config['max_keepalive_connections']})"
+            )
+        return self._http_client
+    
+    def get_client(self, name: str, factory: Callable[[httpx.Client], Client]) -> Client:
+        """Get a shared client by name, creating it with ``factory`` on first use"""
+        client = self._clients.get(name)
+        if client is not None:
+            with self._lock:
+                self._stats['client_requests'] += 1
+                self._stats['client_reuses'] += 1
+            return client
+        
+        with self._lock:
+            self._stats['client_requests'] += 1
+            client = self._clients.get(name)
+            if client is not None:
+                self._stats['client_reuses'] += 1
+                return client
+            
+            client = factory(self._get_http_client())
+            self._clients[name] = client
+            self._stats['clients_created'] += 1
+            return client
+    
+    def _record_request_start(self):
+        with self._lock:
+            self._stats['http_requests'] += 1
+            self._stats['in_flight'] += 1
+            if self._stats['in_flight'] > self._stats['peak_in_flight']:
+                self._stats['peak_in_flight'] = self._stats['in_flight']
+    
+    def _record_request_end(self, failed: bool):
+        with self._lock:
+            self._stats['in_flight'] -= 1
+            if failed:
+                self._stats['http_errors'] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool usage counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['clients'] = sorted(self._clients.keys())
+            stats['open_connections'] = self._transport.open_connections() if self._transport else 0
+        stats['pool_config'] = get_pool_config()
+        return stats
+    
+    def reset(self):
+        """Close the shared pool and drop all registered clients"""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._http_client = None
+            self._transport = None
+            self._clients.clear()
+            for key in self._stats:
+                self._stats[key] = 0
+
+# Process-wide client registry
+client_registry = SupabaseClientRegistry()
+
+def _create_user_client(http_client: httpx.Client) -> Client:
+    """Create a Supabase client authenticated with the anon key"""
+    if os.getenv('SUPABASE_LOCAL_DB'):
+        return get_local_supabase_client()
+    
+    url = os.getenv('SUPABASE_URL')
+    key = os.getenv('SUPABASE_ANON_KEY')
+    
+    if not url or not key:
+        raise ValueError("SUPABASE_URL and SUPABASE_ANON_KEY must be set")
+    
+    # Enhanced client options for better performance and reliability
+    options = ClientOptions(
+        auto_refresh_token=True,
+        persist_session=True,
+        detect_session_in_url=True,
+        headers={
+            'X-Client-Info': 'BusinessThis/1.0.0',
+            'User-Agent': 'BusinessThis-Python-Client'
+        },
+        httpx_client=http_client
+    )
+    
+    client = create_client(url, key, options)
+    logger.info("Supabase client created successfully")
+    return client
+
 def get_supabase_client() -> Client:
-    """Get Supabase client for user operations with enhanced configuration"""
+    """Get shared Supabase client for user operations with enhanced configuration"""
     try:
-        url = os.getenv('SUPABASE_URL')
-        key = os.getenv('SUPABASE_ANON_KEY')
-        
-        if not url or not key:
-            raise ValueError("SUPABASE_URL and SUPABASE_ANON_KEY must be set")
-        
-        # Enhanced client options for better performance and reliability
-        options = ClientOptions(
-            auto_refresh_token=True,
-            persist_session=True,
-            detect_session_in_url=True,
-            headers={
-                'X-Client-Info': 'BusinessThis/1.0.0',
-                'User-Agent': 'BusinessThis-Python-Client'
-            }
-        )
-        
-        client = create_client(url, key, options)
-        logger.info("Supabase client created successfully")
+        client = client_registry.get_client('user', _create_user_client)
         return client
     except Exception as e:
         logger.error(f"Error creating Supabase client: {e}")
         raise
 
+def get_supabase_auth_client() -> Client:
+    """Get Supabase client for sign-up/sign-in flows
+    
+    Auth calls store a session on the client they are made with, so they get
+    their own client instead of the shared user client used for data access.
+    The HTTP connection pool is still shared.
+    """
+    try:
+        client = client_registry.get_client('auth', _create_user_client)
+        return client
+    except Exception as e:
+        logger.error(f"Error creating Supabase auth client: {e}")
+        raise
+
+def _create_service_client(http_client: httpx.Client) -> Client:
+    """Create a Supabase client authenticated with the service key"""
+    if os.getenv('SUPABASE_LOCAL_DB'):
+        return get_local_supabase_client()
+    
+    url = os.getenv('SUPABASE_URL')
+    key = os.getenv('SUPABASE_SERVICE_KEY')
+    
+    if not url or not key:
+        raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set")
+    
+    # Service client options for admin operations
+    options = ClientOptions(
+        auto_refresh_token=False,  # Service key doesn't need token refresh
+        persist_session=False,
+        detect_session_in_url=False,
+        headers={
+            'X-Client-Info': 'BusinessThis-Admin/1.0.0',
+            'User-Agent': 'BusinessThis-Admin-Python-Client'
+        },
+        httpx_client=http_client
+    )
+    
+    client = create_client(url, key, options)
+    logger.info("Supabase service client created successfully")
+    return client
+
 def get_supabase_service_client() -> Client:
-    """Get Supabase service client for admin operations with enhanced configuration"""
+    """Get shared Supabase service client for admin operations with enhanced configuration"""
     try:
-        url = os.getenv('SUPABASE_URL')
-        key = os.getenv('SUPABASE_SERVICE_KEY')
-        
-        if not url or not key:
-            raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set")
-        
-        # Service client options for admin operations
-        options = ClientOptions(
-            auto_refresh_token=False,  # Service key doesn't need token refresh
-            persist_session=False,
-            detect_session_in_url=False,
-            headers={
-                'X-Client-Info': 'BusinessThis-Admin/1.0.0',
-                'User-Agent': 'BusinessThis-Admin-Python-Client'
-            }
-        )
-        
-        client = create_client(url, key, options)
-        logger.info("Supabase service client created successfully")
+        client = client_registry.get_client('service', _create_service_client)
         return client
     except Exception as e:
         logger.error(f"Error creating Supabase service client: {e}")
         raise
 
+def get_supabase_pool_stats() -> Dict[str, Any]:
+    """Get connection pool usage counters and unbounded select('*') counts"""
+    stats = client_registry.get_stats()
+    stats['unbounded_selects'] = get_query_audit_stats()
+    return stats
+
+class AsyncClientRunner:
+    """Background event loop that owns the shared async Supabase clients
+
+    httpx async connections are bound to the loop that opened them, so every
+    coroutine that touches an async client runs on this one long-lived loop.
+    Synchronous Flask handlers submit work with ``run_async``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._clients: Dict[str, Any] = {}
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the shared event loop, starting its thread on first use"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='supabase-async', daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the shared loop and wait for its result"""
+        loop = self.get_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            coro.close()
+            raise RuntimeError("run_async() cannot be called from the shared Supabase event loop; await instead")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+    async def get_client(self, name: str, factory: Callable[[httpx.AsyncClient], Any]):
+        """Get a shared async client by name (must be awaited on the shared loop)"""
+        client = self._clients.get(name)
+        if client is None:
+            if self._http_client is None:
+                config = get_pool_config()
+                self._http_client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=config['max_connections'],
+                        max_keepalive_connections=config['max_keepalive_connections'],
+                        keepalive_expiry=config['keepalive_expiry']
+                    ),
+                    timeout=httpx.Timeout(
+                        config['read_timeout'],
+                        connect=config['connect_timeout'],
+                        pool=config['pool_timeout']
+                    ),
+                    follow_redirects=True,
+                    event_hooks={'request': [audit_async_request]}
+                )
+            client = await factory(self._http_client)
+            self._clients[name] = client
+        return client
+
+# Process-wide async runner
+async_runner = AsyncClientRunner()
+
+async def _create_async_client(http_client: httpx.AsyncClient, key_env: str, client_info: str):
+    """Create an async Supabase client sharing the async HTTP pool"""
+    if os.getenv('SUPABASE_LOCAL_DB'):
+        return get_local_supabase_client()
+
+    url = os.getenv('SUPABASE_URL')
+    key = os.getenv(key_env)
+
+    if not url or not key:
+        raise ValueError(f"SUPABASE_URL and {key_env} must be set")
+
+    options = AsyncClientOptions(
+        auto_refresh_token=False,
+        persist_session=False,
+        headers={
+            'X-Client-Info': client_info,
+            'User-Agent': 'BusinessThis-Python-Async-Client'
+        },
+        httpx_client=http_client
+    )
+
+    client = await acreate_client(url, key, options)
+    logger.info("Async Supabase client created successfully")
+    return client
+
+async def get_async_supabase_client():
+    """Get shared async Supabase client for user operations
+
+    Must be awaited on the shared loop (inside a coroutine passed to
+    ``run_async``). With SUPABASE_LOCAL_DB set this returns the synchronous
+    local client; ``services.async_repository`` handles both.
+    """
+    async def factory(http_client):
+        return await _create_async_client(http_client, 'SUPABASE_ANON_KEY', 'BusinessThis/1.0.0')
+    return await async_runner.get_client('user', factory)
+
+async def get_async_supabase_service_client():
+    """Get shared async Supabase service client for admin operations"""
+    async def factory(http_client):
+        return await _create_async_client(http_client, 'SUPABASE_SERVICE_KEY', 'BusinessThis-Admin/1.0.0')
+    return await async_runner.get_client('service', factory)
+
+def run_async(coro, timeout: Optional[float] = None):
+    """Run a coroutine on the shared Supabase event loop from synchronous code"""
+    return async_runner.run(coro, timeout)
+
 def test_supabase_connection() -> bool:
     """Test Supabase connection"""
     try:
@@ -116,10 +408,17 @@ def get_supabase_functions_client():
 
 async def test_supabase_async() -> bool:
     """Test Supabase connection asynchronously"""
+    async def query():
+        client = await get_async_supabase_client()
+        query = client.table('users').select('id').limit(1)
+        if asyncio.iscoroutinefunction(query.execute):
+            return await query.execute()
+        return await asyncio.to_thread(query.execute)
+
     try:
-        client = get_supabase_client()
-        # Test with a simple async query
-        result = await client.table('users').select('id').limit(1).execute()
+        # Async clients are bound to the shared loop, so run the query there
+        future = asyncio.run_coroutine_threadsafe(query(), async_runner.get_loop())
+        await asyncio.wrap_future(future)
         logger.info("Async Supabase connection test successful")
         return True
     except Exception as e:
@@ -155,6 +454,7 @@ def get_supabase_health_status() -> Dict[str, Any]:
             'basic_connection': basic_test,
             'storage_available': storage_test,
             'realtime_available': realtime_test,
+            'pool': get_supabase_pool_stats(),
             'version': '2.22.2',
             'timestamp': asyncio.get_event_loop().time() if asyncio.get_event_loop().is_running() else None
         }
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def safe_daily_spend(monthly_income, fixed_expenses, variable_expenses_estimate, savings_goal, months_for_goal):
     """
     Calculate the safe daily spending amount based on financial inputs.
@@ -97,11 +100,179 @@ def get_all_safe_spends(monthly_income, fixed_expenses, variable_expenses_estima
         ValueError: If any input is negative or months_for_goal is not positive.
     """
     daily = safe_daily_spend(monthly_income, fixed_expenses, variable_expenses_estimate, savings_goal, months_for_goal)
-    weekly = safe_weekly_spend(monthly_income, fixed_expenses, variable_expenses_estimate, savings_goal, months_for_goal)
-    monthly = safe_monthly_spend(monthly_income, fixed_expenses, variable_expenses_estimate, savings_goal, months_for_goal)
     
     return {
         'daily': daily,
-        'weekly': weekly,
-        'monthly': monthly
+        'weekly': daily * 7,
+        'monthly': daily * 30
+    }
+
+
+def safe_spends_batch(monthly_income, fixed_expenses, variable_expenses_estimate, savings_goal, months_for_goal):
+    """
+    Calculate daily, weekly and monthly safe spending for many profiles at once.
+
+    Each argument is an array-like (or scalar, broadcast against the others)
+    with the same meaning as in ``safe_daily_spend``. Invalid rows are not
+    raised as errors; they are flagged in the returned masks and their
+    amounts are NaN.
+
+    Args:
+        monthly_income (array-like): Monthly incomes.
+        fixed_expenses (array-like): Monthly fixed expenses.
+        variable_expenses_estimate (array-like): Estimated monthly variable expenses.
+        savings_goal (array-like): Total savings goal amounts.
+        months_for_goal (array-like): Months to achieve each savings goal.
+
+    Returns:
+        dict: 'daily', 'weekly' and 'monthly' float arrays, a boolean 'valid'
+        array, and 'invalid' mapping each input name to its boolean error mask.
+    """
+    income, fixed, variable, goal, months = np.broadcast_arrays(
+        *(np.asarray(value, dtype=np.float64) for value in (
+            monthly_income, fixed_expenses, variable_expenses_estimate, savings_goal, months_for_goal
+        ))
+    )
+
+    # Same rules as safe_daily_spend; NaN inputs are invalid too
+    invalid = {
+        'monthly_income': ~(income >= 0),
+        'fixed_expenses': ~(fixed >= 0),
+        'variable_expenses_estimate': ~(variable >= 0),
+        'savings_goal': ~(goal >= 0),
+        'months_for_goal': ~(months > 0),
+    }
+    valid = ~np.logical_or.reduce(list(invalid.values()))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        monthly_safe_spend = income - fixed - goal / months - variable
+    daily = np.where(valid, np.maximum(monthly_safe_spend / 30, 0), np.nan)
+
+    return {
+        'daily': daily,
+        'weekly': daily * 7,
+        'monthly': daily * 30,
+        'valid': valid,
+        'invalid': invalid
     }
+
+
+def compound_growth_schedule(principal, monthly_contribution, annual_rate, months):
+    """
+    Build a month-by-month compound growth schedule.
+
+    Interest compounds monthly and the contribution is added at the end of
+    each month, matching ``InvestmentService.calculate_compound_interest``.
+    Balances come from a cumulative product of growth factors,
+    B_t = G_t * (principal + contribution * sum(1 / G_s for s <= t)),
+    so the schedule is computed without a Python loop.
+
+    Args:
+        principal (float): Starting balance.
+        monthly_contribution (float): Amount added at the end of every month.
+        annual_rate (float or array-like): Annual interest rate, or one annual
+            rate per month for a variable-rate schedule.
+        months (int): Number of months in the schedule.
+
+    Returns:
+        dict: Float arrays of length ``months``: 'balance', 'contributions'
+        (cumulative, including principal), 'interest' (earned that month) and
+        'total_interest' (cumulative).
+
+    Raises:
+        ValueError: If months is not positive or the rates do not match months.
+    """
+    months = int(months)
+    if months <= 0:
+        raise ValueError("Months must be positive.")
+
+    rates = np.asarray(annual_rate, dtype=np.float64)
+    if rates.ndim == 0:
+        rates = np.full(months, float(rates))
+    elif rates.shape != (months,):
+        raise ValueError("Provide one annual rate per month.")
+
+    growth = np.cumprod(1.0 + rates / 12)
+    balance = growth * (principal + monthly_contribution * np.cumsum(1.0 / growth))
+
+    contributions = principal + monthly_contribution * np.arange(1, months + 1, dtype=np.float64)
+    previous_balance = np.concatenate(([float(principal)], balance[:-1]))
+
+    return {
+        'balance': balance,
+        'contributions': contributions,
+        'interest': balance - previous_balance - monthly_contribution,
+        'total_interest': balance - contributions
+    }
+
+
+def what_if_grid(base_income, base_expenses, income_multipliers, expense_multipliers,
+                 annual_returns, horizon_years, emergency_fund_months=6):
+    """
+    Evaluate what-if scenarios over the Cartesian product of parameter ranges.
+
+    Each axis becomes its own array dimension and results are computed with
+    broadcasting, so every output has shape (incomes, expenses, returns,
+    horizons) regardless of which axes it depends on. Monthly savings are
+    assumed to be invested at the scenario's return, compounded monthly.
+
+    Args:
+        base_income (float): Current monthly income.
+        base_expenses (float): Current monthly expenses.
+        income_multipliers (array-like): Income multipliers to evaluate.
+        expense_multipliers (array-like): Expense multipliers to evaluate.
+        annual_returns (array-like): Annual returns on saved money.
+        horizon_years (array-like): Horizons in years for projected savings.
+        emergency_fund_months (float): Months of expenses in the emergency fund.
+
+    Returns:
+        dict: Float arrays 'savings_rate' (percent), 'monthly_savings',
+        'months_to_emergency_fund' (inf when savings are not positive) and
+        'projected_savings' (balance after each horizon).
+    """
+    income = base_income * np.asarray(income_multipliers, dtype=np.float64)[:, None, None, None]
+    expenses = base_expenses * np.asarray(expense_multipliers, dtype=np.float64)[None, :, None, None]
+    monthly_rate = np.asarray(annual_returns, dtype=np.float64)[None, None, :, None] / 12
+    months = 12 * np.asarray(horizon_years, dtype=np.float64)[None, None, None, :]
+    shape = (income.shape[0], expenses.shape[1], monthly_rate.shape[2], months.shape[3])
+
+    monthly_savings = income - expenses
+    target = expenses * emergency_fund_months
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        savings_rate = np.where(income > 0, monthly_savings / income * 100, 0.0)
+
+        # Months n until the invested savings reach the target:
+        # savings * ((1 + r) ** n - 1) / r = target
+        growth = np.log1p(monthly_rate)
+        with_returns = np.log1p(target * monthly_rate / monthly_savings) / growth
+        months_to_fund = np.where(monthly_rate != 0, with_returns, target / monthly_savings)
+        # Negative returns can make the target unreachable (NaN)
+        months_to_fund = np.where((monthly_savings > 0) & ~np.isnan(months_to_fund), months_to_fund, np.inf)
+
+        annuity_factor = np.where(
+            monthly_rate != 0, np.expm1(months * growth) / monthly_rate, months
+        )
+    projected_savings = monthly_savings * annuity_factor
+
+    return {
+        'savings_rate': np.broadcast_to(savings_rate, shape),
+        'monthly_savings': np.broadcast_to(monthly_savings, shape),
+        'months_to_emergency_fund': np.broadcast_to(months_to_fund, shape),
+        'projected_savings': np.broadcast_to(projected_savings, shape)
+    }
+
+
+def add_months(start, months):
+    """
+    Year-month label a number of months after a date.
+
+    Args:
+        start (datetime.date): Starting date.
+        months (int): Months to add.
+
+    Returns:
+        str: 'YYYY-MM' of the resulting month.
+    """
+    index = start.year * 12 + start.month - 1 + int(months)
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
@@ -0,0 +1,124 @@
+"""
+Multi-debt payoff simulation for BusinessThis
+
+Debts are paid with a fixed monthly budget: every minimum payment plus an
+extra amount. Once a debt is gone its minimum rolls over to the next debt in
+the payoff order. Many extra-payment amounts are simulated together, one
+array row per scenario, so comparing strategies is one pass per strategy.
+"""
+import numpy as np
+
+
+PAYOFF_STRATEGIES = ('avalanche', 'snowball', 'custom')
+MAX_PAYOFF_MONTHS = 600
+
+# Balances below half a cent count as paid off
+_PAID_OFF = 0.005
+
+
+def payoff_order(balances, aprs, strategy='avalanche', custom_order=None):
+    """
+    Order in which extra money is applied to debts.
+
+    Args:
+        balances (array-like): Current balance of each debt.
+        aprs (array-like): Annual percentage rate of each debt (0.2 for 20%).
+        strategy (str): 'avalanche' (highest APR first), 'snowball' (smallest
+            balance first) or 'custom'.
+        custom_order (list): Debt indexes in payoff order, for 'custom'.
+
+    Returns:
+        numpy.ndarray: Debt indexes, first to pay off first.
+
+    Raises:
+        ValueError: If the strategy is unknown or the custom order is not a
+            permutation of the debts.
+    """
+    balances = np.asarray(balances, dtype=np.float64)
+    aprs = np.asarray(aprs, dtype=np.float64)
+
+    if strategy == 'avalanche':
+        # Highest rate first, smaller balance breaks ties
+        return np.lexsort((balances, -aprs))
+    if strategy == 'snowball':
+        # Smallest balance first, higher rate breaks ties
+        return np.lexsort((-aprs, balances))
+    if strategy == 'custom':
+        order = np.asarray(custom_order if custom_order is not None else [], dtype=np.int64)
+        if sorted(order.tolist()) != list(range(len(balances))):
+            raise ValueError("Custom order must list every debt exactly once.")
+        return order
+    raise ValueError(f"Unknown payoff strategy '{strategy}'.")
+
+
+def simulate_payoff(balances, aprs, minimum_payments, extra_payments, order, max_months=MAX_PAYOFF_MONTHS):
+    """
+    Simulate month-by-month payoff for several extra-payment amounts at once.
+
+    Each month interest accrues, every open debt receives its minimum
+    payment (capped at its balance), and the rest of the budget is applied
+    to debts in ``order``. The allocation is a cumulative sum over the
+    ordered balances, so a month is a handful of array operations over a
+    (scenarios, debts) matrix.
+
+    Args:
+        balances (array-like): Current balance of each debt.
+        aprs (array-like): Annual percentage rate of each debt.
+        minimum_payments (array-like): Minimum monthly payment of each debt.
+        extra_payments (array-like): Extra monthly amounts, one per scenario.
+        order (array-like): Debt indexes in payoff order (see ``payoff_order``).
+        max_months (int): Months to simulate before giving up.
+
+    Returns:
+        dict: Per-scenario arrays 'months_to_payoff' (-1 if not paid off
+        within ``max_months``), 'total_interest', 'total_paid' and
+        'payoff_months' (scenarios x debts, in the caller's debt order).
+    """
+    order = np.asarray(order, dtype=np.int64)
+    balance_row = np.asarray(balances, dtype=np.float64)[order]
+    monthly_rates = np.asarray(aprs, dtype=np.float64)[order] / 12
+    minimums = np.asarray(minimum_payments, dtype=np.float64)[order]
+    extras = np.atleast_1d(np.asarray(extra_payments, dtype=np.float64))
+
+    scenarios = extras.shape[0]
+    balance = np.tile(balance_row, (scenarios, 1))
+    budget = minimums.sum() + extras
+    total_interest = np.zeros(scenarios)
+    total_paid = np.zeros(scenarios)
+    payoff_months = np.where(balance > _PAID_OFF, -1, 0)
+
+    for month in range(1, max_months + 1):
+        open_debts = balance > _PAID_OFF
+        if not open_debts.any():
+            break
+
+        interest = balance * monthly_rates
+        balance += interest
+        total_interest += interest.sum(axis=1)
+
+        minimum = np.minimum(balance, minimums)
+        balance -= minimum
+        remaining = budget - minimum.sum(axis=1)
+
+        # Extra money covers each debt in order until the budget runs out
+        owed_before = np.cumsum(balance, axis=1) - balance
+        payment = np.clip(remaining[:, None] - owed_before, 0, balance)
+        balance -= payment
+        total_paid += minimum.sum(axis=1) + payment.sum(axis=1)
+
+        paid_off = open_debts & (balance <= _PAID_OFF)
+        payoff_months[paid_off] = month
+        balance[paid_off] = 0
+
+    months_to_payoff = np.where((payoff_months >= 0).all(axis=1), payoff_months.max(axis=1, initial=0), -1)
+
+    # Back to the caller's debt order
+    unordered = np.empty_like(payoff_months)
+    unordered[:, order] = payoff_months
+
+    return {
+        'months_to_payoff': months_to_payoff,
+        'total_interest': total_interest,
+        'total_paid': total_paid,
+        'payoff_months': unordered
+    }
@@ -0,0 +1,87 @@
+"""
+Savings goal projection for BusinessThis
+
+Goals compete for one monthly surplus. Each month the surplus fills goals
+in priority order (a waterfall), with optional interest on the amounts
+saved. Users are rows and goals are columns, so projecting one user or a
+whole advisor book is the same set of array operations.
+"""
+import numpy as np
+
+
+MAX_PROJECTION_MONTHS = 600
+
+# Within half a cent of the target counts as reached
+_REACHED = 0.005
+
+
+def project_goals(monthly_surplus, target_amounts, current_amounts, priorities=None,
+                  annual_rate=0.0, max_months=MAX_PROJECTION_MONTHS):
+    """
+    Project when each goal is reached when goals share a monthly surplus.
+
+    Goals are funded in ascending ``priority`` (ties keep their input
+    order): a goal only receives money once every goal ahead of it is fully
+    funded for the month. Balances of unfinished goals earn
+    ``annual_rate / 12`` each month before contributions.
+
+    Args:
+        monthly_surplus (float or array-like): Amount available each month,
+            one per user for a batch.
+        target_amounts (array-like): Goal targets, shape (goals,) or
+            (users, goals). Pad ragged batches with 0 targets.
+        current_amounts (array-like): Amounts already saved, same shape.
+        priorities (array-like): Goal priorities, same shape (lower first).
+        annual_rate (float): Annual interest earned on saved amounts.
+        max_months (int): Months to project before giving up.
+
+    Returns:
+        dict: Arrays shaped like ``target_amounts``: 'completion_months'
+        (0 if already reached, -1 if not reached within ``max_months``) and
+        'first_month_contribution' (how the first month's surplus is split).
+    """
+    targets = np.asarray(target_amounts, dtype=np.float64)
+    single = targets.ndim == 1
+    targets = np.atleast_2d(targets)
+    current = np.atleast_2d(np.asarray(current_amounts, dtype=np.float64))
+    users = targets.shape[0]
+    surplus = np.broadcast_to(np.asarray(monthly_surplus, dtype=np.float64), (users,))
+    surplus = np.maximum(surplus, 0)[:, None]
+
+    if priorities is None:
+        order = np.broadcast_to(np.arange(targets.shape[1]), targets.shape)
+    else:
+        order = np.argsort(np.atleast_2d(np.asarray(priorities, dtype=np.float64)), axis=1, kind='stable')
+    targets = np.take_along_axis(targets, order, axis=1)
+    balance = np.take_along_axis(current, order, axis=1).copy()
+
+    monthly_rate = annual_rate / 12
+    completion = np.where(balance >= targets - _REACHED, 0, -1)
+    first_contribution = np.zeros_like(balance)
+
+    for month in range(1, max_months + 1):
+        open_goals = completion < 0
+        if not open_goals.any():
+            break
+
+        if monthly_rate:
+            balance = np.where(open_goals, balance * (1 + monthly_rate), balance)
+
+        needed = np.where(open_goals, np.maximum(targets - balance, 0), 0)
+        needed_before = np.cumsum(needed, axis=1) - needed
+        contribution = np.clip(surplus - needed_before, 0, needed)
+        balance += contribution
+        if month == 1:
+            first_contribution = contribution
+
+        completion[open_goals & (balance >= targets - _REACHED)] = month
+
+    # Back to the caller's goal order
+    completion_out = np.empty_like(completion)
+    contribution_out = np.empty_like(first_contribution)
+    np.put_along_axis(completion_out, order, completion, axis=1)
+    np.put_along_axis(contribution_out, order, first_contribution, axis=1)
+
+    if single:
+        return {'completion_months': completion_out[0], 'first_month_contribution': contribution_out[0]}
+    return {'completion_months': completion_out, 'first_month_contribution': contribution_out}
@@ -0,0 +1,233 @@
+"""
+Financial health scoring for BusinessThis
+
+Each component score is a threshold ladder. The ladders are stored as
+sorted breakpoints, so scoring one profile or a million is the same
+comparison over arrays. Ratios are kept as exact fractions of integer
+cents, so a profile exactly on a breakpoint scores like the Decimal rules.
+"""
+import numpy as np
+
+from core.utils.money import cents_array
+
+
+SCORE_COMPONENTS = ('savings_rate', 'debt_ratio', 'emergency_fund', 'investment')
+
+# Column in financial_health_scores for each component
+SCORE_COLUMNS = {
+    'savings_rate': 'savings_rate_score',
+    'debt_ratio': 'debt_ratio_score',
+    'emergency_fund': 'emergency_fund_score',
+    'investment': 'investment_score',
+}
+
+# Savings rate (%) at or above each breakpoint earns the points after it
+_SAVINGS_RATE_BREAKPOINTS = np.array([5, 10, 15, 20])
+_SAVINGS_RATE_POINTS = np.array([0, 10, 15, 20, 25])
+
+# Debt-to-income ratio (tenths) at or below each breakpoint earns its points
+_DEBT_RATIO_BREAKPOINTS = np.array([2, 3, 4, 5])
+_DEBT_RATIO_POINTS = np.array([25, 20, 15, 10, 0])
+
+# Emergency fund progress (%) at or above each breakpoint earns the points after it
+_EMERGENCY_FUND_BREAKPOINTS = np.array([25, 50, 75, 100])
+_EMERGENCY_FUND_POINTS = np.array([0, 10, 15, 20, 25])
+
+# Investment scoring is not modelled yet; every profile gets a moderate score
+DEFAULT_INVESTMENT_SCORE = 10
+
+# Overall score at or above each breakpoint earns the level after it
+_HEALTH_LEVEL_BREAKPOINTS = np.array([40, 60, 75, 90])
+HEALTH_LEVELS = ('Critical', 'Poor', 'Fair', 'Good', 'Excellent')
+
+
+def profile_ratios(monthly_income, fixed_expenses, variable_expenses, total_debt,
+                   emergency_fund_current, emergency_fund_target):
+    """
+    Savings rate, debt-to-income ratio and emergency fund progress for many profiles.
+
+    Same definitions as the ``FinancialProfile.calculate_*`` methods: each
+    ratio is 0 where its denominator is 0. Amounts are converted to integer
+    cents and each ratio is returned as an exact fraction.
+
+    Args:
+        monthly_income (array-like): Monthly incomes.
+        fixed_expenses (array-like): Monthly fixed expenses.
+        variable_expenses (array-like): Monthly variable expenses.
+        total_debt (array-like): Total debt balances.
+        emergency_fund_current (array-like): Emergency fund saved so far.
+        emergency_fund_target (array-like): Emergency fund targets.
+
+    Returns:
+        tuple: (savings, debt, emergency_fund) ratios, each a (numerator,
+        denominator) pair of int64 arrays with positive denominators.
+    """
+    income, fixed, variable, debt, current, target = np.broadcast_arrays(
+        *(cents_array(np.atleast_1d(value)) for value in (
+            monthly_income, fixed_expenses, variable_expenses, total_debt,
+            emergency_fund_current, emergency_fund_target
+        ))
+    )
+    return (
+        _fraction(income - fixed - variable, income),
+        _fraction(debt, income),
+        _fraction(current, target)
+    )
+
+
+def _fraction(numerator, denominator):
+    """(numerator, denominator) with the sign moved to the numerator and 0/0 as 0/1"""
+    sign = np.where(denominator < 0, -1, 1)
+    zero = denominator == 0
+    return np.where(zero, 0, numerator * sign), np.where(zero, 1, denominator * sign)
+
+
+def _ladder_index(ratio, scale, breakpoints, inclusive_above=True):
+    """
+    Number of breakpoints a ratio has passed, compared exactly.
+
+    ``scale`` converts the ratio to the breakpoint unit (100 for percent).
+    With ``inclusive_above`` a breakpoint counts once the value reaches it,
+    otherwise only once the value exceeds it.
+    """
+    numerator, denominator = ratio
+    scaled = numerator[..., None] * scale
+    limits = denominator[..., None] * breakpoints
+    passed = scaled >= limits if inclusive_above else scaled > limits
+    return passed.sum(axis=-1)
+
+
+def score_components(savings, debt, emergency_fund):
+    """
+    Component scores (0-25 points each) for arrays of ratios.
+
+    Above or below the last breakpoint the score falls off linearly like
+    the original rules: twice the savings rate, 25 minus fifty times the
+    debt ratio and a quarter of the emergency fund progress, truncated and
+    never negative.
+
+    Args:
+        savings (tuple): Savings / income fractions from ``profile_ratios``.
+        debt (tuple): Debt / income fractions.
+        emergency_fund (tuple): Fund saved / target fractions.
+
+    Returns:
+        dict: Integer arrays keyed by ``SCORE_COMPONENTS``.
+    """
+    savings_index = _ladder_index(savings, 100, _SAVINGS_RATE_BREAKPOINTS)
+    savings_score = np.where(
+        savings_index == 0, np.maximum(0, savings[0] * 200 // savings[1]), _SAVINGS_RATE_POINTS[savings_index]
+    )
+
+    debt_index = _ladder_index(debt, 10, _DEBT_RATIO_BREAKPOINTS, inclusive_above=False)
+    debt_score = np.where(
+        debt_index == len(_DEBT_RATIO_BREAKPOINTS),
+        np.maximum(0, 25 - debt[0] * 50 // debt[1]),
+        _DEBT_RATIO_POINTS[debt_index]
+    )
+
+    fund_index = _ladder_index(emergency_fund, 100, _EMERGENCY_FUND_BREAKPOINTS)
+    fund_score = np.where(
+        fund_index == 0, np.maximum(0, emergency_fund[0] * 25 // emergency_fund[1]), _EMERGENCY_FUND_POINTS[fund_index]
+    )
+
+    return {
+        'savings_rate': savings_score.astype(np.int64),
+        'debt_ratio': debt_score.astype(np.int64),
+        'emergency_fund': fund_score.astype(np.int64),
+        'investment': np.full(savings_score.shape, DEFAULT_INVESTMENT_SCORE, dtype=np.int64)
+    }
+
+
+def health_levels(overall_scores):
+    """
+    Health level names for an array of overall scores.
+
+    Args:
+        overall_scores (array-like): Overall scores (0-100).
+
+    Returns:
+        numpy.ndarray: Level names from ``HEALTH_LEVELS``.
+    """
+    index = np.searchsorted(_HEALTH_LEVEL_BREAKPOINTS, np.asarray(overall_scores), side='right')
+    return np.asarray(HEALTH_LEVELS)[index]
+
+
+def score_profiles(monthly_income, fixed_expenses, variable_expenses, total_debt,
+                   emergency_fund_current, emergency_fund_target):
+    """
+    Score many financial profiles at once.
+
+    Args:
+        monthly_income (array-like): Monthly incomes.
+        fixed_expenses (array-like): Monthly fixed expenses.
+        variable_expenses (array-like): Monthly variable expenses.
+        total_debt (array-like): Total debt balances.
+        emergency_fund_current (array-like): Emergency fund saved so far.
+        emergency_fund_target (array-like): Emergency fund targets.
+
+    Returns:
+        dict: 'scores' (integer arrays keyed by ``SCORE_COMPONENTS``),
+        'overall_score' integer array and 'health_level' name array.
+    """
+    scores = score_components(*profile_ratios(
+        monthly_income, fixed_expenses, variable_expenses, total_debt,
+        emergency_fund_current, emergency_fund_target
+    ))
+    overall = sum(scores.values())
+    return {
+        'scores': scores,
+        'overall_score': overall,
+        'health_level': health_levels(overall)
+    }
+
+
+def compaction_mask(timestamps, now, weekly_after_days=90, monthly_after_days=365, values=None):
+    """
+    Points of a change-only score series to keep when down-sampling old history.
+
+    Points newer than ``weekly_after_days`` are all kept. Older points keep
+    only the last point of each week (Monday to Sunday), and points older
+    than ``monthly_after_days`` only the last point of each calendar month.
+    Since each point holds until the next one, the last point of a period
+    is the score at the end of that period. When ``values`` is given, a
+    kept point equal to the previous kept point is dropped as well.
+
+    Args:
+        timestamps (array-like): Point times in seconds since the epoch (UTC).
+        now (float): Current time in seconds since the epoch.
+        weekly_after_days (float): Age after which points are kept weekly.
+        monthly_after_days (float): Age after which points are kept monthly.
+        values (array-like): Optional score rows, shape (len(timestamps), k).
+
+    Returns:
+        numpy.ndarray: Boolean keep mask aligned with ``timestamps``.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    keep = np.zeros(timestamps.shape, dtype=bool)
+    if not timestamps.size:
+        return keep
+
+    order = np.argsort(timestamps, kind='stable')
+    times = timestamps[order]
+    age_days = (now - times) / 86400
+    days = np.floor(times / 86400).astype(np.int64)
+
+    # Period key per point: itself when recent, else its week or month
+    week = (days + 3) // 7  # the epoch fell on a Thursday
+    month = days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+    tier = np.where(age_days >= monthly_after_days, 2, np.where(age_days >= weekly_after_days, 1, 0))
+    period = np.where(tier == 2, month, np.where(tier == 1, week, np.arange(times.size)))
+
+    last_in_period = np.ones(times.size, dtype=bool)
+    last_in_period[:-1] = (tier[1:] != tier[:-1]) | (period[1:] != period[:-1])
+
+    if values is not None:
+        values = np.asarray(values)[order]
+        kept = np.flatnonzero(last_in_period)
+        repeated = np.zeros(kept.size, dtype=bool)
+        repeated[1:] = (values[kept[1:]] == values[kept[:-1]]).all(axis=-1)
+        last_in_period[kept[repeated]] = False
+
+    keep[order] = last_in_period
+    return keep
@@ -0,0 +1,59 @@
+"""
+Debt model for BusinessThis
+"""
+from datetime import datetime
+from typing import Optional, Dict, Any
+from dataclasses import dataclass
+from decimal import Decimal
+
+DEBT_TYPES = ('credit_card', 'student_loan', 'auto_loan', 'mortgage', 'personal_loan', 'medical', 'other')
+
+@dataclass
+class Debt:
+    """Debt model (one loan or card balance)"""
+    id: str
+    user_id: str
+    name: str
+    balance: Decimal
+    apr: Decimal = Decimal('0')
+    minimum_payment: Decimal = Decimal('0')
+    debt_type: str = 'other'
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert debt to dictionary"""
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'name': self.name,
+            'debt_type': self.debt_type,
+            'balance': float(self.balance),
+            'apr': float(self.apr),
+            'minimum_payment': float(self.minimum_payment),
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Debt':
+        """Create debt from dictionary"""
+        return cls(
+            id=data['id'],
+            user_id=data['user_id'],
+            name=data['name'],
+            debt_type=data.get('debt_type') or 'other',
+            balance=Decimal(str(data['balance'])),
+            apr=Decimal(str(data.get('apr', 0))),
+            minimum_payment=Decimal(str(data.get('minimum_payment', 0))),
+            created_at=datetime.fromisoformat(data['created_at']) if data.get('created_at') else None,
+            updated_at=datetime.fromisoformat(data['updated_at']) if data.get('updated_at') else None
+        )
+    
+    def monthly_interest(self) -> Decimal:
+        """Interest accrued this month at the current balance"""
+        return self.balance * self.apr / 12
+    
+    def covers_interest(self) -> bool:
+        """Check if the minimum payment at least covers monthly interest"""
+        return self.minimum_payment > self.monthly_interest()
@@ -0,0 +1,208 @@
+"""
+Monte Carlo retirement simulation for BusinessThis
+
+Paths are simulated in chunks, one month at a time, into preallocated
+buffers, so working memory is a few vectors per chunk plus the year-end
+balances kept for the percentile paths.
+
+Random number generation dominates the run time, so shocks are drawn as
+antithetic pairs (z, -z): each month draws one normal per two paths. The
+student_t chi-square mixing variable comes from a quantile table indexed
+by raw random bits instead of a gamma draw.
+"""
+from functools import lru_cache
+import os
+
+import numpy as np
+
+
+MONTE_CARLO_MEMORY_MB = float(os.getenv('MONTE_CARLO_MEMORY_MB', '64'))
+MONTE_CARLO_MAX_PATHS = int(os.getenv('MONTE_CARLO_MAX_PATHS', '100000'))
+
+RETURN_DISTRIBUTIONS = ('normal', 'lognormal', 'student_t')
+
+# Levels in the student_t mixing table (one per 16-bit index) and the gamma
+# draws its quantiles are taken from
+_MIXING_LEVELS = 1 << 16
+_MIXING_SAMPLES = 1 << 20
+
+
+@lru_cache(maxsize=8)
+def _student_t_mixing_table(degrees_of_freedom):
+    """
+    1 / sqrt(chi2 / df) at the midpoint quantiles of chi-square with ``df`` degrees of freedom.
+
+    Quantiles are order statistics of a fixed-seed gamma sample, so the
+    table is the same in every process and the simulation stays
+    reproducible for a given seed.
+    """
+    samples = np.random.default_rng(0).standard_gamma(degrees_of_freedom / 2, _MIXING_SAMPLES)
+    samples.sort()
+    step = _MIXING_SAMPLES // _MIXING_LEVELS
+    chi = 2 * samples[step // 2::step] / degrees_of_freedom
+    return (1 / np.sqrt(chi)).astype(np.float32)
+
+
+def _antithetic_normals(rng, out):
+    """Fill ``out`` with standard normals where the second half mirrors the first; returns the first half"""
+    half = (len(out) + 1) // 2
+    rng.standard_normal(dtype=np.float32, out=out[:half])
+    np.negative(out[:len(out) - half], out=out[half:])
+    return out[:half]
+
+
+def monthly_growth_sampler(rng, annual_return, annual_volatility, distribution='normal', degrees_of_freedom=5):
+    """
+    Build a function that fills a buffer with monthly growth factors (1 + return).
+
+    Every distribution uses the same monthly mean growth, (1 + r) ** (1 / 12),
+    so twelve months compound to the annual return; the monthly volatility is
+    the annual volatility / sqrt(12). Each buffer holds antithetic pairs: the
+    second half of the paths gets the mirrored shocks of the first.
+
+    Args:
+        rng (numpy.random.Generator): Seeded random generator.
+        annual_return (float): Expected annual return (0.07 for 7%).
+        annual_volatility (float): Annual standard deviation of returns.
+        distribution (str): 'normal', 'lognormal' (geometric Brownian motion)
+            or 'student_t' (fat tails, scaled to the same volatility).
+        degrees_of_freedom (int): Tail parameter for 'student_t' (must be > 2).
+
+    Returns:
+        callable: ``fill(out)`` writing growth factors into a float32 array.
+
+    Raises:
+        ValueError: If the distribution is unknown or its parameters are invalid.
+    """
+    if annual_volatility < 0:
+        raise ValueError("Annual volatility must be non-negative.")
+
+    monthly_volatility = np.float32(annual_volatility / np.sqrt(12))
+    growth_mean = np.float32((1 + annual_return) ** (1 / 12))
+
+    if distribution == 'normal':
+        def fill(out):
+            _antithetic_normals(rng, out)
+            out *= monthly_volatility
+            out += growth_mean
+        return fill
+
+    if distribution == 'lognormal':
+        # E[exp(N(mu, sigma^2))] = exp(mu + sigma^2 / 2), so the mean growth is growth_mean
+        log_mean = np.float32(np.log(float(growth_mean)) - float(monthly_volatility) ** 2 / 2)
+
+        def fill(out):
+            _antithetic_normals(rng, out)
+            out *= monthly_volatility
+            out += log_mean
+            np.exp(out, out=out)
+        return fill
+
+    if distribution == 'student_t':
+        if degrees_of_freedom <= 2:
+            raise ValueError("Degrees of freedom must be greater than 2.")
+        # Scale so the shocks have unit variance
+        scale = np.float32(monthly_volatility * np.sqrt((degrees_of_freedom - 2) / degrees_of_freedom))
+
+        mixing = _student_t_mixing_table(degrees_of_freedom)
+
+        def fill(out):
+            # t = z / sqrt(chi2 / df); a pair shares its chi2, so t and -t stay antithetic
+            first = _antithetic_normals(rng, out)
+            indexes = rng.bit_generator.random_raw(-(-len(first) // 4)).view(np.uint16)[:len(first)]
+            first *= mixing[indexes]
+            np.negative(out[:len(out) - len(first)], out=out[len(first):])
+            out *= scale
+            out += growth_mean
+        return fill
+
+    raise ValueError(f"Unknown return distribution '{distribution}'.")
+
+
+def simulate_retirement(current_savings, monthly_contribution, years, target_balance,
+                        annual_return=0.07, annual_volatility=0.15, distribution='normal',
+                        paths=10000, seed=None, degrees_of_freedom=5,
+                        percentiles=(10, 50, 90), memory_limit_mb=None):
+    """
+    Monte Carlo simulation of retirement savings growth.
+
+    Each path starts at ``current_savings`` and, every month, earns a random
+    return and then receives ``monthly_contribution``. A path succeeds if its
+    balance at retirement reaches ``target_balance``.
+
+    Args:
+        current_savings (float): Balance today.
+        monthly_contribution (float): Amount added at the end of every month.
+        years (int): Years until retirement.
+        target_balance (float): Balance needed at retirement.
+        annual_return (float): Expected annual return.
+        annual_volatility (float): Annual volatility of returns.
+        distribution (str): Return distribution, see ``monthly_growth_sampler``.
+        paths (int): Number of simulated paths.
+        seed (int): Seed for reproducible results (None for random).
+        degrees_of_freedom (int): Tail parameter for 'student_t'.
+        percentiles (tuple): Percentiles to report for each year.
+        memory_limit_mb (float): Memory cap for the simulation arrays.
+
+    Returns:
+        dict: Success probability, final balance percentiles and per-year
+        percentile paths.
+
+    Raises:
+        ValueError: If inputs are out of range or the year-end balances alone
+            would exceed the memory cap.
+    """
+    years = int(years)
+    paths = int(paths)
+    if years <= 0:
+        raise ValueError("Years must be positive.")
+    if not 0 < paths <= MONTE_CARLO_MAX_PATHS:
+        raise ValueError(f"Paths must be between 1 and {MONTE_CARLO_MAX_PATHS}.")
+
+    memory_limit = (memory_limit_mb or MONTE_CARLO_MEMORY_MB) * 1024 * 1024
+
+    # Year-end balances for every path, float32 (paths, years + 1)
+    snapshot_bytes = paths * (years + 1) * 4
+    if snapshot_bytes > memory_limit / 2:
+        raise ValueError("Too many paths for the memory limit; reduce paths or years.")
+
+    # Per path in a chunk: float32 growth and chi-square buffers and a float64 balance
+    chunk_size = int(max(1, min(paths, (memory_limit - snapshot_bytes) // 16)))
+
+    rng = np.random.default_rng(seed)
+    fill = monthly_growth_sampler(rng, annual_return, annual_volatility, distribution, degrees_of_freedom)
+    snapshots = np.empty((years + 1, paths), dtype=np.float32)
+    snapshots[0] = current_savings
+    contribution = float(monthly_contribution)
+
+    for start in range(0, paths, chunk_size):
+        end = min(paths, start + chunk_size)
+        growth = np.empty(end - start, dtype=np.float32)
+        balances = np.full(end - start, float(current_savings))
+        for month in range(1, years * 12 + 1):
+            fill(growth)
+            balances *= growth
+            balances += contribution
+            if month % 12 == 0:
+                snapshots[month // 12, start:end] = balances
+
+    final_balances = snapshots[-1]
+    path_percentiles = np.percentile(snapshots, percentiles, axis=1)
+    final_percentiles = path_percentiles[:, -1]
+
+    return {
+        'success_probability': round(float(np.mean(final_balances >= target_balance)), 4),
+        'target_balance': round(float(target_balance), 2),
+        'final_balance_percentiles': {
+            f'p{p}': round(float(value), 2) for p, value in zip(percentiles, final_percentiles)
+        },
+        'percentile_paths': {
+            'years': list(range(years + 1)),
+            **{f'p{p}': [round(float(value), 2) for value in row] for p, row in zip(percentiles, path_percentiles)}
+        },
+        'paths': paths,
+        'distribution': distribution,
+        'annual_return': annual_return,
+        'annual_volatility': annual_volatility,
+        'seed': seed
+    }
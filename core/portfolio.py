@@ -0,0 +1,247 @@
+"""
+Glide paths and rebalancing simulation for BusinessThis
+
+Allocations are stock/bond/cash percentages. The glide path applies the
+age-based allocation rules to every age at once, and the rebalancing
+simulation grows many return paths month by month over that path.
+"""
+import numpy as np
+
+
+RISK_TOLERANCES = ('conservative', 'moderate', 'aggressive')
+ASSET_CLASSES = ('stocks', 'bonds', 'cash')
+REBALANCING_STRATEGIES = ('calendar', 'threshold', 'none')
+
+# Annual (mean return, volatility) per asset class
+DEFAULT_ASSET_RETURNS = {
+    'stocks': (0.08, 0.16),
+    'bonds': (0.04, 0.06),
+    'cash': (0.02, 0.005),
+}
+
+# Stock/bond correlation used for the return draws; cash is independent
+STOCK_BOND_CORRELATION = 0.1
+
+# Working memory for one chunk of paths, and the approximate bytes each
+# strategy needs per month x path cell (holdings, weights, drift, turnover)
+REBALANCING_CHUNK_BYTES = 32 * 1024 * 1024
+_CELL_BYTES = {'threshold': 16, 'periodic': 64}
+
+
+def glide_path(ages, risk_tolerance='moderate'):
+    """
+    Recommended stock/bond/cash percentages for each age.
+
+    Same rules as ``InvestmentService.calculate_asset_allocation``, applied
+    to an array of ages.
+
+    Args:
+        ages (array-like): Ages to allocate for.
+        risk_tolerance (str): 'conservative', 'moderate' or 'aggressive'
+            (anything else is treated as moderate).
+
+    Returns:
+        numpy.ndarray: Integer percentages, shape (len(ages), 3) in
+        ``ASSET_CLASSES`` order; each row sums to 100.
+    """
+    ages = np.asarray(ages, dtype=np.float64)
+
+    if risk_tolerance == 'conservative':
+        stocks = np.maximum(20, 100 - ages)
+        bonds = np.minimum(80, ages + 20)
+        cash = np.full_like(ages, 10)
+    elif risk_tolerance == 'aggressive':
+        stocks = np.maximum(80, 100 - ages + 10)
+        bonds = np.minimum(20, ages - 10)
+        cash = np.full_like(ages, 5)
+    else:
+        stocks = np.maximum(60, 100 - ages)
+        bonds = np.minimum(40, ages)
+        cash = np.full_like(ages, 5)
+
+    # Rescale rows that do not add up to 100, truncating like int()
+    total = stocks + bonds + cash
+    rescale = total != 100
+    stocks = np.where(rescale, np.trunc(stocks * 100 / total), stocks)
+    bonds = np.where(rescale, np.trunc(bonds * 100 / total), bonds)
+    cash = np.where(rescale, 100 - stocks - bonds, cash)
+
+    return np.stack([stocks, bonds, cash], axis=-1).astype(np.int64)
+
+
+def draw_asset_growth(months, paths, asset_returns=None, seed=None):
+    """
+    Draw monthly growth factors (1 + return) for each asset class.
+
+    Args:
+        months (int): Number of months.
+        paths (int): Number of return paths.
+        asset_returns (dict): Annual (mean, volatility) per asset class.
+        seed (int): Seed for reproducible results.
+
+    Returns:
+        numpy.ndarray: float32, shape (months, paths, 3) in ``ASSET_CLASSES`` order.
+    """
+    asset_returns = asset_returns or DEFAULT_ASSET_RETURNS
+    means = np.array([asset_returns[asset][0] for asset in ASSET_CLASSES]) / 12
+    vols = np.array([asset_returns[asset][1] for asset in ASSET_CLASSES]) / np.sqrt(12)
+    correlation = np.eye(3)
+    correlation[0, 1] = correlation[1, 0] = STOCK_BOND_CORRELATION
+    cholesky = np.linalg.cholesky(np.outer(vols, vols) * correlation).astype(np.float32)
+
+    # Correlated shocks from float32 standard normals, shifted to growth factors in place
+    rng = np.random.default_rng(seed)
+    growth = rng.standard_normal((months, paths, 3), dtype=np.float32) @ cholesky.T
+    growth += (1 + means).astype(np.float32)
+    return np.maximum(growth, 0, out=growth)
+
+
+def simulate_rebalancing(target_weights, strategy='calendar', threshold=0.05, frequency_months=12,
+                         asset_returns=None, paths=500, seed=None, growth=None):
+    """
+    Simulate portfolio drift and turnover while following a glide path.
+
+    Each row of ``target_weights`` is the target for one year. At the start
+    of every month the portfolio is rebalanced to that year's target if the
+    strategy says so, then each asset earns a random return:
+
+    - 'calendar': every ``frequency_months`` months
+    - 'threshold': whenever any weight drifts more than ``threshold`` from target
+    - 'none': never (buy and hold)
+
+    Calendar and buy-and-hold holdings are cumulative products within each
+    rebalancing period, so all months are computed at once; threshold
+    rebalancing depends on the path so far and steps through the months.
+    Paths are simulated in chunks of about ``REBALANCING_CHUNK_BYTES`` of
+    working arrays and reduced as they go, so memory beyond ``growth`` does
+    not grow with ``paths``.
+
+    Args:
+        target_weights (array-like): Shape (years, 3) weights or percentages.
+        strategy (str): One of ``REBALANCING_STRATEGIES``.
+        threshold (float): Absolute drift that triggers a threshold rebalance.
+        frequency_months (int): Months between calendar rebalances.
+        asset_returns (dict): Annual (mean, volatility) per asset class.
+        paths (int): Number of simulated return paths.
+        seed (int): Seed for reproducible results.
+        growth (numpy.ndarray): Precomputed ``draw_asset_growth`` output, so
+            several strategies can share the same markets.
+
+    Returns:
+        dict: Per-year arrays averaged over paths plus path-level
+        'total_turnover' and 'growth' (final value of 1 invested) arrays.
+        'drift' is the mean, and 'max_drift' the largest, maximum absolute
+        weight drift seen before each month's rebalance; 'turnover' is the
+        fraction of the portfolio traded and 'rebalances' the count.
+
+    Raises:
+        ValueError: If the strategy is unknown or inputs are out of range.
+    """
+    if strategy not in REBALANCING_STRATEGIES:
+        raise ValueError(f"Unknown rebalancing strategy '{strategy}'.")
+    if paths <= 0 or frequency_months <= 0 or threshold <= 0:
+        raise ValueError("Paths, frequency and threshold must be positive.")
+
+    targets = np.asarray(target_weights, dtype=np.float64)
+    targets = targets / targets.sum(axis=1, keepdims=True)
+    years = targets.shape[0]
+    months = years * 12
+    if growth is None:
+        growth = draw_asset_growth(months, paths, asset_returns, seed)
+    paths = growth.shape[1]
+    monthly_targets = targets[np.arange(months) // 12]
+
+    period = frequency_months if strategy == 'calendar' else months
+
+    drift_total, max_drift = np.zeros(years), np.full(years, -np.inf)
+    turnover_total, rebalances = np.zeros(years), np.zeros(years)
+    total_turnover, final_value = np.empty(paths), np.empty(paths)
+    cell_bytes = _CELL_BYTES['threshold' if strategy == 'threshold' else 'periodic']
+    chunk_size = max(1, REBALANCING_CHUNK_BYTES // (cell_bytes * months))
+    for start in range(0, paths, chunk_size):
+        end = min(paths, start + chunk_size)
+        chunk = growth[:, start:end]
+        if strategy == 'threshold':
+            drift, traded, final_value[start:end] = _threshold_rebalancing(chunk, monthly_targets, threshold)
+        else:
+            drift, traded, final_value[start:end] = _periodic_rebalancing(
+                chunk, monthly_targets.astype(np.float32), period
+            )
+
+        by_year = (years, 12, end - start)
+        drift = drift.reshape(by_year)
+        traded = traded.reshape(by_year)
+        turnover = traded.sum(axis=1)
+        drift_total += drift.sum(axis=(1, 2))
+        np.maximum(max_drift, drift.max(axis=(1, 2)), out=max_drift)
+        turnover_total += turnover.sum(axis=1)
+        rebalances += (traded > 0).sum(axis=(1, 2))
+        total_turnover[start:end] = turnover.sum(axis=0)
+
+    return {
+        'drift': drift_total / (12 * paths),
+        'max_drift': max_drift,
+        'turnover': turnover_total / paths,
+        'rebalances': rebalances / paths,
+        'total_turnover': total_turnover,
+        'growth': final_value
+    }
+
+
+def _periodic_rebalancing(growth, monthly_targets, period):
+    """Drift, traded fraction per month and final value when rebalancing every ``period`` months"""
+    months, paths, assets = growth.shape
+    periods = -(-months // period)
+    if periods * period == months:
+        holdings = growth.reshape(periods, period, paths, assets).copy()
+    else:
+        holdings = np.ones((periods * period, paths, assets), dtype=growth.dtype)
+        holdings[:months] = growth
+        holdings = holdings.reshape(periods, period, paths, assets)
+    np.cumprod(holdings, axis=1, out=holdings)
+
+    # Holdings at the start of each month, relative to the period's starting value
+    period_targets = monthly_targets[np.minimum(np.arange(periods) * period, months - 1)]
+    holdings *= period_targets[:, None, None, :]
+    weights = holdings / holdings.sum(axis=-1, keepdims=True)
+    end_weights = weights[:, -1]
+
+    # Weights before each month's rebalance: the target in a period's first
+    # month, then the weights after the previous month's growth; the first
+    # month of a later period sees the previous period's final weights
+    before = np.empty_like(weights)
+    before[:, 0] = period_targets[:, None, :]
+    before[:, 1:] = weights[:, :-1]
+    before[1:, 0] = end_weights[:-1]
+    before = before.reshape(-1, paths, assets)[:months]
+    drift = np.abs(before - monthly_targets[:, None, :]).max(axis=-1)
+
+    # Half the absolute change in weights is the fraction of the portfolio traded
+    traded = np.zeros((months, paths))
+    starts = np.arange(period, months, period)
+    traded[starts] = np.abs(before[starts] - monthly_targets[starts, None, :]).sum(axis=-1) / 2
+
+    final_value = holdings[:, -1].sum(axis=-1).prod(axis=0)
+    return drift, traded, final_value
+
+
+def _threshold_rebalancing(growth, monthly_targets, threshold):
+    """Drift, traded fraction per month and final value when rebalancing on drift"""
+    months, paths, _ = growth.shape
+    holdings = np.tile(monthly_targets[0], (paths, 1))
+    drift = np.empty((months, paths))
+    traded = np.zeros((months, paths))
+
+    for month in range(months):
+        target = monthly_targets[month]
+        value = holdings.sum(axis=1, keepdims=True)
+        weights = holdings / value
+        drift[month] = np.abs(weights - target).max(axis=1)
+        rebalance = drift[month] > threshold
+        if rebalance.any():
+            # Half the absolute change in weights is the fraction of the portfolio traded
+            traded[month] = np.where(rebalance, np.abs(weights - target).sum(axis=1) / 2, 0)
+            holdings = np.where(rebalance[:, None], value * target, holdings)
+        holdings *= growth[month]
+
+    return drift, traded, holdings.sum(axis=1)
@@ -0,0 +1,175 @@
+"""
+Federal income tax tables for BusinessThis
+
+Brackets are stored per tax year and filing status with the tax owed at
+each bracket floor precomputed, so a single lookup is a bisect plus one
+multiply and many incomes can be evaluated at once with NumPy.
+"""
+from bisect import bisect_right
+
+import numpy as np
+
+
+FILING_STATUSES = ('single', 'married_joint', 'married_separate', 'head_of_household')
+
+# year -> filing status -> (bracket floors, rates, standard deduction)
+_BRACKETS = {
+    2023: {
+        'single': ((0, 11000, 44725, 95375, 182100, 231250, 578125), 13850),
+        'married_joint': ((0, 22000, 89450, 190750, 364200, 462500, 693750), 27700),
+        'married_separate': ((0, 11000, 44725, 95375, 182100, 231250, 346875), 13850),
+        'head_of_household': ((0, 15700, 59850, 95350, 182100, 231250, 578100), 20800),
+    },
+    2024: {
+        'single': ((0, 11600, 47150, 100525, 191950, 243725, 609350), 14600),
+        'married_joint': ((0, 23200, 94300, 201050, 383900, 487450, 731200), 29200),
+        'married_separate': ((0, 11600, 47150, 100525, 191950, 243725, 365600), 14600),
+        'head_of_household': ((0, 16550, 63100, 100500, 191950, 243700, 609350), 21900),
+    },
+}
+_RATES = (0.10, 0.12, 0.22, 0.24, 0.32, 0.35, 0.37)
+
+DEFAULT_TAX_YEAR = max(_BRACKETS)
+
+
+class TaxTable:
+    """Progressive brackets for one tax year and filing status"""
+
+    def __init__(self, year, filing_status, floors, rates, standard_deduction):
+        if len(floors) != len(rates) or floors[0] != 0 or list(floors) != sorted(floors):
+            raise ValueError("Bracket floors must start at 0, be sorted and match the rates.")
+        self.year = year
+        self.filing_status = filing_status
+        self.floors = tuple(float(floor) for floor in floors)
+        self.rates = tuple(rates)
+        self.standard_deduction = float(standard_deduction)
+
+        # Tax owed on income up to each bracket floor
+        base_tax = [0.0]
+        for index in range(1, len(self.floors)):
+            width = self.floors[index] - self.floors[index - 1]
+            base_tax.append(base_tax[-1] + width * self.rates[index - 1])
+        self.base_tax = tuple(base_tax)
+
+        self._floors = np.array(self.floors)
+        self._rates = np.array(self.rates)
+        self._base_tax = np.array(self.base_tax)
+
+    def bracket_index(self, taxable_income):
+        """Index of the bracket that taxes the next dollar of taxable income"""
+        return max(0, bisect_right(self.floors, taxable_income) - 1)
+
+    def tax(self, taxable_income):
+        """Tax owed on a taxable income"""
+        if taxable_income <= 0:
+            return 0.0
+        index = self.bracket_index(taxable_income)
+        return self.base_tax[index] + (taxable_income - self.floors[index]) * self.rates[index]
+
+    def marginal_rate(self, taxable_income):
+        """Rate applied to the next dollar of taxable income"""
+        return self.rates[self.bracket_index(max(0, taxable_income))]
+
+    def breakdown(self, taxable_income):
+        """Income and tax in each bracket the taxable income reaches"""
+        rows = []
+        for index, floor in enumerate(self.floors):
+            if taxable_income <= floor:
+                break
+            ceiling = self.floors[index + 1] if index + 1 < len(self.floors) else float('inf')
+            bracket_income = min(taxable_income, ceiling) - floor
+            rows.append({
+                'floor': floor,
+                'ceiling': ceiling,
+                'rate': self.rates[index],
+                'income': bracket_income,
+                'tax': bracket_income * self.rates[index]
+            })
+        return rows
+
+    def tax_array(self, taxable_income):
+        """
+        Tax and marginal rate for an array of taxable incomes.
+
+        Args:
+            taxable_income (array-like): Taxable incomes.
+
+        Returns:
+            tuple: (tax, marginal_rate) float arrays shaped like the input.
+        """
+        taxable = np.maximum(np.asarray(taxable_income, dtype=np.float64), 0)
+        index = np.searchsorted(self._floors, taxable, side='right') - 1
+        tax = self._base_tax[index] + (taxable - self._floors[index]) * self._rates[index]
+        return tax, self._rates[index]
+
+
+TAX_TABLES = {
+    (year, status): TaxTable(year, status, floors, _RATES, standard_deduction)
+    for year, statuses in _BRACKETS.items()
+    for status, (floors, standard_deduction) in statuses.items()
+}
+
+
+def get_tax_table(year=None, filing_status='single'):
+    """
+    Get the tax table for a year and filing status.
+
+    Args:
+        year (int): Tax year (defaults to the latest available).
+        filing_status (str): One of ``FILING_STATUSES``.
+
+    Returns:
+        TaxTable: The matching table.
+
+    Raises:
+        ValueError: If there is no table for the year or filing status.
+    """
+    year = DEFAULT_TAX_YEAR if year is None else int(year)
+    if filing_status not in FILING_STATUSES:
+        raise ValueError(f"Filing status must be one of: {', '.join(FILING_STATUSES)}.")
+    if (year, filing_status) not in TAX_TABLES:
+        raise ValueError(f"No tax table for {year}; available years: {', '.join(map(str, sorted(_BRACKETS)))}.")
+    return TAX_TABLES[(year, filing_status)]
+
+
+def evaluate_taxes(income, deductions=0, credits=0, year=None, filing_status='single'):
+    """
+    Compute federal income tax for many incomes and deduction amounts at once.
+
+    Inputs broadcast against each other, so an income array with a scalar
+    deduction gives an effective-rate curve and a scalar income with an array
+    of deductions compares candidate deductions.
+
+    Args:
+        income (array-like): Gross annual incomes.
+        deductions (array-like): Itemized deductions; the standard deduction
+            is used wherever it is larger.
+        credits (array-like): Tax credits subtracted from the tax owed.
+        year (int): Tax year (defaults to the latest available).
+        filing_status (str): One of ``FILING_STATUSES``.
+
+    Returns:
+        dict: Float arrays 'taxable_income', 'tax', 'final_tax',
+        'effective_rate' and 'marginal_rate' (rate on the next dollar of gross
+        income, 0 while income is covered by the deduction).
+    """
+    table = get_tax_table(year, filing_status)
+    income, deductions, credits = np.broadcast_arrays(
+        *(np.asarray(value, dtype=np.float64) for value in (income, deductions, credits))
+    )
+
+    deduction = np.maximum(deductions, table.standard_deduction)
+    taxable_income = np.maximum(income - deduction, 0)
+    tax, bracket_rate = table.tax_array(taxable_income)
+    final_tax = np.maximum(tax - credits, 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        effective_rate = np.where(income > 0, final_tax / income, 0.0)
+
+    return {
+        'taxable_income': taxable_income,
+        'tax': tax,
+        'final_tax': final_tax,
+        'effective_rate': effective_rate,
+        'marginal_rate': np.where(income >= deduction, bracket_rate, 0.0)
+    }
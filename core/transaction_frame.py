@@ -0,0 +1,315 @@
+"""
+Columnar transactions for BusinessThis
+
+A ``TransactionFrame`` holds a set of transactions as parallel NumPy
+arrays instead of a list of dicts or ``Transaction`` objects: amounts as
+int64 cents, dates as int32 days since the epoch and categories and
+transaction types as small integer codes into shared dictionaries. Rows
+are kept in date order, so a date range is a contiguous slice (views of
+the same arrays), and group-bys are a ``bincount`` over combined codes.
+"""
+from datetime import date, datetime
+
+import numpy as np
+
+from core.utils.money import cents_array, from_cents
+
+
+_EPOCH_DAY = np.datetime64('1970-01-01', 'D')
+
+# Day number of transactions without a date; sorts first and is outside every date range
+MISSING_DAY = np.iinfo(np.int32).min
+
+
+def _parse_day(value):
+    """One ISO date string as datetime64[D], or NaT when it is not a valid date"""
+    try:
+        return np.datetime64(value, 'D')
+    except ValueError:
+        return np.datetime64('NaT', 'D')
+
+
+def _day_numbers(values):
+    """
+    Days since the epoch for ISO date strings, dates or datetimes.
+
+    None and strings that are not ISO dates ('2024-1-5', '01/15/2024') are
+    ``MISSING_DAY`` rather than an error.
+    """
+    dates = [
+        'NaT' if value is None
+        else value.date().isoformat() if isinstance(value, datetime)
+        else value.isoformat() if isinstance(value, date)
+        else str(value)[:10]
+        for value in values
+    ]
+    try:
+        parsed = np.array(dates, dtype='datetime64[D]')
+    except ValueError:
+        # Parse one by one only when some value is malformed
+        parsed = np.array([_parse_day(value) for value in dates], dtype='datetime64[D]')
+    days = (parsed - _EPOCH_DAY).astype(np.int64)
+    return np.where(np.isnat(parsed), MISSING_DAY, days).astype(np.int32)
+
+
+def _as_day(value):
+    """Days since the epoch for one date-like value"""
+    return int(_day_numbers([value])[0])
+
+
+def _encode(values):
+    """Dictionary-encode strings (None as ''), returning (codes, dictionary)"""
+    dictionary, codes = np.unique(np.array([value or '' for value in values], dtype=object).astype(str),
+                                  return_inverse=True)
+    return codes.astype(np.int32), tuple(dictionary.tolist())
+
+
+class TransactionFrame:
+    """
+    Transactions stored column by column.
+
+    Attributes:
+        amount_cents (numpy.ndarray): int64 amounts in cents.
+        days (numpy.ndarray): int32 transaction dates as days since 1970-01-01.
+        category_codes (numpy.ndarray): int32 indexes into ``categories``.
+        type_codes (numpy.ndarray): int32 indexes into ``transaction_types``.
+        categories (tuple): Category names; '' stands for no category.
+        transaction_types (tuple): Transaction type names.
+    """
+
+    __slots__ = ('amount_cents', 'days', 'category_codes', 'type_codes', 'categories', 'transaction_types')
+
+    def __init__(self, amount_cents, days, category_codes, type_codes, categories, transaction_types):
+        """
+        Wrap existing arrays without copying them.
+
+        Rows must already be in date order; use ``from_rows`` or
+        ``from_models`` to build a frame from unsorted data.
+        """
+        self.amount_cents = amount_cents
+        self.days = days
+        self.category_codes = category_codes
+        self.type_codes = type_codes
+        self.categories = categories
+        self.transaction_types = transaction_types
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Build a frame from transaction dicts (API rows or ``Transaction.to_dict()``).
+
+        Args:
+            rows (list): Dicts with 'amount', 'date', 'category' and
+                'transaction_type'. A missing type is kept as '' (it is not
+                an expense, income or transfer), and a missing or malformed
+                date is kept as ``MISSING_DAY``.
+
+        Returns:
+            TransactionFrame: The rows in date order.
+        """
+        rows = list(rows)
+        if not rows:
+            return cls.empty()
+        return cls._build(
+            cents_array([row.get('amount') or 0 for row in rows]),
+            _day_numbers([row.get('date') for row in rows]),
+            [row.get('category') for row in rows],
+            [row.get('transaction_type') for row in rows]
+        )
+
+    @classmethod
+    def from_models(cls, transactions):
+        """
+        Build a frame from ``Transaction`` objects.
+
+        Args:
+            transactions (list): ``Transaction`` instances with a date.
+
+        Returns:
+            TransactionFrame: The transactions in date order.
+        """
+        transactions = list(transactions)
+        if not transactions:
+            return cls.empty()
+        return cls._build(
+            cents_array([str(transaction.amount) for transaction in transactions]),
+            _day_numbers([transaction.date for transaction in transactions]),
+            [transaction.category for transaction in transactions],
+            [transaction.transaction_type for transaction in transactions]
+        )
+
+    @classmethod
+    def coerce(cls, transactions):
+        """Return ``transactions`` as a frame, converting a list of dicts or models"""
+        if isinstance(transactions, cls):
+            return transactions
+        transactions = list(transactions or [])
+        if transactions and not isinstance(transactions[0], dict):
+            return cls.from_models(transactions)
+        return cls.from_rows(transactions)
+
+    @classmethod
+    def empty(cls):
+        """A frame with no transactions"""
+        return cls(np.zeros(0, np.int64), np.zeros(0, np.int32), np.zeros(0, np.int32),
+                   np.zeros(0, np.int32), (), ())
+
+    @classmethod
+    def _build(cls, amount_cents, days, categories, transaction_types):
+        order = np.argsort(days, kind='stable')
+        category_codes, category_names = _encode(categories)
+        type_codes, type_names = _encode(transaction_types)
+        return cls(amount_cents[order], days[order], category_codes[order], type_codes[order],
+                   category_names, type_names)
+
+    def __len__(self):
+        return len(self.days)
+
+    def _take(self, index):
+        """Rows selected by a slice (views) or a mask or index array (copies)"""
+        return TransactionFrame(self.amount_cents[index], self.days[index], self.category_codes[index],
+                                self.type_codes[index], self.categories, self.transaction_types)
+
+    def between(self, start=None, end=None):
+        """
+        Transactions dated from ``start`` to ``end`` inclusive.
+
+        The result shares this frame's arrays (a slice, not a copy).
+        Undated transactions are never in a range.
+
+        Args:
+            start: First date (ISO string, date or datetime), or None.
+            end: Last date, or None.
+
+        Returns:
+            TransactionFrame: The rows in the range.
+        """
+        first = MISSING_DAY + 1 if start is None else _as_day(start)
+        low = np.searchsorted(self.days, first, side='left')
+        high = len(self) if end is None else np.searchsorted(self.days, _as_day(end), side='right')
+        return self._take(slice(low, max(low, high)))
+
+    def latest(self, count):
+        """The ``count`` most recent transactions, as a slice of this frame"""
+        return self._take(slice(max(0, len(self) - count), len(self)))
+
+    def of_type(self, transaction_type):
+        """Transactions of one type ('income', 'expense' or 'transfer')"""
+        if transaction_type not in self.transaction_types:
+            return self._take(slice(0, 0))
+        return self._take(self.type_codes == self.transaction_types.index(transaction_type))
+
+    def total_cents(self):
+        """Sum of all amounts in cents"""
+        return int(self.amount_cents.sum())
+
+    def group_totals(self, by=('transaction_type', 'category')):
+        """
+        Total cents and transaction count per group.
+
+        Args:
+            by (tuple): Any of 'month', 'transaction_type' and 'category'.
+
+        Returns:
+            list: One dict per non-empty group with the ``by`` keys (months as
+            'YYYY-MM-01' strings), 'total_cents' and 'transaction_count',
+            ordered by the ``by`` keys. The shape matches the rows of
+            ``get_transaction_summary()`` and the monthly rollups. Undated
+            transactions have a month of None.
+        """
+        if not len(self):
+            return []
+
+        # Combine the per-row codes of each key into one mixed-radix code
+        keys, sizes = [], []
+        for name in by:
+            if name == 'month':
+                # Month index 0 is reserved for undated transactions
+                dated = self.days != MISSING_DAY
+                months = self.days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+                first_month = months[dated].min() - 1 if dated.any() else 0
+                keys.append(np.where(dated, months - first_month, 0))
+                sizes.append(int(months[dated].max() - first_month) + 1 if dated.any() else 1)
+            elif name == 'transaction_type':
+                keys.append(self.type_codes)
+                sizes.append(len(self.transaction_types))
+            elif name == 'category':
+                keys.append(self.category_codes)
+                sizes.append(len(self.categories))
+            else:
+                raise ValueError(f"Cannot group transactions by '{name}'.")
+
+        combined = np.zeros(len(self), dtype=np.int64)
+        for key, size in zip(keys, sizes):
+            combined = combined * size + key
+
+        groups, inverse = np.unique(combined, return_inverse=True)
+        # float64 sums are exact for totals below 2**53 cents
+        totals = np.rint(np.bincount(inverse, weights=self.amount_cents)).astype(np.int64)
+        counts = np.bincount(inverse)
+
+        # Split the group codes back into their keys
+        columns = {}
+        remainder = groups
+        for name, size in reversed(list(zip(by, sizes))):
+            remainder, code = np.divmod(remainder, size)
+            if name == 'month':
+                labels = (code + first_month).astype('datetime64[M]').astype('datetime64[D]').astype(str)
+                columns[name] = np.where(code == 0, None, labels.astype(object))
+            elif name == 'transaction_type':
+                columns[name] = np.asarray(self.transaction_types, dtype=object)[code]
+            else:
+                columns[name] = np.asarray(self.categories, dtype=object)[code]
+
+        return [
+            {**{name: columns[name][index] for name in by},
+             'total_cents': int(totals[index]), 'transaction_count': int(counts[index])}
+            for index in range(len(groups))
+        ]
+
+    def sum_by_category(self, default_category=''):
+        """
+        Total cents per category.
+
+        Args:
+            default_category (str): Name used for transactions with no category.
+
+        Returns:
+            dict: Category name to total cents, for categories present.
+        """
+        totals = np.bincount(self.category_codes, weights=self.amount_cents, minlength=len(self.categories))
+        present = np.bincount(self.category_codes, minlength=len(self.categories)) > 0
+        return {
+            (category or default_category): int(round(total))
+            for category, total, seen in zip(self.categories, totals, present) if seen
+        }
+
+    def sum_by_type(self):
+        """Total cents per transaction type present in the frame"""
+        return {row['transaction_type']: row['total_cents'] for row in self.group_totals(('transaction_type',))}
+
+    def to_records(self, newest_first=False):
+        """
+        Rows as dicts with 'date', 'amount', 'category' and 'transaction_type'.
+
+        Only the frame's columns are returned; use the original rows when
+        descriptions, accounts or recurrence are needed.
+
+        Args:
+            newest_first (bool): Return the most recent transaction first.
+
+        Returns:
+            list: Dicts with ISO dates, float amounts and None for no category.
+        """
+        order = slice(None, None, -1) if newest_first else slice(None)
+        days = self.days[order]
+        dates = np.where(days == MISSING_DAY, None, days.astype('datetime64[D]').astype(str).astype(object))
+        categories = self.category_codes[order]
+        types = self.type_codes[order]
+        return [{
+            'date': day,
+            'amount': from_cents(cents),
+            'category': self.categories[category] or None,
+            'transaction_type': self.transaction_types[kind] or None
+        } for day, cents, category, kind in zip(dates, self.amount_cents[order].tolist(),
+                                                  categories.tolist(), types.tolist())]
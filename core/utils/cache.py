@@ -0,0 +1,173 @@
+"""
+In-process caching utilities for BusinessThis
+"""
+import copy
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+_MISSING = object()
+
+class LRUTTLCache:
+    """Thread-safe bounded LRU cache with per-entry time-to-live
+
+    A reader that loads a value from the database takes ``generation()``
+    before the read and passes it to ``set``; if the key was invalidated in
+    between, the (possibly stale) value is not stored.
+    """
+
+    def __init__(self, name: str, max_entries: int = 10000, ttl_seconds: float = 300):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        # Generation of each key's latest invalidation; keys dropped from this
+        # bounded map are assumed invalidated at ``_invalidated_floor``
+        self._generation = 0
+        self._invalidated: 'OrderedDict[Hashable, int]' = OrderedDict()
+        self._invalidated_floor = 0
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0,
+            'stale_sets': 0
+        }
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Look up a key, returning (found, value)"""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self._stats['misses'] += 1
+                return False, None
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return True, value
+
+    def generation(self) -> int:
+        """Token to take before loading a value that will be passed to ``set``"""
+        with self._lock:
+            return self._generation
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None,
+            generation: Optional[int] = None) -> bool:
+        """Store a value, evicting the least recently used entries if full
+
+        With ``generation``, the value is dropped (and False returned) if the
+        key was invalidated after that generation was taken.
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            if generation is not None and self._invalidated.get(key, self._invalidated_floor) > generation:
+                self._stats['stale_sets'] += 1
+                return False
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+            return True
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Remove a key, returning True if it was cached"""
+        with self._lock:
+            self._generation += 1
+            self._invalidated[key] = self._generation
+            self._invalidated.move_to_end(key)
+            while len(self._invalidated) > self.max_entries:
+                _, generation = self._invalidated.popitem(last=False)
+                self._invalidated_floor = max(self._invalidated_floor, generation)
+            if self._entries.pop(key, _MISSING) is _MISSING:
+                return False
+            self._stats['invalidations'] += 1
+            return True
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._generation += 1
+            self._invalidated.clear()
+            self._invalidated_floor = self._generation
+            self._stats['invalidations'] += len(self._entries)
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['name'] = self.name
+        stats['max_entries'] = self.max_entries
+        stats['ttl_seconds'] = self.ttl_seconds
+        stats['hit_rate'] = round(stats['hits'] / lookups * 100, 2) if lookups > 0 else 0
+        return stats
+
+def normalize_key(value: Any, precision: int = 6) -> Hashable:
+    """Hashable cache key with numbers rounded, so 30, 30.0 and 30.0000000001 match"""
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return round(float(value), precision) + 0.0
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), normalize_key(item, precision)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = (normalize_key(item, precision) for item in value)
+        return tuple(sorted(items, key=repr)) if isinstance(value, (set, frozenset)) else tuple(items)
+    try:
+        return round(float(value), precision) + 0.0
+    except (TypeError, ValueError):
+        return repr(value)
+
+def memoize(name: str, max_entries: int = 1024, ttl_seconds: float = 3600, precision: int = 6,
+            enabled: Union[bool, Callable[[], bool]] = True):
+    """Memoize a pure method in a bounded, thread-safe LRU cache
+
+    Arguments are bound to the signature (so positional and keyword calls
+    share entries) and numbers are rounded to ``precision`` decimals.
+    Results are deep-copied in and out so callers can mutate them, and
+    ``{'error': ...}`` results are never cached. ``enabled`` may be a
+    callable, checked on every call. The cache is exposed as ``.cache``.
+    """
+    cache = LRUTTLCache(name, max_entries, ttl_seconds)
+
+    def decorator(function: Callable) -> Callable:
+        signature = inspect.signature(function)
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not (enabled() if callable(enabled) else enabled):
+                return function(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = [(key, value) for key, value in bound.arguments.items() if key not in ('self', 'cls')]
+            key = normalize_key(arguments, precision)
+
+            found, result = cache.get(key)
+            if found:
+                return copy.deepcopy(result)
+
+            result = function(*args, **kwargs)
+            if not (isinstance(result, dict) and 'error' in result):
+                cache.set(key, copy.deepcopy(result))
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
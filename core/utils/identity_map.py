@@ -0,0 +1,94 @@
+"""
+Request-scoped identity map for BusinessThis
+Keeps rows loaded during a single request on flask.g so each (table, key)
+is fetched from Supabase at most once per request
+"""
+from typing import Any, Dict, Hashable, Optional, Tuple
+import logging
+
+try:
+    from flask import g, has_app_context
+except ImportError:
+    # Fallback for when Flask is not available (scripts, Streamlit)
+    g = None
+
+    def has_app_context() -> bool:
+        return False
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+class IdentityMap:
+    """Per-request map of loaded rows keyed by (table, key)"""
+
+    def __init__(self):
+        self._rows: Dict[Tuple[str, Hashable], Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, table: str, key: Hashable) -> Tuple[bool, Any]:
+        """Look up a row, returning (found, value)"""
+        value = self._rows.get((table, key), _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, value
+
+    def put(self, table: str, key: Hashable, value: Any):
+        """Record a loaded (or known-missing) row"""
+        self._rows[(table, key)] = value
+
+    def discard(self, table: str, key: Hashable):
+        """Forget a row after it has been written"""
+        self._rows.pop((table, key), None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get identity map counters for the current request"""
+        return {
+            'entries': len(self._rows),
+            'round_trips_saved': self.hits,
+            'round_trips': self.misses
+        }
+
+def get_identity_map() -> Optional[IdentityMap]:
+    """Get the identity map for the current request, or None outside a request"""
+    if g is None or not has_app_context():
+        return None
+    identity_map = getattr(g, '_identity_map', None)
+    if identity_map is None:
+        identity_map = IdentityMap()
+        g._identity_map = identity_map
+    return identity_map
+
+def identity_map_get(table: str, key: Hashable) -> Tuple[bool, Any]:
+    """Look up a row in the current request's identity map"""
+    identity_map = get_identity_map()
+    if identity_map is None:
+        return False, None
+    return identity_map.get(table, key)
+
+def identity_map_put(table: str, key: Hashable, value: Any):
+    """Store a row in the current request's identity map"""
+    identity_map = get_identity_map()
+    if identity_map is not None:
+        identity_map.put(table, key, value)
+
+def identity_map_discard(table: str, key: Hashable):
+    """Remove a row from the current request's identity map"""
+    identity_map = get_identity_map()
+    if identity_map is not None:
+        identity_map.discard(table, key)
+
+def add_identity_map_headers(response):
+    """Add identity map debug counters to response headers"""
+    if g is None or not has_app_context():
+        return response
+    identity_map = getattr(g, '_identity_map', None)
+    if identity_map is not None:
+        stats = identity_map.get_stats()
+        response.headers['X-DB-Round-Trips'] = str(stats['round_trips'])
+        response.headers['X-DB-Round-Trips-Saved'] = str(stats['round_trips_saved'])
+        logger.debug(f"Identity map: {stats}")
+    return response
@@ -0,0 +1,68 @@
+"""
+Integer-cents money helpers for BusinessThis
+
+Amounts are stored as DECIMAL(12,2), so every value is a whole number of
+cents. Calculations and aggregations work on ints (or int64 arrays), which
+are exact and much cheaper than Decimal; conversion to float or Decimal
+happens only when a response is built.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+import numpy as np
+
+CENTS_PER_UNIT = 100
+
+def to_cents(value: Any) -> int:
+    """Convert an amount (int, float, str or Decimal) to integer cents, rounding half away from zero"""
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value * CENTS_PER_UNIT
+    if isinstance(value, float):
+        # Two-decimal floats are within 1e-9 cents of their true value
+        return int(value * CENTS_PER_UNIT + (0.5 if value >= 0 else -0.5))
+    if isinstance(value, str):
+        return _parse_cents(value)
+    if isinstance(value, Decimal):
+        return int((value * CENTS_PER_UNIT).to_integral_value(rounding=ROUND_HALF_UP))
+    return to_cents(float(value))
+
+def _parse_cents(text: str) -> int:
+    """Parse '123.45' style strings without going through Decimal"""
+    text = text.strip()
+    negative = text.startswith('-')
+    digits = text.lstrip('+-')
+    whole, _, fraction = digits.partition('.')
+    if not (whole or fraction) or not (whole or '0').isdigit() or (fraction and not fraction.isdigit()):
+        # Exponents and other unusual forms
+        return to_cents(Decimal(text))
+    cents = int(whole or 0) * CENTS_PER_UNIT + int(fraction[:2].ljust(2, '0'))
+    if len(fraction) > 2 and fraction[2] >= '5':
+        cents += 1
+    return -cents if negative else cents
+
+def from_cents(cents: int) -> float:
+    """Float amount for JSON responses (cents / 100 is the nearest float to the decimal)"""
+    return int(cents) / CENTS_PER_UNIT
+
+def cents_to_decimal(cents: int) -> Decimal:
+    """Exact Decimal amount for code that still needs Decimal"""
+    return Decimal(int(cents)).scaleb(-2)
+
+def cents_array(values: Iterable[Any]) -> np.ndarray:
+    """Vectorized ``to_cents`` for numbers or numeric strings, as int64"""
+    amounts = np.asarray(list(values) if not isinstance(values, np.ndarray) else values)
+    if amounts.dtype.kind in 'iu':
+        return amounts.astype(np.int64) * CENTS_PER_UNIT
+    amounts = amounts.astype(np.float64) * CENTS_PER_UNIT
+    return np.trunc(amounts + np.copysign(0.5, amounts)).astype(np.int64)
+
+def sum_cents_by(rows: Iterable[Dict[str, Any]], key: str, amount_field: str = 'amount',
+                 default_key: Optional[Hashable] = None) -> Dict[Hashable, int]:
+    """Total cents of ``amount_field`` per value of ``key`` across rows"""
+    totals: Dict[Hashable, int] = {}
+    for row in rows:
+        group = row.get(key) or default_key
+        totals[group] = totals.get(group, 0) + to_cents(row.get(amount_field))
+    return totals
@@ -0,0 +1,62 @@
+"""
+Keyset pagination helpers for BusinessThis
+"""
+import base64
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort-key values of the last row on a page as an opaque cursor"""
+    raw = json.dumps(list(values), separators=(',', ':'), default=str).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str, expected_length: int) -> List[Any]:
+    """Decode a cursor produced by ``encode_cursor``; raises ValueError if malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != expected_length:
+        raise ValueError('Invalid cursor')
+    return values
+
+def quote_filter_value(value: Any) -> str:
+    """Quote a value for a PostgREST logical filter (handles '.', ',', ':' and parentheses)"""
+    text = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{text}"'
+
+def keyset_condition(columns: Sequence[str], values: Sequence[Any], descending: bool = True) -> str:
+    """PostgREST condition selecting rows strictly after ``values`` in (columns) order
+
+    For columns (a, b) descending this is ``a < va OR (a = va AND b < vb)``.
+    """
+    operator = 'lt' if descending else 'gt'
+    branches = []
+    for position, column in enumerate(columns):
+        equal = [f'{columns[i]}.eq.{quote_filter_value(values[i])}' for i in range(position)]
+        strict = f'{column}.{operator}.{quote_filter_value(values[position])}'
+        branches.append(f"and({','.join(equal + [strict])})" if equal else strict)
+    return f"or({','.join(branches)})"
+
+def combine_conditions(*conditions: Optional[str]) -> Optional[str]:
+    """AND several logical conditions into one string for ``query.or_()``
+
+    PostgREST only accepts one ``or`` parameter per query, so conditions are
+    wrapped as ``and(...)`` inside a single-branch ``or``.
+    """
+    present = [condition for condition in conditions if condition]
+    if not present:
+        return None
+    return f"and({','.join(present)})"
+
+def build_page(rows: List[Dict[str, Any]], limit: int, cursor_columns: Sequence[str]) -> Dict[str, Any]:
+    """Trim a ``limit + 1`` fetch to one page and compute the next cursor"""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor([rows[-1].get(column) for column in cursor_columns]) if has_more and rows else None
+    return {
+        'rows': rows,
+        'has_more': has_more,
+        'next_cursor': next_cursor
+    }
@@ -0,0 +1,244 @@
+"""
+Mergeable streaming sketches for BusinessThis analytics
+
+HyperLogLog estimates distinct counts and CountMinSketch/TopK estimate item
+frequencies in fixed memory. Sketches of the same shape can be merged, so a
+month is the merge of its days and several app processes can each keep their
+own sketch for the same window.
+
+Error bounds:
+- HyperLogLog: relative standard error 1.04 / sqrt(2 ** precision)
+  (precision 12 -> 1.6%). ``count_with_bounds`` reports a 95% interval.
+- CountMinSketch: never underestimates. With probability 1 - e ** -depth an
+  estimate exceeds the true count by at most (e / width) * total.
+  (width 2048, depth 5 -> over by at most 0.13% of all events, 99.3% of the time).
+"""
+import base64
+import hashlib
+import json
+import math
+import struct
+import zlib
+from array import array
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+_SKETCH_VERSION = 1
+_KIND_HLL = 1
+_KIND_CMS = 2
+_KIND_TOPK = 3
+
+def _hash64(item: Hashable, seed: int = 0) -> int:
+    """Stable 64-bit hash (Python's hash() is randomised per process)"""
+    digest = hashlib.blake2b(str(item).encode('utf-8'), digest_size=8, salt=struct.pack('<Q', seed)).digest()
+    return struct.unpack('<Q', digest)[0]
+
+def _encode(kind: int, header: Dict[str, Any], payload: bytes) -> str:
+    header_bytes = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    raw = struct.pack('<BBI', _SKETCH_VERSION, kind, len(header_bytes)) + header_bytes + payload
+    return base64.b64encode(zlib.compress(raw)).decode('ascii')
+
+def _decode(data: str, expected_kind: int) -> Tuple[Dict[str, Any], bytes]:
+    raw = zlib.decompress(base64.b64decode(data))
+    version, kind, header_length = struct.unpack_from('<BBI', raw)
+    if version != _SKETCH_VERSION or kind != expected_kind:
+        raise ValueError(f"Unsupported sketch encoding (version {version}, kind {kind})")
+    offset = struct.calcsize('<BBI')
+    header = json.loads(raw[offset:offset + header_length].decode('utf-8'))
+    return header, raw[offset + header_length:]
+
+class HyperLogLog:
+    """Distinct-count sketch using 2 ** precision one-byte registers"""
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    @property
+    def standard_error(self) -> float:
+        """Relative standard error of ``count()``"""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, item: Hashable):
+        value = _hash64(item)
+        index = value >> (64 - self.precision)
+        remainder = value & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        """Estimated number of distinct items added"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def count_with_bounds(self) -> Dict[str, Any]:
+        """Estimate with a 95% confidence interval"""
+        estimate = self.count()
+        margin = 1.96 * self.standard_error * estimate
+        return {
+            'estimate': estimate,
+            'lower_bound': max(0, int(math.floor(estimate - margin))),
+            'upper_bound': int(math.ceil(estimate + margin)),
+            'relative_standard_error': round(self.standard_error, 4),
+            'confidence': 0.95
+        }
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Fold another sketch into this one (union of the two streams)"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+        return self
+
+    def serialize(self) -> str:
+        return _encode(_KIND_HLL, {'precision': self.precision}, bytes(self.registers))
+
+    @classmethod
+    def deserialize(cls, data: str) -> 'HyperLogLog':
+        header, payload = _decode(data, _KIND_HLL)
+        sketch = cls(header['precision'])
+        sketch.registers = bytearray(payload)
+        return sketch
+
+class CountMinSketch:
+    """Frequency sketch with ``depth`` rows of ``width`` counters"""
+
+    def __init__(self, width: int = 2048, depth: int = 5):
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be positive")
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self.table = [array('Q', bytes(8 * width)) for _ in range(depth)]
+
+    @property
+    def epsilon(self) -> float:
+        """Overestimate bound as a fraction of ``total``"""
+        return math.e / self.width
+
+    @property
+    def delta(self) -> float:
+        """Probability that an estimate exceeds the bound"""
+        return math.exp(-self.depth)
+
+    def _indexes(self, item: Hashable) -> List[int]:
+        first, second = _hash64(item, 0), _hash64(item, 1)
+        return [(first + row * second) % self.width for row in range(self.depth)]
+
+    def add(self, item: Hashable, count: int = 1):
+        for row, index in enumerate(self._indexes(item)):
+            self.table[row][index] += count
+        self.total += count
+
+    def estimate(self, item: Hashable) -> int:
+        """Estimated count for an item (never below the true count)"""
+        return min(self.table[row][index] for row, index in enumerate(self._indexes(item)))
+
+    def error_bound(self) -> Dict[str, Any]:
+        """Maximum overestimate and the probability it holds"""
+        return {
+            'max_overestimate': int(math.ceil(self.epsilon * self.total)),
+            'confidence': round(1 - self.delta, 4),
+            'total': self.total
+        }
+
+    def merge(self, other: 'CountMinSketch') -> 'CountMinSketch':
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge count-min sketches with different dimensions")
+        for row, other_row in zip(self.table, other.table):
+            for index, value in enumerate(other_row):
+                if value:
+                    row[index] += value
+        self.total += other.total
+        return self
+
+    def _payload(self) -> bytes:
+        return b''.join(row.tobytes() for row in self.table)
+
+    def _load_payload(self, payload: bytes):
+        row_size = 8 * self.width
+        self.table = []
+        for row in range(self.depth):
+            values = array('Q')
+            values.frombytes(payload[row * row_size:(row + 1) * row_size])
+            self.table.append(values)
+
+    def serialize(self) -> str:
+        return _encode(_KIND_CMS, {'width': self.width, 'depth': self.depth, 'total': self.total}, self._payload())
+
+    @classmethod
+    def deserialize(cls, data: str) -> 'CountMinSketch':
+        header, payload = _decode(data, _KIND_CMS)
+        sketch = cls(header['width'], header['depth'])
+        sketch.total = header['total']
+        sketch._load_payload(payload)
+        return sketch
+
+class TopK:
+    """Heavy hitters: a count-min sketch plus the ``k`` items with the highest estimates"""
+
+    def __init__(self, k: int = 10, width: int = 2048, depth: int = 5):
+        self.k = k
+        self.sketch = CountMinSketch(width, depth)
+        self.candidates: Dict[str, int] = {}
+
+    def add(self, item: Hashable, count: int = 1):
+        key = str(item)
+        self.sketch.add(key, count)
+        estimate = self.sketch.estimate(key)
+        if key in self.candidates or len(self.candidates) < self.k:
+            self.candidates[key] = estimate
+            return
+        smallest = min(self.candidates, key=self.candidates.get)
+        if estimate > self.candidates[smallest]:
+            del self.candidates[smallest]
+            self.candidates[key] = estimate
+
+    def top(self, k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Most frequent items, highest first, with estimated counts"""
+        ranked = sorted(self.candidates.items(), key=lambda item: (-item[1], item[0]))
+        return [{'item': item, 'estimated_count': count} for item, count in ranked[:k or self.k]]
+
+    def error_bound(self) -> Dict[str, Any]:
+        return self.sketch.error_bound()
+
+    def merge(self, other: 'TopK') -> 'TopK':
+        self.sketch.merge(other.sketch)
+        keys = set(self.candidates) | set(other.candidates)
+        estimates = {key: self.sketch.estimate(key) for key in keys}
+        ranked = sorted(estimates.items(), key=lambda item: (-item[1], item[0]))
+        self.candidates = dict(ranked[:self.k])
+        return self
+
+    def serialize(self) -> str:
+        header = {
+            'k': self.k,
+            'width': self.sketch.width,
+            'depth': self.sketch.depth,
+            'total': self.sketch.total,
+            'candidates': self.candidates
+        }
+        return _encode(_KIND_TOPK, header, self.sketch._payload())
+
+    @classmethod
+    def deserialize(cls, data: str) -> 'TopK':
+        header, payload = _decode(data, _KIND_TOPK)
+        sketch = cls(header['k'], header['width'], header['depth'])
+        sketch.sketch.total = header['total']
+        sketch.sketch._load_payload(payload)
+        sketch.candidates = header['candidates']
+        return sketch
+
+SKETCH_TYPES = {
+    'hll': HyperLogLog,
+    'cms': CountMinSketch,
+    'topk': TopK,
+}
@@ -55,6 +55,19 @@ CREATE TABLE public.savings_goals (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Debts table (individual debts; financial_profiles.total_debt is their sum)
+CREATE TABLE public.debts (
+    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
+    user_id UUID REFERENCES public.users(id) ON DELETE CASCADE,
+    name VARCHAR(255) NOT NULL,
+    debt_type VARCHAR(50) DEFAULT 'other' CHECK (debt_type IN ('credit_card', 'student_loan', 'auto_loan', 'mortgage', 'personal_loan', 'medical', 'other')),
+    balance DECIMAL(12,2) NOT NULL CHECK (balance >= 0),
+    apr DECIMAL(6,4) NOT NULL DEFAULT 0 CHECK (apr >= 0),
+    minimum_payment DECIMAL(12,2) NOT NULL DEFAULT 0 CHECK (minimum_payment >= 0),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
 -- Transactions table
 CREATE TABLE public.transactions (
     id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
@@ -71,6 +84,18 @@ CREATE TABLE public.transactions (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Per-user monthly transaction totals, maintained by triggers on transactions
+CREATE TABLE public.transaction_monthly_rollups (
+    user_id UUID REFERENCES public.users(id) ON DELETE CASCADE,
+    month DATE NOT NULL,
+    transaction_type VARCHAR(20) NOT NULL DEFAULT '',
+    category VARCHAR(100) NOT NULL DEFAULT '',
+    total_cents BIGINT NOT NULL DEFAULT 0,
+    transaction_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (user_id, month, transaction_type, category)
+);
+
 -- Subscriptions table
 CREATE TABLE public.subscriptions (
     id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
@@ -96,6 +121,65 @@ CREATE TABLE public.ai_usage (
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Financial health score history
+CREATE TABLE public.financial_health_scores (
+    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
+    user_id UUID REFERENCES public.users(id) ON DELETE CASCADE,
+    overall_score INTEGER NOT NULL,
+    savings_rate_score INTEGER DEFAULT 0,
+    debt_ratio_score INTEGER DEFAULT 0,
+    emergency_fund_score INTEGER DEFAULT 0,
+    investment_score INTEGER DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Each user's most recent financial_health_scores row, maintained by triggers
+CREATE TABLE public.financial_health_latest_scores (
+    user_id UUID PRIMARY KEY REFERENCES public.users(id) ON DELETE CASCADE,
+    score_id UUID NOT NULL,
+    overall_score INTEGER NOT NULL,
+    savings_rate_score INTEGER DEFAULT 0,
+    debt_ratio_score INTEGER DEFAULT 0,
+    emergency_fund_score INTEGER DEFAULT 0,
+    investment_score INTEGER DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+-- Support tickets
+CREATE TABLE public.support_tickets (
+    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
+    user_id UUID REFERENCES public.users(id) ON DELETE CASCADE,
+    subject VARCHAR(255),
+    message TEXT,
+    status VARCHAR(20) DEFAULT 'open',
+    response TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Daily metric rollups, maintained by triggers (see bottom of file)
+CREATE TABLE public.daily_metrics (
+    metric_date DATE NOT NULL,
+    metric VARCHAR(50) NOT NULL,
+    dimension VARCHAR(50) NOT NULL DEFAULT '',
+    value BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (metric_date, metric, dimension)
+);
+
+-- Serialized analytics sketches (HyperLogLog / top-k), one row per process shard;
+-- closed windows are merged into a single 'merged' shard by scripts/compact_sketches.py
+CREATE TABLE public.analytics_sketches (
+    name VARCHAR(50) NOT NULL,
+    period VARCHAR(10) NOT NULL CHECK (period IN ('day', 'month')),
+    window_start DATE NOT NULL,
+    shard VARCHAR(100) NOT NULL,
+    kind VARCHAR(10) NOT NULL,
+    data TEXT NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (name, period, window_start, shard)
+);
+
 -- Investment portfolios
 CREATE TABLE public.investment_portfolios (
     id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
@@ -162,12 +246,18 @@ CREATE TABLE public.admin_logs (
 
 -- Create indexes for better performance
 CREATE INDEX idx_users_email ON public.users(email);
+CREATE INDEX idx_users_created_at_id ON public.users(created_at DESC, id DESC);
 CREATE INDEX idx_financial_profiles_user_id ON public.financial_profiles(user_id);
 CREATE INDEX idx_savings_goals_user_id ON public.savings_goals(user_id);
+CREATE INDEX idx_debts_user_id ON public.debts(user_id);
 CREATE INDEX idx_transactions_user_id ON public.transactions(user_id);
 CREATE INDEX idx_transactions_date ON public.transactions(date);
+CREATE INDEX idx_transactions_user_id_date ON public.transactions(user_id, date DESC, id DESC);
 CREATE INDEX idx_subscriptions_user_id ON public.subscriptions(user_id);
 CREATE INDEX idx_ai_usage_user_id ON public.ai_usage(user_id);
+CREATE INDEX idx_financial_health_scores_user_id_created_at ON public.financial_health_scores(user_id, created_at DESC);
+CREATE INDEX idx_support_tickets_status ON public.support_tickets(status);
+CREATE INDEX idx_daily_metrics_metric_date ON public.daily_metrics(metric, metric_date);
 CREATE INDEX idx_investment_portfolios_user_id ON public.investment_portfolios(user_id);
 CREATE INDEX idx_enrollments_user_id ON public.enrollments(user_id);
 CREATE INDEX idx_enrollments_course_id ON public.enrollments(course_id);
@@ -179,15 +269,28 @@ CREATE INDEX idx_admin_logs_created_at ON public.admin_logs(created_at);
 ALTER TABLE public.users ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.financial_profiles ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.savings_goals ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.debts ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.transactions ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.transaction_monthly_rollups ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.subscriptions ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.ai_usage ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.financial_health_scores ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.financial_health_latest_scores ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.support_tickets ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.daily_metrics ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.analytics_sketches ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.investment_portfolios ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.courses ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.enrollments ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.affiliate_links ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.admin_logs ENABLE ROW LEVEL SECURITY;
 
+-- Realtime changes used to invalidate the per-worker profile and goal caches.
+-- Full replica identity puts user_id in DELETE payloads, not just the primary key.
+ALTER TABLE public.financial_profiles REPLICA IDENTITY FULL;
+ALTER TABLE public.savings_goals REPLICA IDENTITY FULL;
+ALTER PUBLICATION supabase_realtime ADD TABLE public.financial_profiles, public.savings_goals;
+
 -- Create RLS policies (basic policies for now)
 -- Users can only see their own data
 CREATE POLICY "Users can view own data" ON public.users FOR SELECT USING (auth.uid()::text = id::text);
@@ -204,10 +307,17 @@ CREATE POLICY "Users can insert own savings goals" ON public.savings_goals FOR I
 CREATE POLICY "Users can update own savings goals" ON public.savings_goals FOR UPDATE USING (auth.uid()::text = user_id::text);
 CREATE POLICY "Users can delete own savings goals" ON public.savings_goals FOR DELETE USING (auth.uid()::text = user_id::text);
 
+-- Debts policies
+CREATE POLICY "Users can view own debts" ON public.debts FOR SELECT USING (auth.uid()::text = user_id::text);
+CREATE POLICY "Users can insert own debts" ON public.debts FOR INSERT WITH CHECK (auth.uid()::text = user_id::text);
+CREATE POLICY "Users can update own debts" ON public.debts FOR UPDATE USING (auth.uid()::text = user_id::text);
+CREATE POLICY "Users can delete own debts" ON public.debts FOR DELETE USING (auth.uid()::text = user_id::text);
+
 -- Transactions policies
 CREATE POLICY "Users can view own transactions" ON public.transactions FOR SELECT USING (auth.uid()::text = user_id::text);
 CREATE POLICY "Users can insert own transactions" ON public.transactions FOR INSERT WITH CHECK (auth.uid()::text = user_id::text);
 CREATE POLICY "Users can update own transactions" ON public.transactions FOR UPDATE USING (auth.uid()::text = user_id::text);
+CREATE POLICY "Users can view own transaction rollups" ON public.transaction_monthly_rollups FOR SELECT USING (auth.uid()::text = user_id::text);
 
 -- Subscriptions policies
 CREATE POLICY "Users can view own subscriptions" ON public.subscriptions FOR SELECT USING (auth.uid()::text = user_id::text);
@@ -218,6 +328,15 @@ CREATE POLICY "Users can update own subscriptions" ON public.subscriptions FOR U
 CREATE POLICY "Users can view own AI usage" ON public.ai_usage FOR SELECT USING (auth.uid()::text = user_id::text);
 CREATE POLICY "Users can insert own AI usage" ON public.ai_usage FOR INSERT WITH CHECK (auth.uid()::text = user_id::text);
 
+-- Financial health score policies
+CREATE POLICY "Users can view own health scores" ON public.financial_health_scores FOR SELECT USING (auth.uid()::text = user_id::text);
+CREATE POLICY "Users can insert own health scores" ON public.financial_health_scores FOR INSERT WITH CHECK (auth.uid()::text = user_id::text);
+CREATE POLICY "Users can view own latest health score" ON public.financial_health_latest_scores FOR SELECT USING (auth.uid()::text = user_id::text);
+
+-- Support ticket policies
+CREATE POLICY "Users can view own support tickets" ON public.support_tickets FOR SELECT USING (auth.uid()::text = user_id::text);
+CREATE POLICY "Users can insert own support tickets" ON public.support_tickets FOR INSERT WITH CHECK (auth.uid()::text = user_id::text);
+
 -- Investment portfolios policies
 CREATE POLICY "Users can view own investment portfolios" ON public.investment_portfolios FOR SELECT USING (auth.uid()::text = user_id::text);
 CREATE POLICY "Users can insert own investment portfolios" ON public.investment_portfolios FOR INSERT WITH CHECK (auth.uid()::text = user_id::text);
@@ -264,8 +383,319 @@ $$ language 'plpgsql';
 CREATE TRIGGER update_users_updated_at BEFORE UPDATE ON public.users FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_financial_profiles_updated_at BEFORE UPDATE ON public.financial_profiles FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_savings_goals_updated_at BEFORE UPDATE ON public.savings_goals FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+CREATE TRIGGER update_debts_updated_at BEFORE UPDATE ON public.debts FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_transactions_updated_at BEFORE UPDATE ON public.transactions FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_subscriptions_updated_at BEFORE UPDATE ON public.subscriptions FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_investment_portfolios_updated_at BEFORE UPDATE ON public.investment_portfolios FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_courses_updated_at BEFORE UPDATE ON public.courses FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 CREATE TRIGGER update_affiliate_links_updated_at BEFORE UPDATE ON public.affiliate_links FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Admin dashboard metrics in a single round trip
+CREATE OR REPLACE FUNCTION get_admin_dashboard_metrics(
+    month_start TIMESTAMP WITH TIME ZONE,
+    active_since TIMESTAMP WITH TIME ZONE,
+    churn_since TIMESTAMP WITH TIME ZONE
+)
+RETURNS JSONB AS $$
+    SELECT jsonb_build_object(
+        'total_users', u.total_users,
+        'new_users_this_month', u.new_users_this_month,
+        'active_users', u.active_users,
+        'free_users', u.free_users,
+        'premium_users', u.premium_users,
+        'pro_users', u.pro_users,
+        'churned_users', u.churned_users,
+        'users_with_profiles', p.users_with_profiles,
+        'average_health_score', h.average_health_score,
+        'total_goals', g.total_goals,
+        'achieved_goals', g.achieved_goals,
+        'total_ai_usage', a.total_ai_usage,
+        'monthly_ai_usage', a.monthly_ai_usage,
+        'unique_ai_users', a.unique_ai_users
+    )
+    FROM (
+        SELECT
+            COUNT(*) AS total_users,
+            COUNT(*) FILTER (WHERE created_at >= month_start) AS new_users_this_month,
+            COUNT(*) FILTER (WHERE last_login >= active_since) AS active_users,
+            COUNT(*) FILTER (WHERE subscription_tier = 'free') AS free_users,
+            COUNT(*) FILTER (WHERE subscription_tier = 'premium') AS premium_users,
+            COUNT(*) FILTER (WHERE subscription_tier = 'pro') AS pro_users,
+            COUNT(*) FILTER (WHERE subscription_status = 'cancelled' AND updated_at >= churn_since) AS churned_users
+        FROM public.users
+    ) u,
+    (SELECT COUNT(*) AS users_with_profiles FROM public.financial_profiles) p,
+    -- Average of each user's latest score, not of every historical score row
+    (SELECT COALESCE(AVG(overall_score), 0) AS average_health_score FROM public.financial_health_latest_scores) h,
+    (
+        SELECT COUNT(*) AS total_goals, COUNT(*) FILTER (WHERE is_achieved) AS achieved_goals
+        FROM public.savings_goals
+    ) g,
+    (
+        SELECT
+            COUNT(*) AS total_ai_usage,
+            COUNT(*) FILTER (WHERE created_at >= month_start) AS monthly_ai_usage,
+            COUNT(DISTINCT user_id) AS unique_ai_users
+        FROM public.ai_usage
+    ) a;
+$$ LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public;
+
+-- Dashboard metrics cover every user, so only the service role may call them
+REVOKE EXECUTE ON FUNCTION get_admin_dashboard_metrics(TIMESTAMP WITH TIME ZONE, TIMESTAMP WITH TIME ZONE, TIMESTAMP WITH TIME ZONE) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION get_admin_dashboard_metrics(TIMESTAMP WITH TIME ZONE, TIMESTAMP WITH TIME ZONE, TIMESTAMP WITH TIME ZONE) TO service_role;
+
+-- Daily metric rollups
+-- Each event bumps one (day, metric, dimension) counter, so admin charts read
+-- a few rows per day instead of scanning the event tables.
+CREATE OR REPLACE FUNCTION bump_daily_metric(p_metric TEXT, p_dimension TEXT, p_delta BIGINT DEFAULT 1)
+RETURNS VOID AS $$
+    INSERT INTO public.daily_metrics (metric_date, metric, dimension, value)
+    VALUES (CURRENT_DATE, p_metric, COALESCE(p_dimension, ''), p_delta)
+    ON CONFLICT (metric_date, metric, dimension)
+    DO UPDATE SET value = public.daily_metrics.value + EXCLUDED.value, updated_at = NOW();
+$$ LANGUAGE sql SECURITY DEFINER SET search_path = public;
+
+-- Only the rollup triggers (running as the function owner) may bump counters
+REVOKE EXECUTE ON FUNCTION bump_daily_metric(TEXT, TEXT, BIGINT) FROM PUBLIC, anon, authenticated;
+
+CREATE OR REPLACE FUNCTION health_score_bucket(score INTEGER)
+RETURNS TEXT AS $$
+    SELECT CASE
+        WHEN score >= 90 THEN 'excellent'
+        WHEN score >= 75 THEN 'good'
+        WHEN score >= 60 THEN 'fair'
+        WHEN score >= 40 THEN 'poor'
+        ELSE 'critical'
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION rollup_user_events()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_daily_metric('signups', NEW.subscription_tier);
+    ELSE
+        IF NEW.subscription_tier IS DISTINCT FROM OLD.subscription_tier THEN
+            PERFORM bump_daily_metric('tier_changes', NEW.subscription_tier);
+        END IF;
+        IF NEW.subscription_status = 'cancelled' AND OLD.subscription_status IS DISTINCT FROM 'cancelled' THEN
+            PERFORM bump_daily_metric('cancellations', NEW.subscription_tier);
+        END IF;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION rollup_goal_events()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.is_achieved AND (TG_OP = 'INSERT' OR NOT COALESCE(OLD.is_achieved, FALSE)) THEN
+        PERFORM bump_daily_metric('goals_achieved', '');
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION rollup_ai_usage_events()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM bump_daily_metric('ai_calls', NEW.request_type);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Counts score rows written, i.e. score changes per day: unchanged scores are
+-- not re-inserted and compacted rows are not subtracted. The per-user
+-- distribution comes from financial_health_latest_scores instead.
+CREATE OR REPLACE FUNCTION rollup_health_score_events()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM bump_daily_metric('health_scores', health_score_bucket(NEW.overall_score));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE TRIGGER rollup_users_events AFTER INSERT OR UPDATE OF subscription_tier, subscription_status ON public.users FOR EACH ROW EXECUTE FUNCTION rollup_user_events();
+CREATE TRIGGER rollup_savings_goals_events AFTER INSERT OR UPDATE OF is_achieved ON public.savings_goals FOR EACH ROW EXECUTE FUNCTION rollup_goal_events();
+CREATE TRIGGER rollup_ai_usage_events AFTER INSERT ON public.ai_usage FOR EACH ROW EXECUTE FUNCTION rollup_ai_usage_events();
+CREATE TRIGGER rollup_financial_health_scores_events AFTER INSERT ON public.financial_health_scores FOR EACH ROW EXECUTE FUNCTION rollup_health_score_events();
+
+-- One-off backfill for days before the triggers existed. Tier changes have no
+-- history to rebuild from, and cancellations/achievements are dated by the
+-- row's last update.
+CREATE OR REPLACE FUNCTION rebuild_daily_metrics(since DATE)
+RETURNS VOID AS $$
+    DELETE FROM public.daily_metrics WHERE metric_date >= since AND metric <> 'tier_changes';
+
+    INSERT INTO public.daily_metrics (metric_date, metric, dimension, value)
+    SELECT created_at::date, 'signups', subscription_tier, COUNT(*)
+    FROM public.users WHERE created_at::date >= since GROUP BY 1, 3
+    UNION ALL
+    SELECT updated_at::date, 'cancellations', subscription_tier, COUNT(*)
+    FROM public.users WHERE subscription_status = 'cancelled' AND updated_at::date >= since GROUP BY 1, 3
+    UNION ALL
+    SELECT COALESCE(achieved_at, updated_at)::date, 'goals_achieved', '', COUNT(*)
+    FROM public.savings_goals WHERE is_achieved AND COALESCE(achieved_at, updated_at)::date >= since GROUP BY 1
+    UNION ALL
+    SELECT created_at::date, 'ai_calls', request_type, COUNT(*)
+    FROM public.ai_usage WHERE created_at::date >= since GROUP BY 1, 3
+    UNION ALL
+    SELECT created_at::date, 'health_scores', health_score_bucket(overall_score), COUNT(*)
+    FROM public.financial_health_scores WHERE created_at::date >= since GROUP BY 1, 3;
+$$ LANGUAGE sql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION rebuild_daily_metrics(DATE) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION rebuild_daily_metrics(DATE) TO service_role;
+
+-- Monthly transaction rollups
+-- Every insert, update and delete on transactions moves its amount between
+-- (user, month, type, category) totals, so analytics read at most one row
+-- per category per month however long the history is.
+CREATE OR REPLACE FUNCTION bump_transaction_rollup(
+    p_user_id UUID, p_date DATE, p_type TEXT, p_category TEXT, p_amount DECIMAL, p_sign INTEGER
+)
+RETURNS VOID AS $$
+    INSERT INTO public.transaction_monthly_rollups (user_id, month, transaction_type, category, total_cents, transaction_count)
+    VALUES (
+        p_user_id, date_trunc('month', p_date)::date, COALESCE(p_type, ''), COALESCE(p_category, ''),
+        p_sign * ROUND(p_amount * 100)::bigint, p_sign
+    )
+    ON CONFLICT (user_id, month, transaction_type, category)
+    DO UPDATE SET
+        total_cents = public.transaction_monthly_rollups.total_cents + EXCLUDED.total_cents,
+        transaction_count = public.transaction_monthly_rollups.transaction_count + EXCLUDED.transaction_count,
+        updated_at = NOW();
+$$ LANGUAGE sql SECURITY DEFINER SET search_path = public;
+
+-- Only rollup_transaction_events() (running as the function owner) may adjust rollups
+REVOKE EXECUTE ON FUNCTION bump_transaction_rollup(UUID, DATE, TEXT, TEXT, DECIMAL, INTEGER) FROM PUBLIC, anon, authenticated;
+
+CREATE OR REPLACE FUNCTION rollup_transaction_events()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.user_id IS NOT NULL THEN
+        PERFORM bump_transaction_rollup(OLD.user_id, OLD.date, OLD.transaction_type, OLD.category, OLD.amount, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.user_id IS NOT NULL THEN
+        PERFORM bump_transaction_rollup(NEW.user_id, NEW.date, NEW.transaction_type, NEW.category, NEW.amount, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE TRIGGER rollup_transactions_events
+AFTER INSERT OR DELETE OR UPDATE OF user_id, amount, category, transaction_type, date ON public.transactions
+FOR EACH ROW EXECUTE FUNCTION rollup_transaction_events();
+
+-- Totals per type and category for a date range. Whole months come from the
+-- rollups; only the partial first and last months scan transactions.
+CREATE OR REPLACE FUNCTION get_transaction_summary(p_user_id UUID, p_start DATE, p_end DATE)
+RETURNS TABLE (transaction_type TEXT, category TEXT, total_cents BIGINT, transaction_count BIGINT) AS $$
+    WITH bounds AS (
+        SELECT
+            CASE WHEN p_start = date_trunc('month', p_start)::date THEN p_start
+                 ELSE (date_trunc('month', p_start) + INTERVAL '1 month')::date END AS full_start,
+            CASE WHEN p_end + 1 = date_trunc('month', p_end + 1)::date THEN p_end + 1
+                 ELSE date_trunc('month', p_end)::date END AS full_end
+    ),
+    totals AS (
+        SELECT r.transaction_type, r.category, r.total_cents, r.transaction_count::bigint
+        FROM public.transaction_monthly_rollups r, bounds b
+        WHERE r.user_id = p_user_id AND r.month >= b.full_start AND r.month < b.full_end
+        UNION ALL
+        SELECT COALESCE(t.transaction_type, ''), COALESCE(t.category, ''), ROUND(SUM(t.amount) * 100)::bigint, COUNT(*)
+        FROM public.transactions t, bounds b
+        WHERE t.user_id = p_user_id AND t.date BETWEEN p_start AND p_end
+          AND NOT (t.date >= b.full_start AND t.date < b.full_end)
+        GROUP BY 1, 2
+    )
+    SELECT transaction_type, category, SUM(total_cents)::bigint, SUM(transaction_count)::bigint
+    FROM totals
+    GROUP BY 1, 2
+    HAVING SUM(transaction_count) > 0;
+$$ LANGUAGE sql STABLE SET search_path = public;
+
+-- One-off backfill for transactions written before the trigger existed
+CREATE OR REPLACE FUNCTION rebuild_transaction_rollups()
+RETURNS VOID AS $$
+    DELETE FROM public.transaction_monthly_rollups;
+
+    INSERT INTO public.transaction_monthly_rollups (user_id, month, transaction_type, category, total_cents, transaction_count)
+    SELECT user_id, date_trunc('month', date)::date, COALESCE(transaction_type, ''), COALESCE(category, ''),
+           ROUND(SUM(amount) * 100)::bigint, COUNT(*)
+    FROM public.transactions
+    WHERE user_id IS NOT NULL
+    GROUP BY 1, 2, 3, 4;
+$$ LANGUAGE sql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION rebuild_transaction_rollups() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION rebuild_transaction_rollups() TO service_role;
+
+-- Latest health score per user
+-- Inserts replace the latest row when they are at least as new; deleting the
+-- latest row (history compaction) promotes the newest remaining one.
+CREATE OR REPLACE FUNCTION track_latest_health_score()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        IF NEW.user_id IS NOT NULL THEN
+            INSERT INTO public.financial_health_latest_scores AS latest (
+                user_id, score_id, overall_score, savings_rate_score, debt_ratio_score,
+                emergency_fund_score, investment_score, created_at
+            )
+            VALUES (
+                NEW.user_id, NEW.id, NEW.overall_score, NEW.savings_rate_score, NEW.debt_ratio_score,
+                NEW.emergency_fund_score, NEW.investment_score, NEW.created_at
+            )
+            ON CONFLICT (user_id) DO UPDATE SET
+                score_id = EXCLUDED.score_id,
+                overall_score = EXCLUDED.overall_score,
+                savings_rate_score = EXCLUDED.savings_rate_score,
+                debt_ratio_score = EXCLUDED.debt_ratio_score,
+                emergency_fund_score = EXCLUDED.emergency_fund_score,
+                investment_score = EXCLUDED.investment_score,
+                created_at = EXCLUDED.created_at
+            WHERE EXCLUDED.created_at >= latest.created_at;
+        END IF;
+    ELSIF EXISTS (
+        SELECT 1 FROM public.financial_health_latest_scores WHERE user_id = OLD.user_id AND score_id = OLD.id
+    ) THEN
+        DELETE FROM public.financial_health_latest_scores WHERE user_id = OLD.user_id;
+        INSERT INTO public.financial_health_latest_scores (
+            user_id, score_id, overall_score, savings_rate_score, debt_ratio_score,
+            emergency_fund_score, investment_score, created_at
+        )
+        SELECT user_id, id, overall_score, savings_rate_score, debt_ratio_score,
+               emergency_fund_score, investment_score, created_at
+        FROM public.financial_health_scores
+        WHERE user_id = OLD.user_id
+        ORDER BY created_at DESC, id DESC
+        LIMIT 1;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE TRIGGER track_latest_health_score
+AFTER INSERT OR DELETE ON public.financial_health_scores
+FOR EACH ROW EXECUTE FUNCTION track_latest_health_score();
+
+-- One-off backfill for scores written before the trigger existed
+CREATE OR REPLACE FUNCTION rebuild_latest_health_scores()
+RETURNS VOID AS $$
+    DELETE FROM public.financial_health_latest_scores;
+
+    INSERT INTO public.financial_health_latest_scores (
+        user_id, score_id, overall_score, savings_rate_score, debt_ratio_score,
+        emergency_fund_score, investment_score, created_at
+    )
+    SELECT DISTINCT ON (user_id)
+        user_id, id, overall_score, savings_rate_score, debt_ratio_score,
+        emergency_fund_score, investment_score, created_at
+    FROM public.financial_health_scores
+    WHERE user_id IS NOT NULL
+    ORDER BY user_id, created_at DESC, id DESC;
+$$ LANGUAGE sql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION rebuild_latest_health_scores() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION rebuild_latest_health_scores() TO service_role;
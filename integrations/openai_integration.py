@@ -4,6 +4,7 @@ OpenAI integration for BusinessThis
 import openai
 import os
 from typing import Dict, Any, Optional
+from core.transaction_frame import TransactionFrame
 
 class OpenAIIntegration:
     """OpenAI API integration"""
@@ -49,6 +50,8 @@ class OpenAIIntegration:
     
     def _format_transactions(self, transactions: list) -> str:
         """Format transactions for AI analysis"""
+        if isinstance(transactions, TransactionFrame):
+            transactions = transactions.latest(10).to_records(newest_first=True)
         formatted = []
         for tx in transactions[:10]:  # Limit to recent 10 transactions
             formatted.append(f"{tx.get('category', 'Unknown')}: ${tx.get('amount', 0)}")
@@ -5,8 +5,10 @@ Provides AI capabilities using Vercel's LLM API
 import os
 import requests
 import json
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 import logging
+from core.transaction_frame import TransactionFrame
+from core.utils.money import from_cents
 
 class VercelLLMIntegration:
     """Vercel LLM API integration for financial AI services"""
@@ -75,7 +77,7 @@ class VercelLLMIntegration:
         
         return self._make_api_call(messages, max_tokens=500, temperature=0.7)
     
-    def analyze_spending_patterns(self, transactions: List[Dict[str, Any]]) -> Optional[str]:
+    def analyze_spending_patterns(self, transactions: Union[List[Dict[str, Any]], TransactionFrame]) -> Optional[str]:
         """Analyze spending patterns using Vercel LLM"""
         system_prompt = """You are a financial analyst specializing in spending pattern analysis. 
         Analyze the provided transactions and provide actionable insights about spending habits, 
@@ -130,12 +132,22 @@ class VercelLLMIntegration:
         
         return self._make_api_call(messages, max_tokens=700, temperature=0.6)
     
-    def _format_transactions(self, transactions: List[Dict[str, Any]]) -> str:
+    def _format_transactions(self, transactions: Union[List[Dict[str, Any]], TransactionFrame]) -> str:
         """Format transactions for AI analysis"""
         if not transactions:
             return "No recent transactions available"
         
         formatted = []
+        if isinstance(transactions, TransactionFrame):
+            # Spending totals cover the whole frame, not just the listed transactions
+            spending = transactions.of_type('expense').sum_by_category('Uncategorized')
+            if spending:
+                formatted.append("Spending by category: " + ", ".join(
+                    f"{category} ${from_cents(cents):,.2f}"
+                    for category, cents in sorted(spending.items(), key=lambda item: -item[1])
+                ))
+            transactions = transactions.latest(15).to_records(newest_first=True)
+        
         for tx in transactions[:15]:  # Limit to recent 15 transactions
             amount = tx.get('amount', 0)
             category = tx.get('category', 'Unknown')
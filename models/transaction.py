@@ -5,6 +5,7 @@ from datetime import datetime, date
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
 from decimal import Decimal
+from core.utils.money import to_cents
 
 @dataclass
 class Transaction:
@@ -69,6 +70,11 @@ class Transaction:
         """Check if transaction is transfer"""
         return self.transaction_type == 'transfer'
     
+    @property
+    def amount_cents(self) -> int:
+        """Amount as exact integer cents for calculations"""
+        return to_cents(self.amount)
+    
     def get_absolute_amount(self) -> Decimal:
         """Get absolute amount (positive for income, negative for expense)"""
         if self.is_income():
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Offline throughput/latency benchmark for the BusinessThis Flask backend
+Runs the app against the local SQLite Supabase stand-in seeded with
+realistic row counts, so no live Supabase project is needed.
+
+Usage:
+    python scripts/benchmark_backend.py --users 2000 --transactions 50 --requests 2000 --concurrency 8
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+# The app validates these at import time; the local stand-in ignores them
+os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+os.environ.setdefault('SUPABASE_URL', 'http://localhost')
+os.environ.setdefault('SUPABASE_ANON_KEY', 'benchmark-anon-key')
+os.environ.setdefault('SUPABASE_SERVICE_KEY', 'benchmark-service-key')
+os.environ.setdefault('SUPABASE_LOCAL_DB', ':memory:')
+
+import jwt
+
+CATEGORIES = ['food', 'transportation', 'housing', 'utilities', 'entertainment',
+              'healthcare', 'shopping', 'education', 'travel', 'insurance']
+
+def seed_database(client, users: int, goals_per_user: int, transactions_per_user: int, seed: int):
+    """Seed users, profiles, goals, transactions and AI usage"""
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    today = date.today()
+
+    user_rows = [{
+        'email': f'user{i}@example.com',
+        'full_name': f'Benchmark User {i}',
+        'subscription_tier': rng.choice(['free', 'free', 'free', 'premium', 'pro']),
+        'created_at': (datetime.utcnow() - timedelta(days=rng.randint(0, 720))).isoformat(),
+        'last_login': (datetime.utcnow() - timedelta(days=rng.randint(0, 60))).isoformat()
+    } for i in range(users)]
+    user_ids = [row['id'] for row in client.table('users').insert(user_rows).execute().data]
+
+    client.table('financial_profiles').insert([{
+        'user_id': user_id,
+        'monthly_income': rng.randint(3000, 12000),
+        'fixed_expenses': rng.randint(1000, 4000),
+        'variable_expenses': rng.randint(300, 2000),
+        'emergency_fund_target': rng.randint(5000, 30000),
+        'emergency_fund_current': rng.randint(0, 20000),
+        'total_debt': rng.randint(0, 60000),
+        'age': rng.randint(22, 64)
+    } for user_id in user_ids]).execute()
+
+    client.table('savings_goals').insert([{
+        'user_id': user_id,
+        'name': f'Goal {n}',
+        'target_amount': rng.randint(1000, 50000),
+        'current_amount': rng.randint(0, 5000),
+        'monthly_contribution': rng.randint(50, 1000),
+        'priority': n + 1
+    } for user_id in user_ids for n in range(goals_per_user)]).execute()
+
+    client.table('transactions').insert([{
+        'user_id': user_id,
+        'amount': round(rng.uniform(5, 500), 2),
+        'category': rng.choice(CATEGORIES),
+        'transaction_type': 'expense' if rng.random() < 0.85 else 'income',
+        'date': (today - timedelta(days=rng.randint(0, 365))).isoformat()
+    } for user_id in user_ids for _ in range(transactions_per_user)]).execute()
+
+    client.table('ai_usage').insert([{
+        'user_id': rng.choice(user_ids),
+        'request_type': rng.choice(['coaching', 'daily_tip', 'goal_analysis', 'spending'])
+    } for _ in range(users * 2)]).execute()
+
+    print(f"Seeded {users} users in {time.perf_counter() - start:.2f}s")
+    return user_ids
+
+def run_benchmark(app, user_ids, endpoints, requests: int, concurrency: int, seed: int):
+    """Issue requests with the Flask test client and collect latencies per endpoint"""
+    rng = random.Random(seed)
+    secret_key = os.environ['SECRET_KEY']
+    plan = []
+    for _ in range(requests):
+        method, path, body = rng.choice(endpoints)
+        token = jwt.encode({'user_id': rng.choice(user_ids), 'exp': datetime.utcnow() + timedelta(hours=1)},
+                           secret_key, algorithm='HS256')
+        plan.append((method, path, body, token))
+
+    def issue(item):
+        method, path, body, token = item
+        client = app.test_client()
+        started = time.perf_counter()
+        response = client.open(path, method=method, json=body, headers={'Authorization': f'Bearer {token}'})
+        return path, response.status_code, (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(issue, plan))
+    elapsed = time.perf_counter() - started
+
+    print(f"\n{requests} requests, concurrency {concurrency}: {requests / elapsed:,.1f} req/s")
+    print(f"{'endpoint':45} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for _, path, _ in endpoints:
+        latencies = sorted(latency for result_path, _, latency in results if result_path == path)
+        errors = sum(1 for result_path, status, _ in results if result_path == path and status >= 500)
+        if not latencies:
+            continue
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"{path:45} {len(latencies):>6} {statistics.median(latencies):>9.2f} {p95:>9.2f} {p99:>9.2f} {errors:>7}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Flask backend against a local SQLite Supabase stand-in')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--goals', type=int, default=3, help='Savings goals per user')
+    parser.add_argument('--transactions', type=int, default=50, help='Transactions per user')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--latency-ms', type=float, default=0,
+                        help='Simulated PostgREST round-trip latency added to every query')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    os.environ['SUPABASE_LOCAL_LATENCY_MS'] = str(args.latency_ms)
+
+    from config.local_supabase import get_local_supabase_client
+    from backend.app import app
+
+    client = get_local_supabase_client()
+    user_ids = seed_database(client, args.users, args.goals, args.transactions, args.seed)
+
+    endpoints = [
+        ('GET', '/api/financial-profile', None),
+        ('GET', '/api/savings-goals', None),
+        ('POST', '/api/calculator/safe-spend', {}),
+        ('GET', '/api/calculator/financial-health', None),
+    ]
+    queries_before = client.query_count
+    run_benchmark(app, user_ids, endpoints, args.requests, args.concurrency, args.seed)
+    print(f"\nDatabase round trips: {client.query_count - queries_before} "
+          f"({(client.query_count - queries_before) / args.requests:.2f} per request)")
+
+if __name__ == "__main__":
+    main()
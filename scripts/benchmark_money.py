@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark Decimal vs integer-cents money handling for BusinessThis
+Hydrates and aggregates transaction amounts by category the way the models
+do today (Decimal(str(...))) and with core.utils.money, and checks that all
+paths produce identical totals.
+
+Usage:
+    python scripts/benchmark_money.py --rows 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from core.utils.money import to_cents, cents_array, cents_to_decimal
+
+CATEGORIES = ['food', 'transportation', 'housing', 'utilities', 'entertainment',
+              'healthcare', 'shopping', 'education', 'travel', 'insurance']
+
+def make_rows(count: int, seed: int):
+    """Transaction rows shaped like PostgREST results (numeric amounts as JSON numbers)"""
+    rng = random.Random(seed)
+    return [{'amount': rng.randint(1, 5000000) / 100, 'category': rng.choice(CATEGORIES)} for _ in range(count)]
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+def decimal_path(rows):
+    amounts, hydrate = timed(lambda: [Decimal(str(row['amount'])) for row in rows])
+
+    def aggregate():
+        totals = {}
+        for row, amount in zip(rows, amounts):
+            totals[row['category']] = totals.get(row['category'], Decimal('0')) + amount
+        return totals
+    totals, aggregate_time = timed(aggregate)
+    return totals, hydrate, aggregate_time
+
+def cents_path(rows):
+    amounts, hydrate = timed(lambda: [to_cents(row['amount']) for row in rows])
+
+    def aggregate():
+        totals = {}
+        for row, cents in zip(rows, amounts):
+            totals[row['category']] = totals.get(row['category'], 0) + cents
+        return totals
+    totals, aggregate_time = timed(aggregate)
+    return {category: cents_to_decimal(cents) for category, cents in totals.items()}, hydrate, aggregate_time
+
+def numpy_cents_path(rows):
+    codes = {category: index for index, category in enumerate(CATEGORIES)}
+
+    def hydrate():
+        return (cents_array([row['amount'] for row in rows]),
+                np.fromiter((codes[row['category']] for row in rows), dtype=np.int64, count=len(rows)))
+    (amounts, category_codes), hydrate_time = timed(hydrate)
+
+    def aggregate():
+        # int64 sums are exact; weights would go through float64
+        totals = np.zeros(len(CATEGORIES), dtype=np.int64)
+        np.add.at(totals, category_codes, amounts)
+        return totals
+    totals, aggregate_time = timed(aggregate)
+    return {CATEGORIES[i]: cents_to_decimal(int(cents)) for i, cents in enumerate(totals)}, hydrate_time, aggregate_time
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Decimal vs integer-cents amount handling')
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rows, build_time = timed(lambda: make_rows(args.rows, args.seed))
+    print(f"Built {args.rows:,} rows in {build_time:.2f}s\n")
+
+    print(f"{'path':20} {'hydrate s':>10} {'aggregate s':>12} {'total s':>9} {'speedup':>8}")
+    baseline = None
+    reference = None
+    for name, path in (('decimal', decimal_path), ('cents', cents_path), ('cents (numpy)', numpy_cents_path)):
+        totals, hydrate, aggregate = path(rows)
+        total = hydrate + aggregate
+        baseline = baseline or total
+        if reference is None:
+            reference = totals
+        elif {k: v for k, v in totals.items() if v} != reference:
+            raise SystemExit(f"{name} totals differ from the Decimal totals")
+        print(f"{name:20} {hydrate:>10.3f} {aggregate:>12.3f} {total:>9.3f} {baseline / total:>7.1f}x")
+
+    print("\nAll paths produced identical category totals.")
+
+if __name__ == "__main__":
+    main()
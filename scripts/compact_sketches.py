@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Nightly analytics sketch compaction for BusinessThis
+Merges the per-process shards of closed day and month windows into one row
+each, so readers merge a bounded number of rows however often processes
+restart, and rebuilds the spending category windows of the current and
+previous month from transactions.
+
+Usage:
+    python scripts/compact_sketches.py [--backfill-ai-usage] [--backfill-spending-categories]
+"""
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from services.analytics_sketch_service import AnalyticsSketchService
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge analytics sketch shards of closed windows')
+    parser.add_argument('--backfill-ai-usage', action='store_true',
+                        help='First rebuild the AI user and feature sketches from ai_usage (one-off)')
+    parser.add_argument('--backfill-spending-categories', action='store_true',
+                        help='Rebuild the spending category sketches from all transactions, not just recent months')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    service = AnalyticsSketchService()
+    stats = {}
+    if args.backfill_ai_usage:
+        stats['backfill_ai_usage'] = service.backfill_ai_usage()
+    since = None
+    if not args.backfill_spending_categories:
+        since = (datetime.utcnow().date().replace(day=1) - timedelta(days=1)).replace(day=1)
+    stats['spending_categories'] = service.refresh_spending_categories(since)
+    stats['compaction'] = service.compact_shards()
+    print(json.dumps(stats, indent=2))
+
+    return 1 if any('error' in result for result in stats.values()) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Nightly financial health score recomputation for BusinessThis
+Streams every financial profile in chunks, scores each chunk at once and
+bulk-inserts scores only for users whose score changed, then down-samples
+old score history and reports throughput.
+
+Usage:
+    python scripts/recompute_health_scores.py --chunk-size 1000 [--skip-compaction] [--rebuild-latest]
+"""
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from services.health_score_service import (
+    HealthScoreService, HEALTH_SCORE_CHUNK_SIZE, HISTORY_WEEKLY_AFTER_DAYS, HISTORY_MONTHLY_AFTER_DAYS
+)
+
+def main():
+    parser = argparse.ArgumentParser(description='Recompute financial health scores for all profiles')
+    parser.add_argument('--chunk-size', type=int, default=HEALTH_SCORE_CHUNK_SIZE,
+                        help='Profiles scored and written per batch')
+    parser.add_argument('--weekly-after-days', type=int, default=HISTORY_WEEKLY_AFTER_DAYS,
+                        help='Keep one history point per week beyond this age')
+    parser.add_argument('--monthly-after-days', type=int, default=HISTORY_MONTHLY_AFTER_DAYS,
+                        help='Keep one history point per month beyond this age')
+    parser.add_argument('--skip-compaction', action='store_true', help='Only recompute scores')
+    parser.add_argument('--rebuild-latest', action='store_true',
+                        help='First backfill the latest-score table from the history (one-off)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    service = HealthScoreService()
+    stats = {}
+    if args.rebuild_latest:
+        stats['rebuild_latest'] = service.rebuild_latest_scores()
+    stats['recompute'] = service.recompute_all(args.chunk_size)
+    if not args.skip_compaction:
+        stats['compaction'] = service.compact_history(args.chunk_size, args.weekly_after_days, args.monthly_after_days)
+    print(json.dumps(stats, indent=2))
+
+    failed = any('error' in result or result.get('failed') for result in stats.values())
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
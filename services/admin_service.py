@@ -4,172 +4,311 @@ Handles admin dashboard, metrics, and user management
 """
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
-from config.supabase_config import get_supabase_client, get_supabase_service_client
+from config.supabase_config import get_supabase_client, get_supabase_service_client, run_async
+from services.async_repository import AsyncRepository, fan_out_settled, run_fan_out
+from services.repository import SUPPORT_TICKETS
+from services.analytics_sketch_service import get_sketch_service
+from core.utils.cache import LRUTTLCache
+from core.utils.pagination import (
+    build_page, combine_conditions, decode_cursor, keyset_condition, quote_filter_value
+)
+import os
+import asyncio
 import logging
 
+logger = logging.getLogger(__name__)
+
+# Counters maintained in daily_metrics by the rollup triggers in schema-fixed.sql.
+# 'health_scores' counts score rows written per day, i.e. score changes: unchanged
+# scores are not re-inserted and compaction deletes are not subtracted.
+ROLLUP_METRICS = ('signups', 'tier_changes', 'cancellations', 'goals_achieved', 'ai_calls', 'health_scores')
+HEALTH_SCORE_BUCKETS = ('excellent', 'good', 'fair', 'poor', 'critical')
+# (lower, upper) overall_score bounds per bucket, matching health_score_bucket() in the schema
+HEALTH_SCORE_BUCKET_BOUNDS = {
+    'excellent': (90, None),
+    'good': (75, 90),
+    'fair': (60, 75),
+    'poor': (40, 60),
+    'critical': (None, 40)
+}
+ROLLUP_PAGE_SIZE = 1000
+
+# Admin user list: projected columns, keyset order and cached total estimates
+USER_LIST_COLUMNS = 'id, email, full_name, subscription_tier, subscription_status, created_at, last_login, is_active'
+USER_LIST_CURSOR_COLUMNS = ('created_at', 'id')
+USER_LIST_MAX_LIMIT = 200
+USER_TOTAL_TTL = float(os.getenv('ADMIN_USER_TOTAL_TTL', '300'))
+user_total_cache = LRUTTLCache('admin_user_totals', max_entries=1000, ttl_seconds=USER_TOTAL_TTL)
+
 class AdminService:
     """Admin service for dashboard and user management"""
     
     def __init__(self):
         self.supabase = get_supabase_client()
         self.supabase_service = get_supabase_service_client()
+        self.repository = AsyncRepository()
+        self._dashboard_rpc_available = True
     
     def get_dashboard_metrics(self) -> Dict[str, Any]:
         """Get comprehensive dashboard metrics"""
         try:
-            # Get user metrics
-            user_metrics = self._get_user_metrics()
-            
-            # Get subscription metrics
-            subscription_metrics = self._get_subscription_metrics()
+            now = datetime.utcnow()
+            params = {
+                'month_start': now.replace(day=1, hour=0, minute=0, second=0, microsecond=0).isoformat(),
+                'active_since': (now - timedelta(days=30)).isoformat(),
+                'churn_since': (now - timedelta(days=30)).isoformat()
+            }
             
-            # Get financial metrics
-            financial_metrics = self._get_financial_metrics()
+            raw_metrics = self._get_raw_metrics_from_rpc(params)
+            if raw_metrics is None:
+                raw_metrics = run_async(self._get_raw_metrics(params))
             
-            # Get AI usage metrics
-            ai_metrics = self._get_ai_usage_metrics()
-            
-            return {
-                'users': user_metrics,
-                'subscriptions': subscription_metrics,
-                'financial': financial_metrics,
-                'ai_usage': ai_metrics,
-                'timestamp': datetime.utcnow().isoformat()
-            }
+            return self._build_dashboard_metrics(raw_metrics)
             
         except Exception as e:
             return {'error': f'Error getting dashboard metrics: {str(e)}'}
     
-    def _get_user_metrics(self) -> Dict[str, Any]:
-        """Get user-related metrics"""
+    def _get_raw_metrics_from_rpc(self, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Get every dashboard count from get_admin_dashboard_metrics() in one round trip
+        
+        Returns None when the function is unavailable so the caller can fall
+        back to individual queries.
+        """
+        if not self._dashboard_rpc_available:
+            return None
         try:
-            # Total users
-            total_users_result = self.supabase.table('users').select('id', count='exact').execute()
-            total_users = total_users_result.count if total_users_result.count else 0
-            
-            # New users this month
-            month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            new_users_result = self.supabase.table('users').select('id', count='exact').gte('created_at', month_start.isoformat()).execute()
-            new_users_this_month = new_users_result.count if new_users_result.count else 0
-            
-            # Active users (logged in within last 30 days)
-            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-            active_users_result = self.supabase.table('users').select('id', count='exact').gte('last_login', thirty_days_ago.isoformat()).execute()
-            active_users = active_users_result.count if active_users_result.count else 0
-            
-            # Users by subscription tier
-            free_users_result = self.supabase.table('users').select('id', count='exact').eq('subscription_tier', 'free').execute()
-            premium_users_result = self.supabase.table('users').select('id', count='exact').eq('subscription_tier', 'premium').execute()
-            pro_users_result = self.supabase.table('users').select('id', count='exact').eq('subscription_tier', 'pro').execute()
-            
-            return {
-                'total_users': total_users,
-                'new_users_this_month': new_users_this_month,
-                'active_users': active_users,
-                'free_users': free_users_result.count if free_users_result.count else 0,
-                'premium_users': premium_users_result.count if premium_users_result.count else 0,
-                'pro_users': pro_users_result.count if pro_users_result.count else 0,
-                'user_growth_rate': self._calculate_growth_rate(new_users_this_month, total_users)
-            }
-            
+            result = self.supabase_service.rpc('get_admin_dashboard_metrics', params).execute()
+            return result.data or None
         except Exception as e:
-            return {'error': f'Error getting user metrics: {str(e)}'}
+            if 'does not exist' in str(e) or 'PGRST202' in str(e):
+                # Schema predates the function; stop paying a round trip for it
+                self._dashboard_rpc_available = False
+            logger.warning(f"Dashboard metrics RPC unavailable, using individual queries: {e}")
+            return None
+    
+    async def _get_raw_metrics(self, params: Dict[str, str]) -> Dict[str, Any]:
+        """Get every dashboard count with one concurrent query per distinct metric
+        
+        A failed query is returned as its exception so only the sections that
+        depend on it report an error. The average health score needs the
+        latest score of every user, which only the RPC computes; it is None
+        here rather than averaged from a truncated download.
+        """
+        results = await fan_out_settled(
+            total_users=self.repository.count('users'),
+            new_users_this_month=self.repository.count('users', lambda q: q.gte('created_at', params['month_start'])),
+            active_users=self.repository.count('users', lambda q: q.gte('last_login', params['active_since'])),
+            free_users=self.repository.count('users', lambda q: q.eq('subscription_tier', 'free')),
+            premium_users=self.repository.count('users', lambda q: q.eq('subscription_tier', 'premium')),
+            pro_users=self.repository.count('users', lambda q: q.eq('subscription_tier', 'pro')),
+            churned_users=self.repository.count(
+                'users',
+                lambda q: q.eq('subscription_status', 'cancelled').gte('updated_at', params['churn_since'])
+            ),
+            users_with_profiles=self.repository.count('financial_profiles'),
+            total_goals=self.repository.count('savings_goals'),
+            achieved_goals=self.repository.count('savings_goals', lambda q: q.eq('is_achieved', True)),
+            total_ai_usage=self.repository.count('ai_usage'),
+            monthly_ai_usage=self.repository.count('ai_usage', lambda q: q.gte('created_at', params['month_start'])),
+            # Distinct AI users come from the HyperLogLog sketches instead of
+            # downloading every ai_usage.user_id
+            unique_ai_users=asyncio.to_thread(get_sketch_service().unique_users_all_time)
+        )
+        
+        results['average_health_score'] = None
+        if not isinstance(results['unique_ai_users'], Exception):
+            results['unique_ai_users'] = results['unique_ai_users'].get('estimate', 0)
+        return results
+    
+    def _build_dashboard_metrics(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape raw counts into the dashboard sections
+        
+        A section whose inputs include a failed query becomes an
+        ``{'error': ...}`` dict; the other sections are still returned.
+        """
+        sections = {
+            'users': self._build_user_metrics,
+            'subscriptions': self._build_subscription_metrics,
+            'financial': self._build_financial_metrics,
+            'ai_usage': self._build_ai_usage_metrics
+        }
+        metrics = {}
+        for name, build in sections.items():
+            try:
+                metrics[name] = build(raw)
+            except Exception as e:
+                metrics[name] = {'error': f'Error getting {name.replace("_", " ")} metrics: {str(e)}'}
+        metrics['timestamp'] = datetime.utcnow().isoformat()
+        return metrics
+    
+    @staticmethod
+    def _raw_values(raw: Dict[str, Any], *names: str) -> List[Any]:
+        """Raw metric values, raising the first failed query's exception"""
+        values = [raw[name] for name in names]
+        for value in values:
+            if isinstance(value, Exception):
+                raise value
+        return values
+    
+    def _build_user_metrics(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        total_users, new_users, active_users, free_users, premium_count, pro_count = self._raw_values(
+            raw, 'total_users', 'new_users_this_month', 'active_users', 'free_users', 'premium_users', 'pro_users'
+        )
+        return {
+            'total_users': total_users,
+            'new_users_this_month': new_users,
+            'active_users': active_users,
+            'free_users': free_users,
+            'premium_users': premium_count,
+            'pro_users': pro_count,
+            'user_growth_rate': self._calculate_growth_rate(new_users, total_users)
+        }
+    
+    def _build_subscription_metrics(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        total_users, premium_count, pro_count, churned_users = self._raw_values(
+            raw, 'total_users', 'premium_users', 'pro_users', 'churned_users'
+        )
+        
+        # Monthly Recurring Revenue (MRR)
+        mrr = (premium_count * 9.99) + (pro_count * 19.99)
+        total_paid_users = premium_count + pro_count
+        return {
+            'mrr': mrr,
+            'premium_subscribers': premium_count,
+            'pro_subscribers': pro_count,
+            'total_paid_users': total_paid_users,
+            'churn_rate': (churned_users / total_paid_users * 100) if total_paid_users > 0 else 0,
+            'conversion_rate': (total_paid_users / total_users * 100) if total_users > 0 else 0,
+            'average_revenue_per_user': mrr / total_paid_users if total_paid_users > 0 else 0
+        }
     
-    def _get_subscription_metrics(self) -> Dict[str, Any]:
-        """Get subscription-related metrics"""
+    def _build_financial_metrics(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        users_with_profiles, average_health_score, total_goals, achieved_goals = self._raw_values(
+            raw, 'users_with_profiles', 'average_health_score', 'total_goals', 'achieved_goals'
+        )
+        return {
+            'users_with_profiles': users_with_profiles,
+            # None when only the fallback queries ran
+            'average_health_score': round(float(average_health_score), 1) if average_health_score is not None else None,
+            'total_savings_goals': total_goals,
+            'achieved_goals': achieved_goals,
+            'goal_achievement_rate': (achieved_goals / total_goals * 100) if total_goals > 0 else 0
+        }
+    
+    def _build_ai_usage_metrics(self, raw: Dict[str, Any]) -> Dict[str, Any]:
+        total_ai_usage, monthly_ai_usage, unique_ai_users = self._raw_values(
+            raw, 'total_ai_usage', 'monthly_ai_usage', 'unique_ai_users'
+        )
+        return {
+            'total_ai_usage': total_ai_usage,
+            'monthly_ai_usage': monthly_ai_usage,
+            'unique_ai_users': unique_ai_users,
+            'average_usage_per_user': total_ai_usage / unique_ai_users if unique_ai_users > 0 else 0
+        }
+    
+    def get_daily_metrics(self, days: int = 30, metrics: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get per-day series for time-range charts from the daily_metrics rollups"""
         try:
-            # Monthly Recurring Revenue (MRR)
-            premium_users_result = self.supabase.table('users').select('id', count='exact').eq('subscription_tier', 'premium').execute()
-            pro_users_result = self.supabase.table('users').select('id', count='exact').eq('subscription_tier', 'pro').execute()
-            
-            premium_count = premium_users_result.count if premium_users_result.count else 0
-            pro_count = pro_users_result.count if pro_users_result.count else 0
-            
-            mrr = (premium_count * 9.99) + (pro_count * 19.99)
-            
-            # Churn rate (users who cancelled in last 30 days)
-            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-            churned_users_result = self.supabase.table('users').select('id', count='exact').eq('subscription_status', 'cancelled').gte('updated_at', thirty_days_ago.isoformat()).execute()
-            churned_users = churned_users_result.count if churned_users_result.count else 0
-            
-            # Conversion rate (free to paid)
-            total_paid_users = premium_count + pro_count
-            total_users_result = self.supabase.table('users').select('id', count='exact').execute()
-            total_users = total_users_result.count if total_users_result.count else 0
-            
-            conversion_rate = (total_paid_users / total_users * 100) if total_users > 0 else 0
+            days = max(1, min(days, 366))
+            metrics = [metric for metric in (metrics or ROLLUP_METRICS) if metric in ROLLUP_METRICS]
+            end_date = datetime.utcnow().date()
+            start_date = end_date - timedelta(days=days - 1)
+            
+            dates = [(start_date + timedelta(days=i)).isoformat() for i in range(days)]
+            positions = {day: i for i, day in enumerate(dates)}
+            series = {metric: {'total': [0] * days, 'by_dimension': {}} for metric in metrics}
+            
+            for row in self._get_rollup_rows(metrics, start_date.isoformat(), end_date.isoformat()):
+                position = positions.get(str(row['metric_date'])[:10])
+                if position is None:
+                    continue
+                metric_series = series[row['metric']]
+                dimension = metric_series['by_dimension'].setdefault(row['dimension'] or 'all', [0] * days)
+                dimension[position] += row['value']
+                metric_series['total'][position] += row['value']
             
             return {
-                'mrr': mrr,
-                'premium_subscribers': premium_count,
-                'pro_subscribers': pro_count,
-                'total_paid_users': total_paid_users,
-                'churn_rate': (churned_users / total_paid_users * 100) if total_paid_users > 0 else 0,
-                'conversion_rate': conversion_rate,
-                'average_revenue_per_user': mrr / total_paid_users if total_paid_users > 0 else 0
+                'start_date': start_date.isoformat(),
+                'end_date': end_date.isoformat(),
+                'dates': dates,
+                'series': series
             }
             
         except Exception as e:
-            return {'error': f'Error getting subscription metrics: {str(e)}'}
+            return {'error': f'Error getting daily metrics: {str(e)}'}
     
-    def _get_financial_metrics(self) -> Dict[str, Any]:
-        """Get financial-related metrics"""
+    def get_usage_analytics(self, days: int = 30, k: int = 10) -> Dict[str, Any]:
+        """Get sketch-based AI usage and spending analytics with error bounds"""
         try:
-            # Users with financial profiles
-            profiles_result = self.supabase.table('financial_profiles').select('id', count='exact').execute()
-            users_with_profiles = profiles_result.count if profiles_result.count else 0
-            
-            # Average financial health score
-            health_scores_result = self.supabase.table('financial_health_scores').select('overall_score').execute()
-            if health_scores_result.data:
-                avg_health_score = sum(score['overall_score'] for score in health_scores_result.data) / len(health_scores_result.data)
-            else:
-                avg_health_score = 0
-            
-            # Total savings goals
-            goals_result = self.supabase.table('savings_goals').select('id', count='exact').execute()
-            total_goals = goals_result.count if goals_result.count else 0
-            
-            # Achieved goals
-            achieved_goals_result = self.supabase.table('savings_goals').select('id', count='exact').eq('is_achieved', True).execute()
-            achieved_goals = achieved_goals_result.count if achieved_goals_result.count else 0
+            days = max(1, min(days, 366))
+            sketches = get_sketch_service()
+            end_date = datetime.utcnow().date()
+            start_date = end_date - timedelta(days=days - 1)
             
             return {
-                'users_with_profiles': users_with_profiles,
-                'average_health_score': round(avg_health_score, 1),
-                'total_savings_goals': total_goals,
-                'achieved_goals': achieved_goals,
-                'goal_achievement_rate': (achieved_goals / total_goals * 100) if total_goals > 0 else 0
+                'unique_ai_users': sketches.unique_users(start_date, end_date),
+                'unique_ai_users_this_month': sketches.unique_users(end_date.replace(day=1), end_date),
+                'daily_unique_ai_users': sketches.daily_unique_users(days),
+                'top_ai_features': sketches.top_items('ai_features', start_date, end_date, k),
+                'top_spending_categories': sketches.top_items('spending_categories', start_date, end_date, k)
             }
             
         except Exception as e:
-            return {'error': f'Error getting financial metrics: {str(e)}'}
+            return {'error': f'Error getting usage analytics: {str(e)}'}
     
-    def _get_ai_usage_metrics(self) -> Dict[str, Any]:
-        """Get AI usage metrics"""
+    def get_health_score_distribution(self, days: Optional[int] = None) -> Dict[str, int]:
+        """Get health score counts per bucket
+        
+        By default this counts users by their latest score. With ``days`` it
+        counts the score changes recorded per bucket over that many days.
+        """
         try:
-            # Total AI usage
-            ai_usage_result = self.supabase.table('ai_usage').select('id', count='exact').execute()
-            total_ai_usage = ai_usage_result.count if ai_usage_result.count else 0
-            
-            # AI usage this month
-            month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            monthly_ai_usage_result = self.supabase.table('ai_usage').select('id', count='exact').gte('created_at', month_start.isoformat()).execute()
-            monthly_ai_usage = monthly_ai_usage_result.count if monthly_ai_usage_result.count else 0
-            
-            # Users using AI
-            ai_users_result = self.supabase.table('ai_usage').select('user_id').execute()
-            unique_ai_users = len(set(usage['user_id'] for usage in ai_users_result.data)) if ai_users_result.data else 0
-            
-            return {
-                'total_ai_usage': total_ai_usage,
-                'monthly_ai_usage': monthly_ai_usage,
-                'unique_ai_users': unique_ai_users,
-                'average_usage_per_user': total_ai_usage / unique_ai_users if unique_ai_users > 0 else 0
-            }
+            if not days:
+                return run_fan_out(**{
+                    bucket: self.repository.count(
+                        'financial_health_latest_scores',
+                        lambda q, bounds=HEALTH_SCORE_BUCKET_BOUNDS[bucket]: self._score_range(q, *bounds),
+                        column='user_id'
+                    )
+                    for bucket in HEALTH_SCORE_BUCKETS
+                })
+            
+            start_date = (datetime.utcnow().date() - timedelta(days=days - 1)).isoformat()
+            distribution = {bucket: 0 for bucket in HEALTH_SCORE_BUCKETS}
+            for row in self._get_rollup_rows(['health_scores'], start_date):
+                if row['dimension'] in distribution:
+                    distribution[row['dimension']] += row['value']
+            return distribution
             
         except Exception as e:
-            return {'error': f'Error getting AI usage metrics: {str(e)}'}
+            return {'error': f'Error getting health score distribution: {str(e)}'}
+    
+    @staticmethod
+    def _score_range(query, lower: Optional[int], upper: Optional[int]):
+        """Narrow a query to lower <= overall_score < upper"""
+        if lower is not None:
+            query = query.gte('overall_score', lower)
+        if upper is not None:
+            query = query.lt('overall_score', upper)
+        return query
+    
+    def _get_rollup_rows(self, metrics: List[str], start_date: Optional[str] = None,
+                         end_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Read daily_metrics rows page by page (PostgREST caps rows per response)"""
+        rows = []
+        offset = 0
+        while True:
+            query = self.supabase_service.table('daily_metrics').select('metric_date, metric, dimension, value').in_('metric', metrics)
+            if start_date:
+                query = query.gte('metric_date', start_date)
+            if end_date:
+                query = query.lte('metric_date', end_date)
+            result = query.order('metric_date').order('metric').order('dimension').range(offset, offset + ROLLUP_PAGE_SIZE - 1).execute()
+            page = result.data or []
+            rows.extend(page)
+            if len(page) < ROLLUP_PAGE_SIZE:
+                return rows
+            offset += ROLLUP_PAGE_SIZE
     
     def _calculate_growth_rate(self, new_users: int, total_users: int) -> float:
         """Calculate user growth rate"""
@@ -177,68 +316,90 @@ class AdminService:
             return 100.0
         return (new_users / (total_users - new_users)) * 100 if (total_users - new_users) > 0 else 0
     
-    def get_user_list(self, page: int = 1, limit: int = 50, search: str = '') -> Dict[str, Any]:
-        """Get paginated list of users"""
+    def get_user_list(self, limit: int = 50, search: str = '', cursor: Optional[str] = None,
+                      subscription_tier: Optional[str] = None, is_active: Optional[bool] = None) -> Dict[str, Any]:
+        """Get a page of users, newest first, using keyset pagination on (created_at, id)
+        
+        Pass the previous response's ``next_cursor`` to fetch the following
+        page. Totals are planner estimates cached for USER_TOTAL_TTL seconds.
+        """
         try:
-            offset = (page - 1) * limit
-            
-            query = self.supabase.table('users').select('*')
+            limit = max(1, min(limit, USER_LIST_MAX_LIMIT))
             
+            conditions = []
             if search:
-                query = query.or_(f'email.ilike.%{search}%,full_name.ilike.%{search}%')
-            
-            result = query.range(offset, offset + limit - 1).execute()
-            
-            # Get total count
-            count_result = self.supabase.table('users').select('id', count='exact').execute()
-            total_count = count_result.count if count_result.count else 0
+                pattern = quote_filter_value(f'%{search}%')
+                conditions.append(f'or(email.ilike.{pattern},full_name.ilike.{pattern})')
+            if cursor:
+                try:
+                    values = decode_cursor(cursor, len(USER_LIST_CURSOR_COLUMNS))
+                except ValueError as e:
+                    return {'error': str(e)}
+                conditions.append(keyset_condition(USER_LIST_CURSOR_COLUMNS, values, descending=True))
+            
+            query = self.supabase.table('users').select(USER_LIST_COLUMNS)
+            if subscription_tier:
+                query = query.eq('subscription_tier', subscription_tier)
+            if is_active is not None:
+                query = query.eq('is_active', is_active)
+            combined = combine_conditions(*conditions)
+            if combined:
+                query = query.or_(combined)
+            
+            # Fetch one extra row to know whether another page exists
+            result = query.order('created_at', desc=True).order('id', desc=True).limit(limit + 1).execute()
+            page = build_page(result.data or [], limit, USER_LIST_CURSOR_COLUMNS)
             
             return {
-                'users': result.data,
+                'users': page['rows'],
                 'pagination': {
-                    'page': page,
                     'limit': limit,
-                    'total': total_count,
-                    'pages': (total_count + limit - 1) // limit
+                    'next_cursor': page['next_cursor'],
+                    'has_more': page['has_more'],
+                    'estimated_total': self._get_estimated_user_total(search, subscription_tier, is_active),
+                    'total_is_estimate': True
                 }
             }
             
         except Exception as e:
             return {'error': f'Error getting user list: {str(e)}'}
     
+    def _get_estimated_user_total(self, search: str, subscription_tier: Optional[str],
+                                  is_active: Optional[bool]) -> int:
+        """Get the planner's row estimate for a user list filter, refreshed every USER_TOTAL_TTL seconds"""
+        cache_key = (search, subscription_tier, is_active)
+        found, total = user_total_cache.get(cache_key)
+        if found:
+            return total
+        
+        query = self.supabase.table('users').select('id', count='estimated')
+        if subscription_tier:
+            query = query.eq('subscription_tier', subscription_tier)
+        if is_active is not None:
+            query = query.eq('is_active', is_active)
+        if search:
+            pattern = quote_filter_value(f'%{search}%')
+            query = query.or_(f'email.ilike.{pattern},full_name.ilike.{pattern}')
+        
+        result = query.limit(1).execute()
+        total = result.count if result.count else 0
+        user_total_cache.set(cache_key, total)
+        return total
+    
     def get_user_details(self, user_id: str) -> Dict[str, Any]:
         """Get detailed user information"""
         try:
-            # Get user data
-            user_result = self.supabase.table('users').select('*').eq('id', user_id).execute()
-            if not user_result.data:
+            details = run_fan_out(
+                user=self.repository.get_user(user_id),
+                profile=self.repository.get_financial_profile(user_id),
+                goals=self.repository.get_savings_goals(user_id),
+                subscription=self.repository.get_subscription(user_id),
+                ai_usage=self.repository.get_ai_usage(user_id, limit=10)
+            )
+            if not details['user']:
                 return {'error': 'User not found'}
             
-            user = user_result.data[0]
-            
-            # Get financial profile
-            profile_result = self.supabase.table('financial_profiles').select('*').eq('user_id', user_id).execute()
-            profile = profile_result.data[0] if profile_result.data else None
-            
-            # Get savings goals
-            goals_result = self.supabase.table('savings_goals').select('*').eq('user_id', user_id).execute()
-            goals = goals_result.data if goals_result.data else []
-            
-            # Get subscription details
-            subscription_result = self.supabase.table('subscriptions').select('*').eq('user_id', user_id).execute()
-            subscription = subscription_result.data[0] if subscription_result.data else None
-            
-            # Get AI usage
-            ai_usage_result = self.supabase.table('ai_usage').select('*').eq('user_id', user_id).order('created_at', desc=True).limit(10).execute()
-            ai_usage = ai_usage_result.data if ai_usage_result.data else []
-            
-            return {
-                'user': user,
-                'profile': profile,
-                'goals': goals,
-                'subscription': subscription,
-                'ai_usage': ai_usage
-            }
+            return details
             
         except Exception as e:
             return {'error': f'Error getting user details: {str(e)}'}
@@ -262,14 +423,8 @@ class AdminService:
     def get_support_tickets(self, status: str = 'all') -> Dict[str, Any]:
         """Get support tickets"""
         try:
-            query = self.supabase.table('support_tickets').select('*')
-            
-            if status != 'all':
-                query = query.eq('status', status)
-            
-            result = query.order('created_at', desc=True).execute()
-            
-            return {'tickets': result.data}
+            build = None if status == 'all' else (lambda q: q.eq('status', status))
+            return {'tickets': run_async(self.repository.read(SUPPORT_TICKETS, build))}
             
         except Exception as e:
             return {'error': f'Error getting support tickets: {str(e)}'}
@@ -9,11 +9,13 @@ import json
 import csv
 import io
 import logging
+from services.financial_service import FinancialService, GOAL_PROJECTION_BATCH_MAX, GOAL_PROJECTION_MAX_GOALS
 
 class AdvisorService:
     """Advisor service for financial advisors and client management"""
     
     def __init__(self):
+        self.financial_service = FinancialService()
         self.advisor_plans = {
             'basic': {
                 'name': 'Basic Advisor',
@@ -181,8 +183,13 @@ class AdvisorService:
         except Exception as e:
             return {'error': f'Error updating client info: {str(e)}'}
     
-    def bulk_import_clients(self, advisor_id: str, csv_data: str) -> Dict[str, Any]:
-        """Bulk import clients from CSV data"""
+    def bulk_import_clients(self, advisor_id: str, csv_data: str,
+                            writer: Optional[Any] = None, table: str = 'advisor_clients') -> Dict[str, Any]:
+        """Bulk import clients from CSV data
+        
+        When a BulkWriteService is passed as ``writer`` the parsed clients are
+        persisted to ``table`` in chunked multi-row inserts.
+        """
         try:
             # Parse CSV data
             csv_reader = csv.DictReader(io.StringIO(csv_data))
@@ -215,6 +222,12 @@ class AdvisorService:
                 except Exception as e:
                     errors.append(f"Row {i+1}: {str(e)}")
             
+            if writer is not None and imported_clients:
+                write_result = writer.insert(table, imported_clients)
+                for failure in write_result['failed']:
+                    errors.append(f"Client {failure['row'].get('email')}: {failure['error']}")
+                imported_clients = [row for row in write_result['rows'] if row]
+            
             return {
                 'success': True,
                 'imported_clients': imported_clients,
@@ -343,6 +356,39 @@ class AdvisorService:
             ]
         }
     
+    def project_client_goals(self, advisor_id: str, clients: List[Dict[str, Any]],
+                             annual_rate: float = 0.0) -> Dict[str, Any]:
+        """Project goal completion dates for many clients in one batch
+        
+        Each client is ``{'client_id', 'monthly_surplus', 'goals': [...]}``.
+        """
+        try:
+            if not clients:
+                return {'error': 'No clients provided'}
+            if len(clients) > GOAL_PROJECTION_BATCH_MAX:
+                return {'error': f'At most {GOAL_PROJECTION_BATCH_MAX} clients per request'}
+            for client in clients:
+                goals = client.get('goals') or []
+                if isinstance(goals, list) and len(goals) > GOAL_PROJECTION_MAX_GOALS:
+                    return {'error': f"Client {client.get('client_id')}: at most {GOAL_PROJECTION_MAX_GOALS} goals per client"}
+            
+            projections = self.financial_service.project_goal_sets(clients, annual_rate)
+            results = [
+                {'client_id': client.get('client_id'), **projection}
+                for client, projection in zip(clients, projections)
+            ]
+            return {
+                'clients': results,
+                'total_count': len(results),
+                'off_track_count': sum(
+                    1 for result in results
+                    if not result['all_reachable'] or any(goal['on_track'] is False for goal in result['goals'])
+                )
+            }
+            
+        except Exception as e:
+            return {'error': f'Error projecting client goals: {str(e)}'}
+    
     def get_advisor_dashboard(self, advisor_id: str) -> Dict[str, Any]:
         """Get advisor dashboard data"""
         try:
@@ -3,8 +3,9 @@ AI Service for BusinessThis
 Handles all AI-related functionality using Vercel LLM
 """
 import os
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
 from integrations.vercel_llm_integration import VercelLLMIntegration
+from core.transaction_frame import TransactionFrame
 import logging
 
 class AIService:
@@ -43,7 +44,8 @@ class AIService:
                 'fallback_advice': self._get_fallback_advice(profile, question)
             }
     
-    def get_spending_recommendations(self, profile: Dict[str, Any], transactions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def get_spending_recommendations(self, profile: Dict[str, Any],
+                                     transactions: Union[List[Dict[str, Any]], TransactionFrame]) -> Dict[str, Any]:
         """Get AI-powered spending recommendations"""
         try:
             # Analyze spending patterns using Vercel LLM
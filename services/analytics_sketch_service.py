@@ -0,0 +1,443 @@
+"""
+Analytics sketch service for BusinessThis
+Keeps HyperLogLog and top-k sketches per day and month, updated as events
+happen, and persists them compactly in the analytics_sketches table
+"""
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+import atexit
+import os
+import socket
+import threading
+import time
+import uuid
+import logging
+from config.supabase_config import get_supabase_service_client
+from core.utils.sketches import HyperLogLog, TopK, SKETCH_TYPES
+from core.utils.pagination import keyset_condition, combine_conditions
+
+logger = logging.getLogger(__name__)
+
+SKETCH_FLUSH_INTERVAL = float(os.getenv('SKETCH_FLUSH_INTERVAL', '60'))
+SKETCH_TOP_K = int(os.getenv('SKETCH_TOP_K', '20'))
+SKETCH_PAGE_SIZE = 500
+SKETCH_PAGE_COLUMNS = ('window_start', 'shard')
+
+# Shard names written by the maintenance jobs rather than by a process.
+# Compaction only merges process shards; the job shards are already one row
+# per window and are rewritten in place when their job runs again.
+MERGED_SHARD = 'merged'
+BACKFILL_SHARD = 'backfill'
+TRANSACTIONS_SHARD = 'transactions'
+JOB_SHARDS = (BACKFILL_SHARD, TRANSACTIONS_SHARD)
+
+# Sketch name -> kind stored in analytics_sketches.kind
+SKETCHES = {
+    'ai_users': 'hll',
+    'ai_features': 'topk',
+    'spending_categories': 'topk',
+}
+
+class AnalyticsSketchService:
+    """Per-process sketch writer and cross-process sketch reader
+
+    Every process writes only its own shard row per (sketch, window), so
+    flushes never race; readers merge all shards of the windows they need.
+    Shards of closed windows are merged into one row by ``compact_shards``
+    so restarts do not grow the number of rows readers merge.
+    """
+
+    def __init__(self, client=None, flush_interval: float = SKETCH_FLUSH_INTERVAL):
+        self.supabase = client or get_supabase_service_client()
+        self.flush_interval = flush_interval
+        self.shard = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._sketches: Dict[Tuple[str, str, str], Any] = {}
+        self._dirty = set()
+        self._persisted = set()
+        self._last_flush = time.monotonic()
+        atexit.register(self.flush)
+
+    # Recording
+    def record_ai_usage(self, user_id: str, request_type: str, when: Optional[datetime] = None):
+        """Record one AI request for distinct-user and top-feature sketches"""
+        self._record('ai_users', user_id, when)
+        self._record('ai_features', request_type, when)
+        self._maybe_flush()
+
+    def _record(self, name: str, item: str, when: Optional[datetime]):
+        day = (when or datetime.utcnow()).date()
+        keys = [(name, period, window_start.isoformat())
+                for period, window_start in (('day', day), ('month', day.replace(day=1)))]
+        stored = {}
+        while True:
+            with self._lock:
+                # Evicted windows continue from what this shard already wrote,
+                # fetched below without holding the lock
+                missing = [key for key in keys
+                           if key not in self._sketches and key in self._persisted and key not in stored]
+                if not missing:
+                    for key in keys:
+                        sketch = self._sketches.get(key)
+                        if sketch is None:
+                            sketch = self._new_sketch(name)
+                            for row in stored.get(key, ()):
+                                sketch.merge(self._deserialize(name, row['data']))
+                            self._sketches[key] = sketch
+                        sketch.add(item)
+                        self._dirty.add(key)
+                    return
+            for key in missing:
+                stored[key] = self._load_rows(name, key[1], [key[2]], shard=self.shard)
+
+    def _new_sketch(self, name: str):
+        if SKETCHES[name] == 'topk':
+            return TopK(SKETCH_TOP_K)
+        return SKETCH_TYPES[SKETCHES[name]]()
+
+    def _deserialize(self, name: str, data: str):
+        return SKETCH_TYPES[SKETCHES[name]].deserialize(data)
+
+    # Persistence
+    def _maybe_flush(self):
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write dirty sketches for this shard and drop windows that have closed"""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._dirty:
+                return 0
+            keys = sorted(self._dirty)
+            self._dirty.clear()
+            now = datetime.utcnow().isoformat()
+            rows = [{
+                'name': name,
+                'period': period,
+                'window_start': window_start,
+                'shard': self.shard,
+                'kind': SKETCHES[name],
+                'data': self._sketches[(name, period, window_start)].serialize(),
+                'updated_at': now
+            } for name, period, window_start in keys]
+
+        try:
+            self.supabase.table('analytics_sketches').upsert(
+                rows, on_conflict='name,period,window_start,shard'
+            ).execute()
+        except Exception as e:
+            logger.error(f"Error flushing analytics sketches: {e}")
+            with self._lock:
+                self._dirty.update(keys)
+            return 0
+
+        with self._lock:
+            self._persisted.update(keys)
+            self._evict_closed_windows()
+        return len(rows)
+
+    @staticmethod
+    def _open_windows() -> Dict[str, List[str]]:
+        """Window starts processes still write to: the current and previous day and month"""
+        today = datetime.utcnow().date()
+        month = today.replace(day=1)
+        return {
+            'day': [(today - timedelta(days=1)).isoformat(), today.isoformat()],
+            'month': [(month - timedelta(days=1)).replace(day=1).isoformat(), month.isoformat()]
+        }
+
+    def _evict_closed_windows(self):
+        """Keep only the current and previous day/month in memory (caller holds the lock)"""
+        keep = self._open_windows()
+        for key in list(self._sketches):
+            if key[2] not in keep[key[1]] and key not in self._dirty:
+                del self._sketches[key]
+
+    def _load_rows(self, name: str, period: str, window_starts: Optional[List[str]],
+                   shard: Optional[str] = None, before: Optional[str] = None,
+                   columns: str = 'window_start, shard, data') -> List[Dict[str, Any]]:
+        """Load stored shards; ``window_starts=None`` loads every window (or those before ``before``)
+
+        Rows are read in keyset pages over (window_start, shard) until a page
+        comes back empty, so no shard is missed or merged twice.
+        """
+        if window_starts is not None and not window_starts:
+            return []
+        rows = []
+        last = None
+        while True:
+            query = self.supabase.table('analytics_sketches').select(columns) \
+                .eq('name', name).eq('period', period)
+            if window_starts is not None:
+                query = query.in_('window_start', window_starts)
+            if before:
+                query = query.lt('window_start', before)
+            if shard:
+                query = query.eq('shard', shard)
+            if last is not None:
+                query = query.or_(combine_conditions(keyset_condition(SKETCH_PAGE_COLUMNS, last, descending=False)))
+            page = query.order('window_start').order('shard').limit(SKETCH_PAGE_SIZE).execute().data or []
+            if not page:
+                return rows
+            rows.extend(page)
+            last = [page[-1][column] for column in SKETCH_PAGE_COLUMNS]
+
+    # Maintenance
+    def compact_shards(self) -> Dict[str, Any]:
+        """Merge the shards of every closed window into a single row
+
+        Only windows older than the ones processes still write are touched,
+        so no process can update a shard while it is being merged. The merged
+        row is written before the shards it replaces are deleted. Job shards
+        are left as they are.
+        """
+        stats = {'windows': 0, 'shards_removed': 0}
+        try:
+            open_windows = self._open_windows()
+            for name in SKETCHES:
+                for period in ('day', 'month'):
+                    shards: Dict[str, List[str]] = {}
+                    for row in self._load_rows(name, period, None, before=open_windows[period][0],
+                                               columns='window_start, shard'):
+                        if row['shard'] in JOB_SHARDS:
+                            continue
+                        shards.setdefault(str(row['window_start'])[:10], []).append(row['shard'])
+                    for window_start, window_shards in shards.items():
+                        if window_shards == [MERGED_SHARD]:
+                            continue
+                        rows = [row for row in self._load_rows(name, period, [window_start])
+                                if row['shard'] not in JOB_SHARDS]
+                        merged = self._new_sketch(name)
+                        for row in rows:
+                            merged.merge(self._deserialize(name, row['data']))
+                        self.supabase.table('analytics_sketches').upsert({
+                            'name': name,
+                            'period': period,
+                            'window_start': window_start,
+                            'shard': MERGED_SHARD,
+                            'kind': SKETCHES[name],
+                            'data': merged.serialize(),
+                            'updated_at': datetime.utcnow().isoformat()
+                        }, on_conflict='name,period,window_start,shard').execute()
+                        replaced = [row['shard'] for row in rows if row['shard'] != MERGED_SHARD]
+                        self.supabase.table('analytics_sketches').delete().eq('name', name).eq('period', period) \
+                            .eq('window_start', window_start).in_('shard', replaced).execute()
+                        stats['windows'] += 1
+                        stats['shards_removed'] += len(replaced)
+            return stats
+        except Exception as e:
+            logger.error(f"Error compacting analytics sketches: {e}")
+            return {**stats, 'error': f'Error compacting analytics sketches: {str(e)}'}
+
+    def _replace_job_shard(self, shard: str, names: Tuple[str, ...], sketches: Dict[Tuple[str, str, str], Any],
+                           from_window: Optional[str] = None) -> int:
+        """Write a job shard's windows, then delete the ones this run did not rebuild
+
+        Only rows of ``names`` from ``from_window`` on are replaced. The new
+        rows are written first, so readers never see the windows missing.
+        """
+        now = datetime.utcnow().isoformat()
+        rows = [{
+            'name': name,
+            'period': period,
+            'window_start': window_start,
+            'shard': shard,
+            'kind': SKETCHES[name],
+            'data': sketch.serialize(),
+            'updated_at': now
+        } for (name, period, window_start), sketch in sorted(sketches.items())]
+        for start in range(0, len(rows), SKETCH_PAGE_SIZE):
+            self.supabase.table('analytics_sketches').upsert(
+                rows[start:start + SKETCH_PAGE_SIZE], on_conflict='name,period,window_start,shard'
+            ).execute()
+        stale = self.supabase.table('analytics_sketches').delete().in_('name', list(names)) \
+            .eq('shard', shard).lt('updated_at', now)
+        if from_window:
+            stale = stale.gte('window_start', from_window)
+        stale.execute()
+        return len(rows)
+
+    def _first_tracked_day(self, name: str) -> Optional[str]:
+        """Earliest day window written by live tracking (process or merged shards)"""
+        days = [str(row['window_start'])[:10] for row in self._load_rows(name, 'day', None, columns='window_start, shard')
+                if row['shard'] not in JOB_SHARDS]
+        return min(days) if days else None
+
+    def backfill_ai_usage(self, page_size: int = 1000) -> Dict[str, Any]:
+        """Rebuild the AI user and feature sketches from the ai_usage history
+
+        Writes the day and month windows to the ``backfill`` shard, replacing
+        any earlier backfill. HyperLogLog merges are idempotent, so distinct
+        users are rebuilt from the whole history. Feature counts add up when
+        shards merge, so only days before live tracking began are backfilled;
+        the first tracked day keeps just its live counts.
+        """
+        try:
+            tracked_from = self._first_tracked_day('ai_features')
+            sketches: Dict[Tuple[str, str, str], Any] = {}
+            rows_read = 0
+            last = None
+            while True:
+                query = self.supabase.table('ai_usage').select('id, user_id, request_type, created_at')
+                if last is not None:
+                    query = query.or_(combine_conditions(keyset_condition(('created_at', 'id'), last, descending=False)))
+                page = query.order('created_at').order('id').limit(page_size).execute().data or []
+                if not page:
+                    break
+                for row in page:
+                    if not row.get('created_at'):
+                        continue
+                    day = str(row['created_at'])[:10]
+                    for period, window_start in (('day', day), ('month', day[:8] + '01')):
+                        if row.get('user_id'):
+                            key = ('ai_users', period, window_start)
+                            sketches.setdefault(key, self._new_sketch('ai_users')).add(row['user_id'])
+                        if row.get('request_type') and (tracked_from is None or day < tracked_from):
+                            key = ('ai_features', period, window_start)
+                            sketches.setdefault(key, self._new_sketch('ai_features')).add(row['request_type'])
+                rows_read += len(page)
+                last = [page[-1]['created_at'], page[-1]['id']]
+
+            windows = self._replace_job_shard(BACKFILL_SHARD, ('ai_users', 'ai_features'), sketches)
+            return {'rows_read': rows_read, 'windows': windows, 'features_tracked_from': tracked_from}
+        except Exception as e:
+            logger.error(f"Error backfilling AI usage sketches: {e}")
+            return {'error': f'Error backfilling AI usage sketches: {str(e)}'}
+
+    def refresh_spending_categories(self, since: Optional[date] = None,
+                                    page_size: int = 1000) -> Dict[str, Any]:
+        """Rebuild the spending category sketches from expense transactions
+
+        Transactions are written by clients directly, so the windows are
+        rebuilt from the table into the ``transactions`` shard rather than
+        recorded as they happen. ``since`` is moved back to the start of its
+        month and every window from there on is replaced; ``None`` rebuilds
+        the whole history.
+        """
+        try:
+            since = since.replace(day=1) if since else None
+            sketches: Dict[Tuple[str, str, str], Any] = {}
+            rows_read = 0
+            last = None
+            while True:
+                query = self.supabase.table('transactions').select('id, date, category') \
+                    .eq('transaction_type', 'expense')
+                if since:
+                    query = query.gte('date', since.isoformat())
+                if last is not None:
+                    query = query.or_(combine_conditions(keyset_condition(('date', 'id'), last, descending=False)))
+                page = query.order('date').order('id').limit(page_size).execute().data or []
+                if not page:
+                    break
+                for row in page:
+                    try:
+                        day = date.fromisoformat(str(row.get('date'))[:10]).isoformat()
+                    except ValueError:
+                        continue
+                    for period, window_start in (('day', day), ('month', day[:8] + '01')):
+                        key = ('spending_categories', period, window_start)
+                        sketches.setdefault(key, self._new_sketch('spending_categories')) \
+                            .add(row.get('category') or 'uncategorized')
+                rows_read += len(page)
+                last = [page[-1]['date'], page[-1]['id']]
+
+            windows = self._replace_job_shard(TRANSACTIONS_SHARD, ('spending_categories',), sketches,
+                                              since.isoformat() if since else None)
+            return {'rows_read': rows_read, 'windows': windows,
+                    'since': since.isoformat() if since else None}
+        except Exception as e:
+            logger.error(f"Error refreshing spending category sketches: {e}")
+            return {'error': f'Error refreshing spending category sketches: {str(e)}'}
+
+    # Reading
+    def _windows(self, start_date: date, end_date: date) -> Tuple[List[str], List[str]]:
+        """Cover a date range with whole months where possible and days elsewhere"""
+        months, days = [], []
+        current = start_date
+        while current <= end_date:
+            month_start = current.replace(day=1)
+            next_month = (month_start + timedelta(days=32)).replace(day=1)
+            if current == month_start and next_month - timedelta(days=1) <= end_date:
+                months.append(month_start.isoformat())
+                current = next_month
+            else:
+                days.append(current.isoformat())
+                current += timedelta(days=1)
+        return months, days
+
+    def _merged(self, name: str, start_date: date, end_date: date):
+        """Merge every shard of every window covering the range"""
+        self.flush()
+        months, days = self._windows(start_date, end_date)
+        merged = self._new_sketch(name)
+        for period, window_starts in (('month', months), ('day', days)):
+            for row in self._load_rows(name, period, window_starts):
+                merged.merge(self._deserialize(name, row['data']))
+        return merged
+
+    def unique_users(self, start_date: date, end_date: date, name: str = 'ai_users') -> Dict[str, Any]:
+        """Estimated distinct users in a date range, with a 95% interval"""
+        try:
+            result = self._merged(name, start_date, end_date).count_with_bounds()
+            result.update({'start_date': start_date.isoformat(), 'end_date': end_date.isoformat()})
+            return result
+        except Exception as e:
+            return {'error': f'Error estimating unique users: {str(e)}'}
+
+    def unique_users_all_time(self, name: str = 'ai_users') -> Dict[str, Any]:
+        """Estimated distinct users since tracking began (merge of every month)
+
+        Covers all of ai_usage once ``backfill_ai_usage`` has run.
+        """
+        try:
+            self.flush()
+            merged = self._new_sketch(name)
+            for row in self._load_rows(name, 'month', None):
+                merged.merge(self._deserialize(name, row['data']))
+            return merged.count_with_bounds()
+        except Exception as e:
+            return {'error': f'Error estimating unique users: {str(e)}'}
+
+    def daily_unique_users(self, days: int = 30, name: str = 'ai_users') -> Dict[str, Any]:
+        """Estimated distinct users for each of the last ``days`` days"""
+        try:
+            self.flush()
+            end_date = datetime.utcnow().date()
+            dates = [(end_date - timedelta(days=offset)).isoformat() for offset in range(days - 1, -1, -1)]
+            sketches = {day: HyperLogLog() for day in dates}
+            for row in self._load_rows(name, 'day', dates):
+                sketches[str(row['window_start'])[:10]].merge(HyperLogLog.deserialize(row['data']))
+            return {
+                'dates': dates,
+                'estimates': [sketches[day].count() for day in dates],
+                'relative_standard_error': round(HyperLogLog().standard_error, 4)
+            }
+        except Exception as e:
+            return {'error': f'Error estimating daily unique users: {str(e)}'}
+
+    def top_items(self, name: str, start_date: date, end_date: date, k: int = 10) -> Dict[str, Any]:
+        """Most frequent items in a date range with the count-min error bound"""
+        try:
+            merged = self._merged(name, start_date, end_date)
+            return {
+                'items': merged.top(k),
+                'error_bound': merged.error_bound(),
+                'start_date': start_date.isoformat(),
+                'end_date': end_date.isoformat()
+            }
+        except Exception as e:
+            return {'error': f'Error estimating top items: {str(e)}'}
+
+# Process-wide sketch service, created on first use
+_sketch_service: Optional[AnalyticsSketchService] = None
+_sketch_service_lock = threading.Lock()
+
+def get_sketch_service() -> AnalyticsSketchService:
+    """Get the shared sketch service so all events land in one shard per process"""
+    global _sketch_service
+    if _sketch_service is None:
+        with _sketch_service_lock:
+            if _sketch_service is None:
+                _sketch_service = AnalyticsSketchService()
+    return _sketch_service
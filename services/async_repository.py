@@ -0,0 +1,123 @@
+"""
+Async repository for BusinessThis
+Read-side data access on the async Supabase client, so composite endpoints
+can issue independent queries concurrently instead of one after another
+"""
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+import asyncio
+import logging
+from config.supabase_config import (
+    get_async_supabase_client, get_async_supabase_service_client, run_async
+)
+from services.repository import (
+    ReadSpec, USER, FINANCIAL_PROFILE, SAVINGS_GOALS, RECENT_TRANSACTIONS, LATEST_SUBSCRIPTION, RECENT_AI_USAGE
+)
+
+logger = logging.getLogger(__name__)
+
+async def fan_out(**queries: Awaitable) -> Dict[str, Any]:
+    """Await named coroutines concurrently and return their results by name
+
+    Latency is that of the slowest query rather than the sum of all of them.
+    The first exception is re-raised once every query has finished.
+    """
+    names = list(queries.keys())
+    results = await asyncio.gather(*queries.values(), return_exceptions=True)
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            logger.error(f"Fan-out query '{name}' failed: {result}")
+            raise result
+    return dict(zip(names, results))
+
+async def fan_out_settled(**queries: Awaitable) -> Dict[str, Any]:
+    """Like ``fan_out`` but failed queries map to their exception instead of raising"""
+    names = list(queries.keys())
+    results = await asyncio.gather(*queries.values(), return_exceptions=True)
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            logger.error(f"Fan-out query '{name}' failed: {result}")
+    return dict(zip(names, results))
+
+def run_fan_out(**queries: Awaitable) -> Dict[str, Any]:
+    """Run ``fan_out`` from synchronous code (e.g. a Flask route)"""
+    return run_async(fan_out(**queries))
+
+class AsyncRepository:
+    """Async read access to the main tables
+
+    Query builders are passed in as callables so callers keep the familiar
+    ``client.table(...).select(...).eq(...)`` chains. When the configured
+    client is synchronous (the local SQLite stand-in) each query runs in a
+    worker thread, so fan-out still overlaps round trips.
+    """
+
+    def __init__(self, service: bool = False):
+        self.service = service
+
+    async def _client(self):
+        if self.service:
+            return await get_async_supabase_service_client()
+        return await get_async_supabase_client()
+
+    async def execute(self, build: Callable[[Any], Any]):
+        """Build a query against the client and execute it"""
+        query = build(await self._client())
+        if asyncio.iscoroutinefunction(query.execute):
+            return await query.execute()
+        return await asyncio.to_thread(query.execute)
+
+    async def select(self, table: str, columns: str = '*',
+                     build: Optional[Callable[[Any], Any]] = None) -> List[Dict[str, Any]]:
+        """Select rows, optionally narrowing the query with ``build``"""
+        def query(client):
+            q = client.table(table).select(columns)
+            return build(q) if build else q
+        result = await self.execute(query)
+        return result.data or []
+
+    async def select_one(self, table: str, columns: str = '*',
+                         build: Optional[Callable[[Any], Any]] = None) -> Optional[Dict[str, Any]]:
+        """Select the first matching row, or None"""
+        def narrowed(q):
+            return (build(q) if build else q).limit(1)
+        rows = await self.select(table, columns, narrowed)
+        return rows[0] if rows else None
+
+    async def count(self, table: str, build: Optional[Callable[[Any], Any]] = None, column: str = 'id') -> int:
+        """Count matching rows without transferring them"""
+        def query(client):
+            q = client.table(table).select(column, count='exact')
+            return (build(q) if build else q).limit(1)
+        result = await self.execute(query)
+        return result.count if result.count else 0
+
+    async def read(self, spec: ReadSpec, build: Optional[Callable[[Any], Any]] = None,
+                   limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Select a spec's columns with its ordering and limit, narrowed by ``build``"""
+        def narrowed(q):
+            return spec.apply(build(q) if build else q, limit)
+        return await self.select(spec.table, spec.select, narrowed)
+
+    async def read_one(self, spec: ReadSpec, build: Optional[Callable[[Any], Any]] = None) -> Optional[Dict[str, Any]]:
+        """First row of a spec read, or None"""
+        rows = await self.read(spec, build, limit=1)
+        return rows[0] if rows else None
+
+    # Per-user reads used by composite endpoints
+    async def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return await self.read_one(USER, lambda q: q.eq('id', user_id))
+
+    async def get_financial_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return await self.read_one(FINANCIAL_PROFILE, lambda q: q.eq('user_id', user_id))
+
+    async def get_savings_goals(self, user_id: str) -> List[Dict[str, Any]]:
+        return await self.read(SAVINGS_GOALS, lambda q: q.eq('user_id', user_id))
+
+    async def get_transactions(self, user_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return await self.read(RECENT_TRANSACTIONS, lambda q: q.eq('user_id', user_id), limit)
+
+    async def get_subscription(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return await self.read_one(LATEST_SUBSCRIPTION, lambda q: q.eq('user_id', user_id))
+
+    async def get_ai_usage(self, user_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return await self.read(RECENT_AI_USAGE, lambda q: q.eq('user_id', user_id), limit)
@@ -3,16 +3,18 @@ Authentication service for BusinessThis
 """
 from typing import Optional, Dict, Any
 from datetime import datetime
-from config.supabase_config import get_supabase_client, get_supabase_service_client
+from config.supabase_config import get_supabase_auth_client, get_supabase_service_client
 from models.user import User
+from services.repository import Repository, USER
 import logging
 
 class AuthService:
     """Authentication service"""
     
     def __init__(self):
-        self.supabase = get_supabase_client()
+        self.supabase = get_supabase_auth_client()
         self.supabase_service = get_supabase_service_client()
+        self.repository = Repository(self.supabase)
     
     def register_user(self, email: str, password: str, full_name: str = '') -> Dict[str, Any]:
         """Register a new user"""
@@ -113,13 +115,8 @@ class AuthService:
     def get_user_by_id(self, user_id: str) -> Optional[User]:
         """Get user by ID"""
         try:
-            result = self.supabase.table('users').select('*').eq('id', user_id).execute()
-            
-            if result.data:
-                user_data = result.data[0]
-                return User.from_dict(user_data)
-            else:
-                return None
+            users = self.repository.fetch_models(USER, User, id=user_id)
+            return users[0] if users else None
                 
         except Exception as e:
             print(f"Error getting user: {e}")
@@ -128,13 +125,8 @@ class AuthService:
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
         try:
-            result = self.supabase.table('users').select('*').eq('email', email).execute()
-            
-            if result.data:
-                user_data = result.data[0]
-                return User.from_dict(user_data)
-            else:
-                return None
+            users = self.repository.fetch_models(USER, User, email=email)
+            return users[0] if users else None
                 
         except Exception as e:
             print(f"Error getting user by email: {e}")
@@ -0,0 +1,146 @@
+"""
+Bulk write service for BusinessThis
+Chunked multi-row inserts and upserts with per-row failure reporting
+"""
+from typing import Dict, Any, List, Optional, Callable, Tuple
+import os
+import logging
+import sqlite3
+from config.supabase_config import get_supabase_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = int(os.getenv('BULK_WRITE_BATCH_SIZE', '500'))
+
+# SQLSTATE classes for data, constraint and permission errors: the statement
+# was refused and rolled back, so its rows can safely be re-sent in halves
+REJECTION_SQLSTATE_CLASSES = ('22', '23', '42')
+
+def is_rejection(error: Exception) -> bool:
+    """Whether the server refused the rows, as opposed to a transport failure
+
+    Only a refusal guarantees nothing was written. After a timeout or a
+    dropped connection the rows may already be in the table.
+    """
+    if isinstance(error, sqlite3.IntegrityError):
+        # Local SQLite stand-in for constraint violations
+        return True
+    code = str(getattr(error, 'code', None) or '')
+    if code.startswith('PGRST'):
+        # PGRST1xx request errors and PGRST2xx schema errors are 4xx responses
+        return code[5:6] in ('1', '2')
+    if len(code) == 3 and code.isdigit():
+        # HTTP status when the error body was not JSON
+        return code.startswith('4')
+    return len(code) == 5 and code[:2] in REJECTION_SQLSTATE_CLASSES
+
+class BulkWriteService:
+    """Writes row collections in as few PostgREST calls as possible
+
+    Each chunk of ``batch_size`` rows is sent as one multi-row request. When a
+    chunk is rejected it is split in half and retried, so the rows that caused
+    the failure are isolated and reported individually while the rest of the
+    chunk is still written. Transport errors are not retried, since the chunk
+    may have been written; its rows are all reported as failed instead.
+    """
+
+    def __init__(self, client=None, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.supabase = client or get_supabase_client()
+        self.batch_size = max(1, batch_size)
+
+    def insert(self, table: str, rows: List[Dict[str, Any]],
+               batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Insert rows in chunks"""
+        def write(chunk):
+            return self.supabase.table(table).insert(chunk).execute()
+
+        return self._write(table, rows, write, batch_size, ('id',))
+
+    def upsert(self, table: str, rows: List[Dict[str, Any]], on_conflict: str = 'id',
+               batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Insert or update rows in chunks, matching existing rows on ``on_conflict``"""
+        def write(chunk):
+            return self.supabase.table(table).upsert(chunk, on_conflict=on_conflict).execute()
+
+        key = tuple(column.strip() for column in on_conflict.split(','))
+        return self._write(table, rows, write, batch_size, key)
+
+    def _write(self, table: str, rows: List[Dict[str, Any]], write: Callable,
+               batch_size: Optional[int], key: Tuple[str, ...]) -> Dict[str, Any]:
+        """Write rows chunk by chunk and collect per-row results
+
+        ``key`` names the columns that identify a row in the response when
+        PostgREST returns fewer rows than were sent.
+        """
+        size = max(1, batch_size or self.batch_size)
+        result = {
+            'rows': [None] * len(rows),
+            'failed': [],
+            'requests': 0
+        }
+
+        for start in range(0, len(rows), size):
+            self._write_chunk(write, rows[start:start + size], start, result, key)
+
+        written = sum(1 for row in result['rows'] if row is not None)
+        logger.info(
+            f"Bulk wrote {written}/{len(rows)} rows to {table} in {result['requests']} requests"
+        )
+        return {
+            'success': not result['failed'],
+            'written': written,
+            'failed_count': len(result['failed']),
+            'rows': result['rows'],
+            'failed': result['failed'],
+            'requests': result['requests']
+        }
+
+    def _write_chunk(self, write: Callable, chunk: List[Dict[str, Any]], offset: int,
+                     result: Dict[str, Any], key: Tuple[str, ...]):
+        """Write one chunk, bisecting on rejection to find the offending rows"""
+        result['requests'] += 1
+        try:
+            response = write(chunk)
+        except Exception as e:
+            if len(chunk) == 1 or not is_rejection(e):
+                self._fail(chunk, offset, result, str(e))
+                return
+            middle = len(chunk) // 2
+            self._write_chunk(write, chunk[:middle], offset, result, key)
+            self._write_chunk(write, chunk[middle:], offset + middle, result, key)
+            return
+
+        data = response.data or []
+        if len(data) == len(chunk):
+            for i, row in enumerate(data):
+                result['rows'][offset + i] = row
+            return
+
+        # PostgREST returned fewer rows than sent (e.g. filtered by RLS).
+        # Only rows that carry their key can be told apart in the response.
+        if any(row.get(column) is None for row in chunk for column in key):
+            self._fail(chunk, offset, result,
+                       f'Response returned {len(data)} of {len(chunk)} rows and rows without '
+                       f'{", ".join(key)} cannot be matched to it')
+            return
+        by_key = {tuple(str(row.get(column)) for column in key): row for row in data}
+        for i, row in enumerate(chunk):
+            written_row = by_key.get(tuple(str(row[column]) for column in key))
+            if written_row is not None:
+                result['rows'][offset + i] = written_row
+            else:
+                result['failed'].append({
+                    'index': offset + i,
+                    'row': row,
+                    'error': 'Row was not written'
+                })
+
+    @staticmethod
+    def _fail(chunk: List[Dict[str, Any]], offset: int, result: Dict[str, Any], error: str):
+        """Report every row of a chunk as failed"""
+        for i, row in enumerate(chunk):
+            result['failed'].append({
+                'index': offset + i,
+                'row': row,
+                'error': error
+            })
@@ -97,11 +97,9 @@ def get_all_safe_spends(monthly_income, fixed_expenses, variable_expenses_estima
         ValueError: If any input is negative or months_for_goal is not positive.
     """
     daily = safe_daily_spend(monthly_income, fixed_expenses, variable_expenses_estimate, savings_goal, months_for_goal)
-    weekly = safe_weekly_spend(monthly_income, fixed_expenses, variable_expenses_estimate, savings_goal, months_for_goal)
-    monthly = safe_monthly_spend(monthly_income, fixed_expenses, variable_expenses_estimate, savings_goal, months_for_goal)
     
     return {
         'daily': daily,
-        'weekly': weekly,
-        'monthly': monthly
+        'weekly': daily * 7,
+        'monthly': daily * 30
     }
@@ -0,0 +1,185 @@
+"""
+Debt service for BusinessThis
+Stores individual debts and compares avalanche, snowball and custom payoff plans
+"""
+from typing import Dict, Any, List, Optional
+from datetime import date
+import numpy as np
+import logging
+from config.supabase_config import get_supabase_client
+from models.debt import Debt, DEBT_TYPES
+from core.calculations import add_months
+from core.utils.money import to_cents, from_cents
+from core.debt_payoff import payoff_order, simulate_payoff, PAYOFF_STRATEGIES, MAX_PAYOFF_MONTHS
+from services.financial_service import invalidate_user_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXTRA_PAYMENTS = (0, 50, 100, 250, 500)
+MAX_PAYOFF_SCENARIOS = 100
+DEBT_FIELDS = ('name', 'debt_type', 'balance', 'apr', 'minimum_payment')
+
+class DebtService:
+    """Debt storage and payoff strategy comparison"""
+    
+    def __init__(self):
+        self.supabase = get_supabase_client()
+    
+    def get_debts(self, user_id: str) -> List[Debt]:
+        """Get user's debts"""
+        try:
+            result = self.supabase.table('debts').select('*').eq('user_id', user_id).order('created_at', desc=False).execute()
+            return [Debt.from_dict(row) for row in result.data]
+        except Exception as e:
+            logger.error(f"Error getting debts: {e}")
+            return []
+    
+    def _build_debt_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate and keep only debt columns from request data"""
+        row = {field: data[field] for field in DEBT_FIELDS if field in data}
+        for field in ('balance', 'apr', 'minimum_payment'):
+            if field in row:
+                row[field] = float(row[field])
+                if row[field] < 0:
+                    raise ValueError(f'{field} cannot be negative')
+        if 'debt_type' in row and row['debt_type'] not in DEBT_TYPES:
+            raise ValueError(f"debt_type must be one of: {', '.join(DEBT_TYPES)}")
+        return row
+    
+    def create_debt(self, user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a new debt"""
+        try:
+            debt_data = self._build_debt_data(data)
+            debt_data['user_id'] = user_id
+            
+            result = self.supabase.table('debts').insert(debt_data).execute()
+            if not result.data:
+                return {'success': False, 'error': 'Failed to create debt'}
+            
+            self._sync_total_debt(user_id)
+            return {'success': True, 'debt': Debt.from_dict(result.data[0]).to_dict()}
+            
+        except Exception as e:
+            return {'success': False, 'error': f'Error creating debt: {str(e)}'}
+    
+    def update_debt(self, user_id: str, debt_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Update a debt"""
+        try:
+            debt_data = self._build_debt_data(data)
+            if not debt_data:
+                return {'success': False, 'error': 'No debt fields to update'}
+            
+            result = self.supabase.table('debts').update(debt_data).eq('id', debt_id).eq('user_id', user_id).execute()
+            if not result.data:
+                return {'success': False, 'error': 'Debt not found or update failed'}
+            
+            self._sync_total_debt(user_id)
+            return {'success': True, 'debt': Debt.from_dict(result.data[0]).to_dict()}
+            
+        except Exception as e:
+            return {'success': False, 'error': f'Error updating debt: {str(e)}'}
+    
+    def delete_debt(self, user_id: str, debt_id: str) -> Dict[str, Any]:
+        """Delete a debt"""
+        try:
+            self.supabase.table('debts').delete().eq('id', debt_id).eq('user_id', user_id).execute()
+            self._sync_total_debt(user_id)
+            return {'success': True, 'message': 'Debt deleted successfully'}
+            
+        except Exception as e:
+            return {'success': False, 'error': f'Error deleting debt: {str(e)}'}
+    
+    def _sync_total_debt(self, user_id: str):
+        """Keep financial_profiles.total_debt equal to the sum of the user's debts"""
+        try:
+            total = sum(to_cents(debt.balance) for debt in self.get_debts(user_id))
+            self.supabase.table('financial_profiles').update({'total_debt': from_cents(total)}).eq('user_id', user_id).execute()
+            invalidate_user_cache('financial_profiles', user_id)
+        except Exception as e:
+            logger.error(f"Error syncing total debt: {e}")
+    
+    def compare_payoff_strategies(self, debts: List[Debt], extra_payments: Optional[List[float]] = None,
+                                  strategies: Optional[List[str]] = None,
+                                  custom_order: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Simulate payoff strategies for several extra monthly payments
+
+        ``custom_order`` lists debt ids (or names) in payoff order and adds
+        the 'custom' strategy. Each strategy result has one entry per extra
+        payment amount; 'best' names the cheapest strategy for each amount.
+        """
+        try:
+            debts = [debt for debt in debts if debt.balance > 0]
+            if not debts:
+                return {'error': 'No debts with a balance to pay off'}
+            
+            extras = np.asarray(DEFAULT_EXTRA_PAYMENTS if extra_payments is None else extra_payments, dtype=float)
+            if extras.ndim != 1 or not 0 < extras.size <= MAX_PAYOFF_SCENARIOS:
+                return {'error': f'Provide between 1 and {MAX_PAYOFF_SCENARIOS} extra payment amounts'}
+            if (extras < 0).any():
+                return {'error': 'Extra payments cannot be negative'}
+            
+            strategies = list(strategies or ('avalanche', 'snowball'))
+            if custom_order and 'custom' not in strategies:
+                strategies.append('custom')
+            unknown = [strategy for strategy in strategies if strategy not in PAYOFF_STRATEGIES]
+            if unknown:
+                return {'error': f"Strategies must be among: {', '.join(PAYOFF_STRATEGIES)}"}
+            
+            balances = np.array([float(debt.balance) for debt in debts])
+            aprs = np.array([float(debt.apr) for debt in debts])
+            minimums = np.array([float(debt.minimum_payment) for debt in debts])
+            custom_indexes = self._custom_indexes(debts, custom_order) if 'custom' in strategies else None
+            
+            today = date.today()
+            results = {}
+            for strategy in strategies:
+                order = payoff_order(balances, aprs, strategy, custom_indexes)
+                simulation = simulate_payoff(balances, aprs, minimums, extras, order)
+                results[strategy] = {
+                    'order': [debts[index].id for index in order],
+                    'scenarios': [self._scenario(debts, extras[row], simulation, row, today) for row in range(extras.size)]
+                }
+            
+            best = []
+            for row, extra in enumerate(extras):
+                paid_off = [strategy for strategy in strategies if results[strategy]['scenarios'][row]['paid_off']]
+                cheapest = min(paid_off, key=lambda strategy: results[strategy]['scenarios'][row]['total_interest'], default=None)
+                best.append({'extra_payment': float(extra), 'strategy': cheapest})
+            
+            return {
+                'debts': [debt.to_dict() for debt in debts],
+                'minimum_payments': round(float(minimums.sum()), 2),
+                'strategies': results,
+                'best': best
+            }
+            
+        except Exception as e:
+            return {'error': f'Error comparing payoff strategies: {str(e)}'}
+    
+    def _custom_indexes(self, debts: List[Debt], custom_order: Optional[List[str]]) -> List[int]:
+        """Map debt ids or names in ``custom_order`` to indexes into ``debts``"""
+        positions = {}
+        for index, debt in enumerate(debts):
+            positions[str(debt.id)] = index
+            positions.setdefault(debt.name, index)
+        missing = [key for key in custom_order or [] if str(key) not in positions]
+        if missing:
+            raise ValueError(f"Unknown debts in custom order: {', '.join(map(str, missing))}")
+        return [positions[str(key)] for key in custom_order or []]
+    
+    def _scenario(self, debts: List[Debt], extra: float, simulation: Dict[str, Any], row: int, today: date) -> Dict[str, Any]:
+        """One extra-payment scenario as JSON-ready values"""
+        months = int(simulation['months_to_payoff'][row])
+        return {
+            'extra_payment': float(extra),
+            'paid_off': months >= 0,
+            'months_to_payoff': months if months >= 0 else None,
+            'payoff_date': add_months(today, months) if months >= 0 else None,
+            'total_interest': round(float(simulation['total_interest'][row]), 2),
+            'total_paid': round(float(simulation['total_paid'][row]), 2),
+            'debt_payoff_months': {
+                debt.id: int(month) if month >= 0 else None
+                for debt, month in zip(debts, simulation['payoff_months'][row])
+            },
+            'max_months_simulated': MAX_PAYOFF_MONTHS
+        }
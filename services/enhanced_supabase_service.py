@@ -6,7 +6,7 @@ Demonstrates new features from Supabase Python client v2.22.2
 import asyncio
 import logging
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+from datetime import datetime, date
 import json
 
 from config.supabase_config import (
@@ -17,9 +17,20 @@ from config.supabase_config import (
     get_supabase_functions_client,
     get_supabase_health_status
 )
+from services.financial_service import invalidate_user_cache
+from core.utils.money import from_cents
+from core.transaction_frame import TransactionFrame
+from services.bulk_write_service import BulkWriteService
+from services.async_repository import AsyncRepository, run_fan_out
+from core.utils.pagination import build_page, combine_conditions, decode_cursor, keyset_condition
 
 logger = logging.getLogger(__name__)
 
+# Raw transaction pages: projected columns, keyset order and page size cap
+TRANSACTION_LIST_COLUMNS = 'id, amount, description, category, transaction_type, date, account_name, is_recurring'
+TRANSACTION_CURSOR_COLUMNS = ('date', 'id')
+TRANSACTION_PAGE_MAX_LIMIT = 200
+
 class EnhancedSupabaseService:
     """Enhanced Supabase service with new features from v2.22.2"""
     
@@ -29,6 +40,8 @@ class EnhancedSupabaseService:
         self.storage = get_supabase_storage_client()
         self.realtime = get_supabase_realtime_client()
         self.functions = get_supabase_functions_client()
+        self.repository = AsyncRepository()
+        self._summary_rpc_available = True
     
     def get_health_status(self) -> Dict[str, Any]:
         """Get comprehensive health status"""
@@ -68,6 +81,7 @@ class EnhancedSupabaseService:
             profile_data['updated_at'] = datetime.utcnow().isoformat()
             
             result = self.client.table('financial_profiles').update(profile_data).eq('user_id', user_id).execute()
+            invalidate_user_cache('financial_profiles', user_id)
             logger.info(f"Financial profile updated for user {user_id}")
             return result.data[0] if result.data else {}
         except Exception as e:
@@ -229,14 +243,16 @@ class EnhancedSupabaseService:
     def get_financial_insights(self, user_id: str) -> Dict[str, Any]:
         """Get comprehensive financial insights using advanced queries"""
         try:
-            # Get user's financial profile and goals
-            profile_result = self.client.table('financial_profiles').select('*').eq('user_id', user_id).execute()
-            goals_result = self.client.table('savings_goals').select('*').eq('user_id', user_id).execute()
-            transactions_result = self.client.table('transactions').select('*').eq('user_id', user_id).execute()
+            # Get user's financial profile, goals and recent transactions concurrently
+            results = run_fan_out(
+                profile=self.repository.get_financial_profile(user_id),
+                goals=self.repository.get_savings_goals(user_id),
+                transactions=self.repository.get_transactions(user_id, limit=10)
+            )
             
-            profile = profile_result.data[0] if profile_result.data else {}
-            goals = goals_result.data if goals_result.data else []
-            transactions = transactions_result.data if transactions_result.data else []
+            profile = results['profile'] or {}
+            goals = results['goals']
+            transactions = results['transactions']
             
             # Calculate insights
             total_goals = len(goals)
@@ -265,7 +281,7 @@ class EnhancedSupabaseService:
                     'savings_rate': round(savings_rate, 2),
                     'emergency_fund_months': profile.get('emergency_fund', 0) / monthly_expenses if monthly_expenses > 0 else 0
                 },
-                'recent_transactions': transactions[-10:] if transactions else [],
+                'recent_transactions': transactions,
                 'generated_at': datetime.utcnow().isoformat()
             }
         except Exception as e:
@@ -274,57 +290,177 @@ class EnhancedSupabaseService:
     
     # Batch Operations
     def batch_update_goals(self, user_id: str, goals_updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Batch update multiple savings goals"""
+        """Batch update multiple savings goals with chunked multi-row upserts"""
         try:
-            results = []
-            for goal_update in goals_updates:
-                goal_update['updated_at'] = datetime.utcnow().isoformat()
-                result = self.client.table('savings_goals').update(goal_update).eq('id', goal_update['id']).eq('user_id', user_id).execute()
-                results.append(result.data[0] if result.data else {})
+            goal_ids = [goal_update['id'] for goal_update in goals_updates]
+            existing_result = self.client.table('savings_goals').select('*').eq('user_id', user_id).in_('id', goal_ids).execute()
+            existing_goals = {goal['id']: goal for goal in (existing_result.data or [])}
+            
+            # Merge each update onto the stored row so the upsert never inserts
+            # partial rows or moves a goal to another user
+            updated_at = datetime.utcnow().isoformat()
+            rows = []
+            positions = []
+            for i, goal_update in enumerate(goals_updates):
+                existing_goal = existing_goals.get(goal_update['id'])
+                if existing_goal is None:
+                    continue
+                rows.append({**existing_goal, **goal_update, 'user_id': user_id, 'updated_at': updated_at})
+                positions.append(i)
+            
+            write_result = BulkWriteService(self.client).upsert('savings_goals', rows, on_conflict='id')
+            invalidate_user_cache('savings_goals', user_id)
             
-            logger.info(f"Batch updated {len(goals_updates)} goals for user {user_id}")
+            results = [{} for _ in goals_updates]
+            for position, row in zip(positions, write_result['rows']):
+                results[position] = row or {}
+            
+            logger.info(f"Batch updated {write_result['written']}/{len(goals_updates)} goals for user {user_id} in {write_result['requests']} requests")
             return results
         except Exception as e:
             logger.error(f"Error batch updating goals: {e}")
             raise
     
     # Analytics and Reporting
-    def get_user_analytics(self, user_id: str, start_date: str, end_date: str) -> Dict[str, Any]:
-        """Get detailed analytics for a user"""
+    def get_user_analytics(self, user_id: str, start_date: str, end_date: str,
+                           frame: Optional[TransactionFrame] = None) -> Dict[str, Any]:
+        """Get income, spending and category totals for a user's transactions dated in a range
+        
+        Totals are aggregated in the database from the monthly rollups, so the
+        cost does not depend on how many transactions the user has. Use
+        ``get_user_transactions`` for the transactions themselves. A caller
+        that already holds the user's transactions can pass them as ``frame``
+        to aggregate them in memory instead.
+        """
         try:
-            # Get transactions in date range
-            transactions_result = self.client.table('transactions').select('*').eq('user_id', user_id).gte('created_at', start_date).lte('created_at', end_date).execute()
-            
-            transactions = transactions_result.data if transactions_result.data else []
-            
-            # Calculate analytics
-            total_spent = sum([t.get('amount', 0) for t in transactions if t.get('type') == 'expense'])
-            total_earned = sum([t.get('amount', 0) for t in transactions if t.get('type') == 'income'])
-            net_flow = total_earned - total_spent
+            start, end = _as_date(start_date), _as_date(end_date)
+            if frame is not None:
+                totals = frame.between(start, end).group_totals()
+            else:
+                totals = self._get_transaction_totals(user_id, start, end)
             
-            # Categorize spending
-            spending_by_category = {}
-            for transaction in transactions:
-                if transaction.get('type') == 'expense':
-                    category = transaction.get('category', 'uncategorized')
-                    spending_by_category[category] = spending_by_category.get(category, 0) + transaction.get('amount', 0)
+            # Totals in integer cents; converted to floats only for the response
+            by_type = {}
+            spending_cents = {}
+            transaction_count = 0
+            for row in totals:
+                cents = int(row['total_cents'])
+                by_type[row['transaction_type']] = by_type.get(row['transaction_type'], 0) + cents
+                transaction_count += int(row['transaction_count'])
+                if row['transaction_type'] == 'expense':
+                    category = row['category'] or 'uncategorized'
+                    spending_cents[category] = spending_cents.get(category, 0) + cents
             
             return {
                 'user_id': user_id,
                 'period': {'start': start_date, 'end': end_date},
                 'summary': {
-                    'total_spent': total_spent,
-                    'total_earned': total_earned,
-                    'net_flow': net_flow,
-                    'transaction_count': len(transactions)
+                    'total_spent': from_cents(by_type.get('expense', 0)),
+                    'total_earned': from_cents(by_type.get('income', 0)),
+                    'net_flow': from_cents(by_type.get('income', 0) - by_type.get('expense', 0)),
+                    'transaction_count': transaction_count
                 },
-                'spending_by_category': spending_by_category,
-                'transactions': transactions,
+                'spending_by_category': {category: from_cents(cents) for category, cents in spending_cents.items()},
                 'generated_at': datetime.utcnow().isoformat()
             }
         except Exception as e:
             logger.error(f"Error generating user analytics: {e}")
             raise
+    
+    def _get_transaction_totals(self, user_id: str, start: date, end: date) -> List[Dict[str, Any]]:
+        """Cents and counts per (transaction_type, category) from get_transaction_summary()
+        
+        Falls back to summing projected transaction rows when the function is
+        not deployed yet.
+        """
+        if self._summary_rpc_available:
+            try:
+                params = {'p_user_id': user_id, 'p_start': start.isoformat(), 'p_end': end.isoformat()}
+                return self.client.rpc('get_transaction_summary', params).execute().data or []
+            except Exception as e:
+                if 'does not exist' in str(e) or 'PGRST202' in str(e):
+                    # Schema predates the function; stop paying a round trip for it
+                    self._summary_rpc_available = False
+                logger.warning(f"Transaction summary RPC unavailable, aggregating in Python: {e}")
+        
+        result = self.client.table('transactions').select('transaction_type, category, amount, date') \
+            .eq('user_id', user_id).gte('date', start.isoformat()).lte('date', end.isoformat()).execute()
+        return TransactionFrame.from_rows(result.data or []).group_totals()
+    
+    def get_monthly_category_rollups(self, user_id: str, start_month: str, end_month: str) -> List[Dict[str, Any]]:
+        """Get income, expenses and spending per category for each month in a range"""
+        try:
+            start = _as_date(start_month).replace(day=1)
+            end = _as_date(end_month).replace(day=1)
+            result = self.client.table('transaction_monthly_rollups') \
+                .select('month, transaction_type, category, total_cents') \
+                .eq('user_id', user_id).gte('month', start.isoformat()).lte('month', end.isoformat()) \
+                .order('month').execute()
+            
+            months = {}
+            for row in result.data or []:
+                month = months.setdefault(row['month'], {'income': 0, 'expense': 0, 'categories': {}})
+                cents = int(row['total_cents'])
+                if row['transaction_type'] in ('income', 'expense'):
+                    month[row['transaction_type']] += cents
+                if row['transaction_type'] == 'expense' and cents:
+                    category = row['category'] or 'uncategorized'
+                    month['categories'][category] = month['categories'].get(category, 0) + cents
+            
+            return [{
+                'month': month,
+                'income': from_cents(totals['income']),
+                'expenses': from_cents(totals['expense']),
+                'net_flow': from_cents(totals['income'] - totals['expense']),
+                'spending_by_category': {category: from_cents(cents) for category, cents in totals['categories'].items()}
+            } for month, totals in months.items()]
+        except Exception as e:
+            logger.error(f"Error getting monthly category rollups: {e}")
+            raise
+    
+    def get_user_transactions(self, user_id: str, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                              limit: int = 50, cursor: Optional[str] = None) -> Dict[str, Any]:
+        """Get a page of a user's transactions, newest first, using keyset pagination on (date, id)"""
+        try:
+            limit = max(1, min(limit, TRANSACTION_PAGE_MAX_LIMIT))
+            query = self.client.table('transactions').select(TRANSACTION_LIST_COLUMNS).eq('user_id', user_id)
+            if start_date:
+                query = query.gte('date', _as_date(start_date).isoformat())
+            if end_date:
+                query = query.lte('date', _as_date(end_date).isoformat())
+            if cursor:
+                values = decode_cursor(cursor, len(TRANSACTION_CURSOR_COLUMNS))
+                query = query.or_(combine_conditions(keyset_condition(TRANSACTION_CURSOR_COLUMNS, values, descending=True)))
+            
+            # Fetch one extra row to know whether another page exists
+            result = query.order('date', desc=True).order('id', desc=True).limit(limit + 1).execute()
+            page = build_page(result.data or [], limit, TRANSACTION_CURSOR_COLUMNS)
+            
+            return {
+                'transactions': page['rows'],
+                'pagination': {
+                    'limit': limit,
+                    'next_cursor': page['next_cursor'],
+                    'has_more': page['has_more']
+                }
+            }
+        except Exception as e:
+            logger.error(f"Error getting user transactions: {e}")
+            raise
+    
+    def rebuild_transaction_rollups(self) -> bool:
+        """Recompute every monthly rollup from the transactions table (one-off backfill)"""
+        try:
+            self.service_client.rpc('rebuild_transaction_rollups', {}).execute()
+            logger.info("Rebuilt transaction monthly rollups")
+            return True
+        except Exception as e:
+            logger.error(f"Error rebuilding transaction rollups: {e}")
+            raise
+
+def _as_date(value: str) -> date:
+    """Date part of an ISO date or timestamp string"""
+    return date.fromisoformat(str(value)[:10])
 
 # Example usage and testing
 def test_enhanced_features():
@@ -4,29 +4,153 @@ Financial service for BusinessThis
 from typing import Optional, Dict, Any, List
 from datetime import datetime, date
 from decimal import Decimal
-from config.supabase_config import get_supabase_client
+import copy
+import numpy as np
+import os
+import threading
+from config.supabase_config import get_supabase_client, get_async_supabase_service_client, run_async
 from models.financial_profile import FinancialProfile
 from models.savings_goal import SavingsGoal
 from models.transaction import Transaction
 from services.calculation_service import get_all_safe_spends
+from core.calculations import add_months, safe_spends_batch
+from core.goal_projection import project_goals, MAX_PROJECTION_MONTHS
+from core.health_score import score_profiles, SCORE_COMPONENTS
+from services.bulk_write_service import BulkWriteService
+from services.health_score_service import HealthScoreService, PROFILE_SCORE_FIELDS, score_row
+from core.utils.identity_map import identity_map_get, identity_map_put, identity_map_discard
+from core.utils.cache import LRUTTLCache
+from core.transaction_frame import TransactionFrame
+from services.repository import Repository, RECENT_TRANSACTIONS, TRANSACTION_EXPORT
 import logging
 
+logger = logging.getLogger(__name__)
+
+SAFE_SPEND_BATCH_FIELDS = ('monthly_income', 'fixed_expenses', 'variable_expenses', 'savings_goal', 'months_for_goal')
+# safe_spends_batch() argument names that differ from the request fields
+SAFE_SPEND_REQUEST_FIELDS = {'variable_expenses_estimate': 'variable_expenses'}
+SAFE_SPEND_BATCH_MAX = int(os.getenv('SAFE_SPEND_BATCH_MAX', '10000'))
+GOAL_PROJECTION_BATCH_MAX = int(os.getenv('GOAL_PROJECTION_BATCH_MAX', '1000'))
+GOAL_PROJECTION_MAX_GOALS = int(os.getenv('GOAL_PROJECTION_MAX_GOALS', '50'))
+
+# Cross-request caches shared by every FinancialService instance in the process
+CACHE_MAX_ENTRIES = int(os.getenv('FINANCIAL_CACHE_MAX_ENTRIES', '10000'))
+CACHE_TTL_SECONDS = float(os.getenv('FINANCIAL_CACHE_TTL', '300'))
+# TTL used until a realtime change has actually been received, so other
+# workers serve stale rows for at most this long after a write
+CACHE_FALLBACK_TTL_SECONDS = float(os.getenv('FINANCIAL_CACHE_FALLBACK_TTL', '15'))
+REALTIME_SUBSCRIBE_TIMEOUT = float(os.getenv('REALTIME_SUBSCRIBE_TIMEOUT', '10'))
+profile_cache = LRUTTLCache('financial_profiles', CACHE_MAX_ENTRIES, min(CACHE_TTL_SECONDS, CACHE_FALLBACK_TTL_SECONDS))
+goals_cache = LRUTTLCache('savings_goals', CACHE_MAX_ENTRIES, min(CACHE_TTL_SECONDS, CACHE_FALLBACK_TTL_SECONDS))
+_realtime_confirmed = threading.Event()
+
+def invalidate_user_cache(table: str, user_id: str):
+    """Drop cached rows for a user after a write to ``table``"""
+    if table == 'financial_profiles':
+        profile_cache.invalidate(user_id)
+    elif table == 'savings_goals':
+        goals_cache.invalidate(user_id)
+    identity_map_discard(table, user_id)
+
+def handle_realtime_change(payload: Dict[str, Any]):
+    """Invalidate cached rows from a Supabase realtime postgres_changes payload
+    
+    The first change received proves events are delivered (the tables are in
+    the publication), so the caches switch from the fallback TTL to the full one.
+    """
+    if not _realtime_confirmed.is_set():
+        _realtime_confirmed.set()
+        for cache in (profile_cache, goals_cache):
+            cache.ttl_seconds = CACHE_TTL_SECONDS
+        logger.info(f"Realtime cache invalidation confirmed, caching for {CACHE_TTL_SECONDS}s")
+    data = payload.get('data', payload) if isinstance(payload, dict) else {}
+    table = data.get('table')
+    for record_key in ('record', 'new', 'old_record', 'old'):
+        record = data.get(record_key) or {}
+        if record.get('user_id'):
+            invalidate_user_cache(table, record['user_id'])
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Get hit/miss/eviction stats for the profile and goal caches"""
+    return {
+        'financial_profiles': profile_cache.get_stats(),
+        'savings_goals': goals_cache.get_stats()
+    }
+
 class FinancialService:
     """Financial service for calculations and data management"""
     
     def __init__(self):
         self.supabase = get_supabase_client()
+        self.health_scores = HealthScoreService(self.supabase)
+    
+    def subscribe_to_cache_invalidation(self) -> bool:
+        """Invalidate cached profiles and goals on Supabase realtime changes
+        
+        The sync client has no realtime support, so the channel is opened with
+        the async service client on the shared event loop, which keeps the
+        websocket alive for the life of the process. A successful subscribe
+        does not prove events arrive, so the caches keep
+        FINANCIAL_CACHE_FALLBACK_TTL until ``handle_realtime_change`` sees one.
+        """
+        async def subscribe():
+            client = await get_async_supabase_service_client()
+            channel = client.channel('financial_cache_invalidation')
+            for table in ('financial_profiles', 'savings_goals'):
+                channel = channel.on_postgres_changes('*', handle_realtime_change, table=table, schema='public')
+            await channel.subscribe()
+        
+        try:
+            run_async(subscribe(), timeout=REALTIME_SUBSCRIBE_TIMEOUT)
+            logger.info("Subscribed to realtime cache invalidation")
+            return True
+        except Exception as e:
+            logger.warning(
+                f"Realtime cache invalidation unavailable, caching for {CACHE_FALLBACK_TTL_SECONDS}s instead: {e}"
+            )
+            return False
+    
+    def start_cache_invalidation(self) -> threading.Thread:
+        """Subscribe in a background thread so startup never waits on the realtime handshake"""
+        thread = threading.Thread(target=self.subscribe_to_cache_invalidation,
+                                  name='financial-cache-invalidation', daemon=True)
+        thread.start()
+        return thread
+    
+    def _store_profile(self, user_id: str, profile: FinancialProfile, generation: Optional[int] = None):
+        """Write a freshly loaded or written profile through both cache layers
+        
+        Loaded profiles pass the cache generation taken before the read, so a
+        read that raced with an invalidation does not re-cache the old row.
+        """
+        profile_cache.set(user_id, profile, generation=generation)
+        identity_map_put('financial_profiles', user_id, profile)
     
     def get_financial_profile(self, user_id: str) -> Optional[FinancialProfile]:
         """Get user's financial profile"""
         try:
+            found, profile = identity_map_get('financial_profiles', user_id)
+            if found:
+                return profile
+            
+            found, profile = profile_cache.get(user_id)
+            if found:
+                profile = copy.copy(profile)
+                identity_map_put('financial_profiles', user_id, profile)
+                return profile
+            
+            generation = profile_cache.generation()
             result = self.supabase.table('financial_profiles').select('*').eq('user_id', user_id).execute()
             
             if result.data:
                 profile_data = result.data[0]
-                return FinancialProfile.from_dict(profile_data)
+                profile = FinancialProfile.from_dict(profile_data)
+                self._store_profile(user_id, profile, generation)
             else:
-                return None
+                profile = None
+                identity_map_put('financial_profiles', user_id, profile)
+            
+            return profile
                 
         except Exception as e:
             print(f"Error getting financial profile: {e}")
@@ -44,11 +168,13 @@ class FinancialService:
                 
                 if result.data:
                     updated_profile = FinancialProfile.from_dict(result.data[0])
+                    self._store_profile(user_id, updated_profile)
                     return {
                         'success': True,
                         'profile': updated_profile.to_dict()
                     }
                 else:
+                    invalidate_user_cache('financial_profiles', user_id)
                     return {
                         'success': False,
                         'error': 'Failed to update financial profile'
@@ -64,6 +190,7 @@ class FinancialService:
                 
                 if result.data:
                     new_profile = FinancialProfile.from_dict(result.data[0])
+                    self._store_profile(user_id, new_profile)
                     return {
                         'success': True,
                         'profile': new_profile.to_dict()
@@ -83,6 +210,17 @@ class FinancialService:
     def get_savings_goals(self, user_id: str) -> List[SavingsGoal]:
         """Get user's savings goals"""
         try:
+            found, goals = identity_map_get('savings_goals', user_id)
+            if found:
+                return list(goals)
+            
+            found, goals = goals_cache.get(user_id)
+            if found:
+                goals = [copy.copy(goal) for goal in goals]
+                identity_map_put('savings_goals', user_id, goals)
+                return list(goals)
+            
+            generation = goals_cache.generation()
             result = self.supabase.table('savings_goals').select('*').eq('user_id', user_id).order('priority', desc=False).execute()
             
             goals = []
@@ -90,27 +228,46 @@ class FinancialService:
                 goal = SavingsGoal.from_dict(goal_data)
                 goals.append(goal)
             
-            return goals
+            goals_cache.set(user_id, goals, generation=generation)
+            identity_map_put('savings_goals', user_id, goals)
+            return list(goals)
             
         except Exception as e:
             print(f"Error getting savings goals: {e}")
             return []
     
+    def get_recent_transactions(self, user_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the user's most recent transaction rows, newest first"""
+        return Repository(self.supabase).fetch(RECENT_TRANSACTIONS, limit, user_id=user_id)
+    
+    def get_user_transactions(self, user_id: str) -> List[Dict[str, Any]]:
+        """Get the user's transaction rows for export, newest first (one response's worth)"""
+        return Repository(self.supabase).fetch(TRANSACTION_EXPORT, user_id=user_id)
+    
+    def get_transaction_frame(self, user_id: str, limit: Optional[int] = None) -> TransactionFrame:
+        """Get the user's most recent transactions as a columnar frame for aggregation"""
+        return TransactionFrame.from_rows(self.get_recent_transactions(user_id, limit))
+    
+    def _build_goal_data(self, user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a savings_goals row from request data"""
+        return {
+            'user_id': user_id,
+            'name': data['name'],
+            'target_amount': data['target_amount'],
+            'current_amount': data.get('current_amount', 0),
+            'target_date': data.get('target_date'),
+            'monthly_contribution': data.get('monthly_contribution'),
+            'priority': data.get('priority', 1),
+            'is_achieved': False
+        }
+    
     def create_savings_goal(self, user_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new savings goal"""
         try:
-            goal_data = {
-                'user_id': user_id,
-                'name': data['name'],
-                'target_amount': data['target_amount'],
-                'current_amount': data.get('current_amount', 0),
-                'target_date': data.get('target_date'),
-                'monthly_contribution': data.get('monthly_contribution'),
-                'priority': data.get('priority', 1),
-                'is_achieved': False
-            }
+            goal_data = self._build_goal_data(user_id, data)
             
             result = self.supabase.table('savings_goals').insert(goal_data).execute()
+            invalidate_user_cache('savings_goals', user_id)
             
             if result.data:
                 goal = SavingsGoal.from_dict(result.data[0])
@@ -130,10 +287,42 @@ class FinancialService:
                 'error': f'Error creating savings goal: {str(e)}'
             }
     
+    def create_savings_goals(self, user_id: str, goals: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create several savings goals with chunked multi-row inserts"""
+        try:
+            rows = []
+            errors = []
+            for i, data in enumerate(goals):
+                if not data.get('name') or not data.get('target_amount'):
+                    errors.append({'index': i, 'error': 'Goal name and target amount are required'})
+                    continue
+                rows.append((i, self._build_goal_data(user_id, data)))
+            
+            write_result = BulkWriteService(self.supabase).insert('savings_goals', [row for _, row in rows])
+            invalidate_user_cache('savings_goals', user_id)
+            
+            created = [SavingsGoal.from_dict(row).to_dict() for row in write_result['rows'] if row]
+            for failure in write_result['failed']:
+                errors.append({'index': rows[failure['index']][0], 'error': failure['error']})
+            
+            return {
+                'success': not errors,
+                'goals': created,
+                'created_count': len(created),
+                'errors': sorted(errors, key=lambda error: error['index'])
+            }
+            
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'Error creating savings goals: {str(e)}'
+            }
+    
     def update_savings_goal(self, user_id: str, goal_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a savings goal"""
         try:
             result = self.supabase.table('savings_goals').update(data).eq('id', goal_id).eq('user_id', user_id).execute()
+            invalidate_user_cache('savings_goals', user_id)
             
             if result.data:
                 goal = SavingsGoal.from_dict(result.data[0])
@@ -157,6 +346,7 @@ class FinancialService:
         """Delete a savings goal"""
         try:
             result = self.supabase.table('savings_goals').delete().eq('id', goal_id).eq('user_id', user_id).execute()
+            invalidate_user_cache('savings_goals', user_id)
             
             return {
                 'success': True,
@@ -212,6 +402,180 @@ class FinancialService:
                 'error': f'Error calculating safe spending: {str(e)}'
             }
     
+    def calculate_safe_spending_batch(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Calculate safe spending for many profiles in one vectorized pass
+        
+        ``data`` is either columnar (one list per field in
+        SAFE_SPEND_BATCH_FIELDS) or ``{'profiles': [{field: value, ...}, ...]}``.
+        Results are columnar lists aligned with the input; invalid rows get
+        None amounts and an entry in ``errors``. Non-numeric values and
+        profiles that are not objects only invalidate their own row.
+        """
+        try:
+            row_errors = {}
+            if 'profiles' in data:
+                profiles = data['profiles'] or []
+                if not isinstance(profiles, list):
+                    return {'error': 'profiles must be a list'}
+                for index, profile in enumerate(profiles):
+                    if not isinstance(profile, dict):
+                        row_errors[index] = 'Profile must be an object'
+                # A non-object profile has no values, so every field (even a defaulted one) is NaN
+                columns = {
+                    field: [profile.get(field) if isinstance(profile, dict) else float('nan') for profile in profiles]
+                    for field in SAFE_SPEND_BATCH_FIELDS
+                }
+            else:
+                columns = {field: data.get(field) for field in SAFE_SPEND_BATCH_FIELDS}
+            
+            # months_for_goal defaults to 12 and savings_goal to 0, as for single profiles
+            size = max((len(values) for values in columns.values() if isinstance(values, list)), default=0)
+            if size == 0:
+                return {'error': 'No profiles provided'}
+            if size > SAFE_SPEND_BATCH_MAX:
+                return {'error': f'At most {SAFE_SPEND_BATCH_MAX} profiles per batch'}
+            defaults = {'savings_goal': 0, 'months_for_goal': 12}
+            arrays = {}
+            for field, values in columns.items():
+                if values is None:
+                    if field not in defaults:
+                        return {'error': f'{field} is required'}
+                    values = defaults[field]
+                elif isinstance(values, list):
+                    if len(values) != size:
+                        return {'error': f'{field} must have {size} values'}
+                    values = [defaults.get(field, float('nan')) if value is None else value for value in values]
+                # Values that are not numbers become NaN and are reported as invalid for their row
+                if isinstance(values, list):
+                    arrays[field] = np.array([self._batch_number(value) for value in values], dtype=np.float64)
+                else:
+                    arrays[field] = np.float64(self._batch_number(values))
+            
+            result = safe_spends_batch(
+                arrays['monthly_income'],
+                arrays['fixed_expenses'],
+                arrays['variable_expenses'],
+                arrays['savings_goal'],
+                arrays['months_for_goal']
+            )
+            
+            valid = result['valid']
+            errors = []
+            for index in np.flatnonzero(~valid):
+                if int(index) in row_errors:
+                    errors.append({'index': int(index), 'error': row_errors[int(index)]})
+                    continue
+                fields = [SAFE_SPEND_REQUEST_FIELDS.get(field, field)
+                          for field, mask in result['invalid'].items() if mask[index]]
+                errors.append({'index': int(index), 'invalid_fields': fields})
+            
+            def to_list(values):
+                return [float(value) if ok else None for value, ok in zip(values.tolist(), valid.tolist())]
+            
+            return {
+                'daily': to_list(result['daily']),
+                'weekly': to_list(result['weekly']),
+                'monthly': to_list(result['monthly']),
+                'valid': valid.tolist(),
+                'errors': errors,
+                'count': int(valid.size),
+                'valid_count': int(valid.sum())
+            }
+            
+        except (TypeError, ValueError) as e:
+            return {'error': f'Invalid batch input: {str(e)}'}
+        except Exception as e:
+            return {'error': f'Error calculating safe spending batch: {str(e)}'}
+    
+    @staticmethod
+    def _batch_number(value: Any) -> float:
+        """A batch input value as a float, or NaN when it is not a number"""
+        if isinstance(value, bool):
+            return float('nan')
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return float('nan')
+    
+    def project_savings_goals(self, user_id: str, annual_rate: float = 0.0,
+                              monthly_surplus: Optional[float] = None) -> Dict[str, Any]:
+        """Project completion dates for all open goals sharing the profile surplus"""
+        try:
+            if monthly_surplus is None:
+                profile = self.get_financial_profile(user_id)
+                if not profile:
+                    return {'error': 'Financial profile not found'}
+                monthly_surplus = float(profile.monthly_income - profile.fixed_expenses - profile.variable_expenses)
+            
+            goals = [goal.to_dict() for goal in self.get_savings_goals(user_id) if not goal.is_achieved]
+            return self.project_goal_sets([{'monthly_surplus': monthly_surplus, 'goals': goals}], annual_rate)[0]
+            
+        except Exception as e:
+            return {'error': f'Error projecting savings goals: {str(e)}'}
+    
+    def project_goal_sets(self, goal_sets: List[Dict[str, Any]], annual_rate: float = 0.0) -> List[Dict[str, Any]]:
+        """Waterfall projection for several users' goals in one vectorized pass
+        
+        Each set is ``{'monthly_surplus': float, 'goals': [goal dicts]}``;
+        goals need target_amount and may have current_amount, priority,
+        target_date, id and name. Raises ValueError on malformed input,
+        including more than GOAL_PROJECTION_MAX_GOALS goals in one set.
+        """
+        if len(goal_sets) > GOAL_PROJECTION_BATCH_MAX:
+            raise ValueError(f'At most {GOAL_PROJECTION_BATCH_MAX} goal sets per batch')
+        # Arrays are sets x widest set, so one over-wide set must not size them
+        for index, goal_set in enumerate(goal_sets):
+            goals = goal_set.get('goals') or []
+            if not isinstance(goals, list):
+                raise ValueError(f'Goal set {index}: goals must be a list')
+            if len(goals) > GOAL_PROJECTION_MAX_GOALS:
+                raise ValueError(f'Goal set {index}: at most {GOAL_PROJECTION_MAX_GOALS} goals per set')
+        
+        width = max((len(goal_set.get('goals') or []) for goal_set in goal_sets), default=0)
+        shape = (len(goal_sets), max(width, 1))
+        targets, current = np.zeros(shape), np.zeros(shape)
+        # Padding sorts last and, with a zero target, is reached immediately
+        priorities = np.full(shape, np.inf)
+        for row, goal_set in enumerate(goal_sets):
+            for column, goal in enumerate(goal_set.get('goals') or []):
+                targets[row, column] = float(goal['target_amount'])
+                current[row, column] = float(goal.get('current_amount') or 0)
+                priorities[row, column] = float(goal.get('priority') or 1)
+        surplus = np.array([float(goal_set.get('monthly_surplus') or 0) for goal_set in goal_sets])
+        
+        projection = project_goals(surplus, targets, current, priorities, annual_rate)
+        
+        today = date.today()
+        results = []
+        for row, goal_set in enumerate(goal_sets):
+            goals = []
+            for column, goal in enumerate(goal_set.get('goals') or []):
+                months = int(projection['completion_months'][row, column])
+                completion = add_months(today, months) if months >= 0 else None
+                target_date = str(goal['target_date'])[:10] if goal.get('target_date') else None
+                goals.append({
+                    'id': goal.get('id'),
+                    'name': goal.get('name'),
+                    'priority': goal.get('priority') or 1,
+                    'target_amount': targets[row, column],
+                    'current_amount': current[row, column],
+                    'first_month_contribution': round(float(projection['first_month_contribution'][row, column]), 2),
+                    'months_to_goal': months if months >= 0 else None,
+                    'projected_completion': completion,
+                    'target_date': target_date,
+                    'on_track': (completion is not None and completion <= target_date[:7]) if target_date else None
+                })
+            reachable = [goal['months_to_goal'] for goal in goals]
+            results.append({
+                'monthly_surplus': float(surplus[row]),
+                'annual_rate': annual_rate,
+                'goals': goals,
+                'all_reachable': all(months is not None for months in reachable),
+                'months_to_all_goals': max(reachable, default=0) if all(months is not None for months in reachable) else None,
+                'max_months_projected': MAX_PROJECTION_MONTHS
+            })
+        return results
+    
     def calculate_financial_health_score(self, user_id: str) -> Dict[str, Any]:
         """Calculate comprehensive financial health score"""
         try:
@@ -221,72 +585,17 @@ class FinancialService:
                     'error': 'Financial profile not found'
                 }
             
-            scores = {}
-            
-            # Savings rate score (0-25 points)
-            savings_rate = profile.calculate_savings_rate()
-            if savings_rate >= 20:
-                scores['savings_rate'] = 25
-            elif savings_rate >= 15:
-                scores['savings_rate'] = 20
-            elif savings_rate >= 10:
-                scores['savings_rate'] = 15
-            elif savings_rate >= 5:
-                scores['savings_rate'] = 10
-            else:
-                scores['savings_rate'] = max(0, int(savings_rate * 2))
-            
-            # Debt-to-income ratio score (0-25 points)
-            debt_ratio = profile.calculate_debt_to_income_ratio()
-            if debt_ratio <= 0.2:
-                scores['debt_ratio'] = 25
-            elif debt_ratio <= 0.3:
-                scores['debt_ratio'] = 20
-            elif debt_ratio <= 0.4:
-                scores['debt_ratio'] = 15
-            elif debt_ratio <= 0.5:
-                scores['debt_ratio'] = 10
-            else:
-                scores['debt_ratio'] = max(0, 25 - int(debt_ratio * 50))
-            
-            # Emergency fund score (0-25 points)
-            emergency_fund_progress = profile.calculate_emergency_fund_progress()
-            if emergency_fund_progress >= 100:
-                scores['emergency_fund'] = 25
-            elif emergency_fund_progress >= 75:
-                scores['emergency_fund'] = 20
-            elif emergency_fund_progress >= 50:
-                scores['emergency_fund'] = 15
-            elif emergency_fund_progress >= 25:
-                scores['emergency_fund'] = 10
-            else:
-                scores['emergency_fund'] = max(0, int(emergency_fund_progress / 4))
-            
-            # Investment score (0-25 points) - simplified for now
-            # This would be more complex in a real implementation
-            scores['investment'] = 10  # Default moderate score
-            
-            # Calculate overall score
-            overall_score = sum(scores.values())
-            
-            # Determine health level
-            if overall_score >= 90:
-                health_level = 'Excellent'
-            elif overall_score >= 75:
-                health_level = 'Good'
-            elif overall_score >= 60:
-                health_level = 'Fair'
-            elif overall_score >= 40:
-                health_level = 'Poor'
-            else:
-                health_level = 'Critical'
+            result = score_profiles(*([float(getattr(profile, field))] for field in PROFILE_SCORE_FIELDS))
+            scores = {component: int(result['scores'][component][0]) for component in SCORE_COMPONENTS}
+            overall_score = int(result['overall_score'][0])
             
-            # Save score to database
-            self.save_financial_health_score(user_id, overall_score, scores)
+            # The history only gets a point when the score changes (usually
+            # already written by the nightly recompute), not on every read
+            self.health_scores.record_score(user_id, overall_score, scores)
             
             return {
                 'overall_score': overall_score,
-                'health_level': health_level,
+                'health_level': str(result['health_level'][0]),
                 'scores': scores,
                 'recommendations': self.get_financial_recommendations(scores)
             }
@@ -296,17 +605,14 @@ class FinancialService:
                 'error': f'Error calculating financial health score: {str(e)}'
             }
     
+    def get_financial_health_trend(self, user_id: str, points: int = 12) -> Dict[str, Any]:
+        """Get recent financial health score points with deltas and component movement"""
+        return self.health_scores.get_trend(user_id, points)
+    
     def save_financial_health_score(self, user_id: str, overall_score: int, scores: Dict[str, int]) -> bool:
         """Save financial health score to database"""
         try:
-            score_data = {
-                'user_id': user_id,
-                'overall_score': overall_score,
-                'savings_rate_score': scores.get('savings_rate', 0),
-                'debt_ratio_score': scores.get('debt_ratio', 0),
-                'emergency_fund_score': scores.get('emergency_fund', 0),
-                'investment_score': scores.get('investment', 0)
-            }
+            score_data = score_row(user_id, overall_score, scores)
             
             result = self.supabase.table('financial_health_scores').insert(score_data).execute()
             return len(result.data) > 0
@@ -0,0 +1,297 @@
+"""
+Health score service for BusinessThis
+Batch recomputation of financial health scores and the compact per-user
+score history (written only on change, down-sampled with age)
+"""
+from typing import Dict, Any, List, Iterator, Optional, Tuple
+from datetime import datetime, timezone
+import os
+import time
+import logging
+import numpy as np
+from config.supabase_config import get_supabase_service_client
+from core.health_score import score_profiles, compaction_mask, health_levels, SCORE_COMPONENTS, SCORE_COLUMNS
+from services.bulk_write_service import BulkWriteService
+from core.utils.pagination import keyset_condition, combine_conditions
+
+logger = logging.getLogger(__name__)
+
+HEALTH_SCORE_CHUNK_SIZE = int(os.getenv('HEALTH_SCORE_CHUNK_SIZE', '1000'))
+
+# History older than these ages is down-sampled to weekly, then monthly points
+HISTORY_WEEKLY_AFTER_DAYS = int(os.getenv('HEALTH_HISTORY_WEEKLY_AFTER_DAYS', '90'))
+HISTORY_MONTHLY_AFTER_DAYS = int(os.getenv('HEALTH_HISTORY_MONTHLY_AFTER_DAYS', '365'))
+TREND_MAX_POINTS = int(os.getenv('HEALTH_TREND_MAX_POINTS', '120'))
+
+HISTORY_COLUMNS = ('overall_score', *SCORE_COLUMNS.values())
+
+# Users per financial_health_latest_scores read; one row per user keeps each
+# response well under PostgREST's max rows (1000 by default)
+LATEST_SCORE_BATCH_SIZE = 500
+
+# Rows per page when reading old history for compaction, in (user_id, created_at, id) order
+HISTORY_PAGE_SIZE = 1000
+HISTORY_PAGE_COLUMNS = ('user_id', 'created_at', 'id')
+
+# Only the profile columns the score depends on
+PROFILE_SCORE_FIELDS = ('monthly_income', 'fixed_expenses', 'variable_expenses', 'total_debt',
+                        'emergency_fund_current', 'emergency_fund_target')
+
+def score_row(user_id: str, overall_score: int, scores: Dict[str, int]) -> Dict[str, Any]:
+    """financial_health_scores row for a user's scores"""
+    row = {'user_id': user_id, 'overall_score': int(overall_score)}
+    for component in SCORE_COMPONENTS:
+        row[SCORE_COLUMNS[component]] = int(scores.get(component, 0))
+    return row
+
+def scores_changed(row: Dict[str, Any], latest: Optional[Dict[str, Any]]) -> bool:
+    """Whether a newly computed score row differs from the latest stored one"""
+    if not latest:
+        return True
+    return any(row[column] != latest.get(column) for column in HISTORY_COLUMNS)
+
+def _epoch_seconds(timestamp: str) -> float:
+    """Seconds since the epoch for an ISO timestamp (naive times are UTC)"""
+    moment = datetime.fromisoformat(timestamp)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+class HealthScoreService:
+    """Precomputes financial health scores in chunks and stores only changed scores"""
+
+    def __init__(self, client=None, bulk_writer: Optional[BulkWriteService] = None):
+        self.supabase = client or get_supabase_service_client()
+        self.bulk_writer = bulk_writer or BulkWriteService(self.supabase)
+
+    def get_latest_scores(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Most recent stored score row for each user that has one
+        
+        Reads the trigger-maintained financial_health_latest_scores table, so
+        the cost is one row per user however long their history is.
+        """
+        user_ids = list(user_ids)
+        columns = ', '.join(('user_id', *HISTORY_COLUMNS, 'created_at'))
+        latest = {}
+        for offset in range(0, len(user_ids), LATEST_SCORE_BATCH_SIZE):
+            batch = user_ids[offset:offset + LATEST_SCORE_BATCH_SIZE]
+            result = self.supabase.table('financial_health_latest_scores').select(columns) \
+                .in_('user_id', batch).limit(len(batch)).execute()
+            for row in result.data or []:
+                latest[row['user_id']] = row
+        return latest
+
+    def rebuild_latest_scores(self) -> Dict[str, Any]:
+        """Recompute financial_health_latest_scores from the history (one-off backfill)"""
+        try:
+            self.supabase.rpc('rebuild_latest_health_scores', {}).execute()
+            logger.info("Rebuilt latest health scores")
+            return {'success': True}
+        except Exception as e:
+            logger.error(f"Error rebuilding latest health scores: {e}")
+            return {'error': f'Error rebuilding latest health scores: {str(e)}'}
+
+    def get_latest_score(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """The user's most recent stored score row, or None"""
+        history = self.get_history(user_id, 1)
+        return history[-1] if history else None
+
+    def record_score(self, user_id: str, overall_score: int, scores: Dict[str, int]) -> bool:
+        """Append a score to the user's history if it differs from the latest one
+
+        Failures are logged and reported as False, so callers that computed
+        the score can still return it.
+        """
+        try:
+            row = score_row(user_id, overall_score, scores)
+            if not scores_changed(row, self.get_latest_score(user_id)):
+                return False
+            result = self.supabase.table('financial_health_scores').insert(row).execute()
+            return len(result.data) > 0
+        except Exception as e:
+            logger.error(f"Error recording health score for user {user_id}: {e}")
+            return False
+
+    def get_history(self, user_id: str, points: int) -> List[Dict[str, Any]]:
+        """The user's most recent ``points`` history points, oldest first"""
+        columns = ', '.join((*HISTORY_COLUMNS, 'created_at'))
+        result = self.supabase.table('financial_health_scores').select(columns).eq('user_id', user_id) \
+            .order('created_at', desc=True).limit(points).execute()
+        return list(reversed(result.data or []))
+
+    def get_trend(self, user_id: str, points: int = 12) -> Dict[str, Any]:
+        """Recent score points with overall deltas and per-component movement"""
+        try:
+            points = int(points)
+            if not 2 <= points <= TREND_MAX_POINTS:
+                return {'error': f'Points must be between 2 and {TREND_MAX_POINTS}'}
+
+            history = self.get_history(user_id, points)
+            if not history:
+                return {'error': 'No financial health score history found'}
+
+            overall = np.array([row['overall_score'] for row in history])
+            components = {
+                component: np.array([row[column] or 0 for row in history])
+                for component, column in SCORE_COLUMNS.items()
+            }
+            levels = health_levels(overall)
+
+            movement = {}
+            for component, values in components.items():
+                change = int(values[-1] - values[0])
+                movement[component] = {
+                    'start': int(values[0]),
+                    'end': int(values[-1]),
+                    'change': change,
+                    'direction': 'up' if change > 0 else 'down' if change < 0 else 'flat'
+                }
+
+            return {
+                'points': [{
+                    'created_at': row['created_at'],
+                    'overall_score': int(overall[index]),
+                    'health_level': str(levels[index]),
+                    'scores': {component: int(values[index]) for component, values in components.items()}
+                } for index, row in enumerate(history)],
+                'latest': int(overall[-1]),
+                'change': int(overall[-1] - overall[0]),
+                'deltas': np.diff(overall).tolist(),
+                'best': int(overall.max()),
+                'worst': int(overall.min()),
+                'components': movement
+            }
+
+        except Exception as e:
+            return {'error': f'Error getting financial health trend: {str(e)}'}
+
+    def compact_history(self, chunk_size: Optional[int] = None,
+                        weekly_after_days: int = HISTORY_WEEKLY_AFTER_DAYS,
+                        monthly_after_days: int = HISTORY_MONTHLY_AFTER_DAYS) -> Dict[str, Any]:
+        """Down-sample old history to weekly and monthly points and drop repeats"""
+        try:
+            start = time.perf_counter()
+            now = time.time()
+            cutoff = datetime.fromtimestamp(now - weekly_after_days * 86400, timezone.utc).isoformat()
+            stats = {'users': 0, 'rows_scanned': 0, 'rows_deleted': 0}
+
+            for profiles in self.iter_profile_chunks(chunk_size, fields=()):
+                user_ids = [profile['user_id'] for profile in profiles]
+                stale = []
+                for rows in self._old_history_by_user(user_ids, cutoff).values():
+                    keep = compaction_mask(
+                        [_epoch_seconds(row['created_at']) for row in rows], now,
+                        weekly_after_days, monthly_after_days,
+                        values=[[row[column] for column in HISTORY_COLUMNS] for row in rows]
+                    )
+                    stale.extend(row['id'] for row, kept in zip(rows, keep) if not kept)
+                    stats['rows_scanned'] += len(rows)
+
+                size = max(1, chunk_size or HEALTH_SCORE_CHUNK_SIZE)
+                for offset in range(0, len(stale), size):
+                    result = self.supabase.table('financial_health_scores').delete() \
+                        .in_('id', stale[offset:offset + size]).execute()
+                    stats['rows_deleted'] += len(result.data or [])
+                stats['users'] += len(user_ids)
+
+            stats['elapsed_seconds'] = round(time.perf_counter() - start, 3)
+            logger.info(
+                f"Compacted health score history for {stats['users']} users: "
+                f"{stats['rows_deleted']}/{stats['rows_scanned']} old rows removed in {stats['elapsed_seconds']}s"
+            )
+            return stats
+
+        except Exception as e:
+            logger.error(f"Error compacting health score history: {e}")
+            return {'error': f'Error compacting health score history: {str(e)}'}
+
+    def _old_history_by_user(self, user_ids: List[str], cutoff: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Every history row older than ``cutoff`` for a chunk of users, grouped by user in time order
+
+        Compaction merges repeated points, so it must see each series whole:
+        rows are read with keyset pages over (user_id, created_at, id) until a
+        page comes back empty, which stays correct whatever the server's
+        per-response row cap is.
+        """
+        columns = ', '.join(('id', 'user_id', *HISTORY_COLUMNS, 'created_at'))
+        by_user = {}
+        last = None
+        while True:
+            query = self.supabase.table('financial_health_scores').select(columns).in_('user_id', user_ids) \
+                .lt('created_at', cutoff)
+            if last is not None:
+                query = query.or_(combine_conditions(keyset_condition(HISTORY_PAGE_COLUMNS, last, descending=False)))
+            rows = query.order('user_id').order('created_at').order('id').limit(HISTORY_PAGE_SIZE).execute().data or []
+            if not rows:
+                return by_user
+            for row in rows:
+                by_user.setdefault(row['user_id'], []).append(row)
+            last = [rows[-1][column] for column in HISTORY_PAGE_COLUMNS]
+
+    def iter_profile_chunks(self, chunk_size: Optional[int] = None,
+                            fields: Tuple[str, ...] = PROFILE_SCORE_FIELDS) -> Iterator[List[Dict[str, Any]]]:
+        """Stream profiles in user_id order, one keyset page at a time
+
+        Paging stops at the first page with no profiles rather than the first
+        short one, since the server may cap responses below ``chunk_size``.
+        """
+        size = max(1, chunk_size or HEALTH_SCORE_CHUNK_SIZE)
+        columns = ', '.join(('user_id', *fields))
+        last_user_id = None
+        while True:
+            query = self.supabase.table('financial_profiles').select(columns)
+            if last_user_id is not None:
+                query = query.gt('user_id', last_user_id)
+            rows = query.order('user_id').limit(size).execute().data or []
+            page = [row for row in rows if row.get('user_id')]
+            if not page:
+                return
+            yield page
+            last_user_id = page[-1]['user_id']
+
+    def score_chunk(self, profiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score a chunk of profile rows at once"""
+        columns = [[float(profile.get(field) or 0) for profile in profiles] for field in PROFILE_SCORE_FIELDS]
+        result = score_profiles(*columns)
+        return [
+            score_row(
+                profile['user_id'],
+                result['overall_score'][index],
+                {component: result['scores'][component][index] for component in SCORE_COMPONENTS}
+            )
+            for index, profile in enumerate(profiles)
+        ]
+
+    def recompute_all(self, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        """Rescore every profile and bulk-insert the scores that changed"""
+        try:
+            start = time.perf_counter()
+            stats = {'profiles': 0, 'changed': 0, 'unchanged': 0, 'written': 0, 'failed': 0, 'chunks': 0}
+
+            for profiles in self.iter_profile_chunks(chunk_size):
+                rows = self.score_chunk(profiles)
+                latest = self.get_latest_scores([row['user_id'] for row in rows])
+                changed = [row for row in rows if scores_changed(row, latest.get(row['user_id']))]
+
+                if changed:
+                    written = self.bulk_writer.insert('financial_health_scores', changed)
+                    stats['written'] += written['written']
+                    stats['failed'] += written['failed_count']
+
+                stats['chunks'] += 1
+                stats['profiles'] += len(rows)
+                stats['changed'] += len(changed)
+                stats['unchanged'] += len(rows) - len(changed)
+
+            elapsed = time.perf_counter() - start
+            stats['elapsed_seconds'] = round(elapsed, 3)
+            stats['profiles_per_second'] = round(stats['profiles'] / elapsed, 1) if elapsed > 0 else None
+            logger.info(
+                f"Recomputed {stats['profiles']} health scores in {stats['elapsed_seconds']}s "
+                f"({stats['profiles_per_second']} profiles/s), {stats['written']} changed scores written"
+            )
+            return stats
+
+        except Exception as e:
+            logger.error(f"Error recomputing health scores: {e}")
+            return {'error': f'Error recomputing health scores: {str(e)}'}
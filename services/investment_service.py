@@ -6,7 +6,55 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, date
 from decimal import Decimal
 import math
+import os
 import logging
+import numpy as np
+from core.calculations import compound_growth_schedule, what_if_grid
+from core.monte_carlo import simulate_retirement, RETURN_DISTRIBUTIONS
+from core.portfolio import glide_path, draw_asset_growth, simulate_rebalancing, RISK_TOLERANCES, REBALANCING_STRATEGIES, ASSET_CLASSES
+from core.tax_tables import get_tax_table, evaluate_taxes
+from core.utils.cache import LRUTTLCache, memoize
+
+SCHEDULE_CACHE_MAX_ENTRIES = int(os.getenv('SCHEDULE_CACHE_MAX_ENTRIES', '256'))
+SCHEDULE_PAGE_MAX = int(os.getenv('SCHEDULE_PAGE_MAX', '600'))
+SCHEDULE_MAX_YEARS = 100
+WHAT_IF_GRID_MAX_CELLS = int(os.getenv('WHAT_IF_GRID_MAX_CELLS', '100000'))
+WHAT_IF_AXIS_MAX_POINTS = 1000
+TAX_CURVE_MAX_POINTS = 10000
+TAX_CONTRIBUTION_STEP = 1000
+MAX_401K_CONTRIBUTION = 23000  # 2024 limit
+REBALANCING_MAX_PATHS = int(os.getenv('REBALANCING_MAX_PATHS', '2000'))
+
+# Grid axis -> default values when a request leaves it out
+WHAT_IF_GRID_AXES = {
+    'income_multiplier': [1.0],
+    'expense_multiplier': [1.0],
+    'annual_return': [0.07],
+    'horizon_years': [10],
+}
+
+MEMO_MAX_ENTRIES = int(os.getenv('INVESTMENT_MEMO_MAX_ENTRIES', '1024'))
+MEMO_TTL_SECONDS = float(os.getenv('INVESTMENT_MEMO_TTL', '3600'))
+
+def memo_enabled() -> bool:
+    """INVESTMENT_MEMO_ENABLED=false turns off memoization of the pure calculations"""
+    return os.getenv('INVESTMENT_MEMO_ENABLED', 'true').lower() not in ('false', '0', 'no')
+
+def investment_memo(name: str):
+    """Memoize a pure InvestmentService calculation"""
+    return memoize(f'investment.{name}', MEMO_MAX_ENTRIES, MEMO_TTL_SECONDS, enabled=memo_enabled)
+
+# Full schedules keyed by their parameters; pages are sliced from these
+schedule_cache = LRUTTLCache('compound_schedules', SCHEDULE_CACHE_MAX_ENTRIES, ttl_seconds=3600)
+
+MEMOIZED_METHODS = ('calculate_asset_allocation', 'calculate_retirement_needs',
+                    'calculate_compound_interest', 'calculate_tax_optimization')
+
+def get_memo_stats() -> Dict[str, Any]:
+    """Hit/miss/eviction stats for each memoized calculation"""
+    stats = {name: getattr(InvestmentService, name).cache.get_stats() for name in MEMOIZED_METHODS}
+    stats['enabled'] = memo_enabled()
+    return stats
 
 class InvestmentService:
     """Investment service for portfolio management and calculations"""
@@ -14,29 +62,13 @@ class InvestmentService:
     def __init__(self):
         pass
     
+    @investment_memo('asset_allocation')
     def calculate_asset_allocation(self, age: int, risk_tolerance: str, investment_amount: float) -> Dict[str, Any]:
         """Calculate recommended asset allocation based on age and risk tolerance"""
         try:
-            # Base allocation rules
-            if risk_tolerance == "conservative":
-                stock_percentage = max(20, 100 - age)
-                bond_percentage = min(80, age + 20)
-                cash_percentage = 10
-            elif risk_tolerance == "aggressive":
-                stock_percentage = max(80, 100 - age + 10)
-                bond_percentage = min(20, age - 10)
-                cash_percentage = 5
-            else:  # moderate
-                stock_percentage = max(60, 100 - age)
-                bond_percentage = min(40, age)
-                cash_percentage = 5
-            
-            # Ensure percentages add up to 100
-            total = stock_percentage + bond_percentage + cash_percentage
-            if total != 100:
-                stock_percentage = int(stock_percentage * 100 / total)
-                bond_percentage = int(bond_percentage * 100 / total)
-                cash_percentage = 100 - stock_percentage - bond_percentage
+            stock_percentage, bond_percentage, cash_percentage = (
+                int(value) for value in glide_path([age], risk_tolerance)[0]
+            )
             
             # Calculate dollar amounts
             stock_amount = investment_amount * stock_percentage / 100
@@ -80,6 +112,80 @@ class InvestmentService:
         
         return recommendations
     
+    def get_glide_path(self, current_age: int, retirement_age: int, risk_tolerance: Optional[str] = None,
+                       investment_amount: float = 0, rebalancing: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Allocation for every year until retirement, optionally with a rebalancing simulation
+
+        Without ``risk_tolerance`` every tolerance's path is returned.
+        ``rebalancing`` options: strategies (default calendar, threshold and
+        none), threshold, frequency_months, paths and seed; the simulation
+        follows the requested (or moderate) path.
+        """
+        try:
+            current_age, retirement_age = int(current_age), int(retirement_age)
+            if retirement_age <= current_age:
+                return {'error': 'Retirement age must be greater than current age'}
+            if risk_tolerance is not None and risk_tolerance not in RISK_TOLERANCES:
+                return {'error': f"Risk tolerance must be one of: {', '.join(RISK_TOLERANCES)}"}
+            
+            ages = np.arange(current_age, retirement_age + 1)
+            paths = {}
+            for tolerance in ([risk_tolerance] if risk_tolerance else RISK_TOLERANCES):
+                percentages = glide_path(ages, tolerance)
+                paths[tolerance] = {
+                    f'{asset}_percentage': percentages[:, column].tolist()
+                    for column, asset in enumerate(ASSET_CLASSES)
+                }
+                if investment_amount:
+                    paths[tolerance].update({
+                        f'{asset}_amount': (percentages[:, column] * float(investment_amount) / 100).round(2).tolist()
+                        for column, asset in enumerate(ASSET_CLASSES)
+                    })
+            
+            result = {'ages': ages.tolist(), 'glide_paths': paths}
+            if rebalancing is not None:
+                result['rebalancing'] = self._simulate_glide_path_rebalancing(
+                    glide_path(ages[:-1], risk_tolerance or 'moderate'), rebalancing
+                )
+                result['rebalancing']['risk_tolerance'] = risk_tolerance or 'moderate'
+            return result
+            
+        except Exception as e:
+            return {'error': f'Error building glide path: {str(e)}'}
+    
+    def _simulate_glide_path_rebalancing(self, targets: np.ndarray, options: Dict[str, Any]) -> Dict[str, Any]:
+        """Compare rebalancing strategies over one glide path on the same return paths"""
+        strategies = options.get('strategies') or list(REBALANCING_STRATEGIES)
+        unknown = [strategy for strategy in strategies if strategy not in REBALANCING_STRATEGIES]
+        if unknown:
+            raise ValueError(f"Rebalancing strategies must be among: {', '.join(REBALANCING_STRATEGIES)}")
+        paths = int(options.get('paths', 500))
+        if not 0 < paths <= REBALANCING_MAX_PATHS:
+            raise ValueError(f'Paths must be between 1 and {REBALANCING_MAX_PATHS}')
+        seed = options.get('seed', 0)
+        
+        # One set of return draws shared by every strategy, so they see identical markets
+        growth = draw_asset_growth(len(targets) * 12, paths, seed=None if seed is None else int(seed))
+        results = {}
+        for strategy in strategies:
+            simulation = simulate_rebalancing(
+                targets, strategy,
+                threshold=float(options.get('threshold', 0.05)),
+                frequency_months=int(options.get('frequency_months', 12)),
+                growth=growth
+            )
+            results[strategy] = {
+                'drift': simulation['drift'].round(4).tolist(),
+                'max_drift': simulation['max_drift'].round(4).tolist(),
+                'turnover': simulation['turnover'].round(4).tolist(),
+                'rebalances_per_year': simulation['rebalances'].round(2).tolist(),
+                'average_drift': round(float(simulation['drift'].mean()), 4),
+                'total_turnover': round(float(simulation['total_turnover'].mean()), 4),
+                'median_growth': round(float(np.median(simulation['growth'])), 4)
+            }
+        return {'paths': paths, 'seed': seed, 'strategies': results}
+    
+    @investment_memo('retirement_needs')
     def calculate_retirement_needs(self, current_age: int, retirement_age: int, current_savings: float, 
                                  monthly_income: float, desired_retirement_income: float) -> Dict[str, Any]:
         """Calculate retirement savings needs and recommendations"""
@@ -138,6 +244,46 @@ class InvestmentService:
         except Exception as e:
             return {'error': f'Error calculating retirement needs: {str(e)}'}
     
+    def simulate_retirement_monte_carlo(self, current_age: int, retirement_age: int, current_savings: float,
+                                        monthly_income: float, desired_retirement_income: float,
+                                        monthly_contribution: Optional[float] = None, annual_return: float = 0.07,
+                                        annual_volatility: float = 0.15, distribution: str = 'normal',
+                                        paths: int = 10000, seed: Optional[int] = None) -> Dict[str, Any]:
+        """Retirement plan with Monte Carlo returns instead of a fixed 7% assumption
+
+        Contributions default to the deterministic plan's monthly amount, so the
+        success probability shows how likely that plan is to reach its target.
+        """
+        try:
+            plan = self.calculate_retirement_needs(current_age, retirement_age, current_savings,
+                                                   monthly_income, desired_retirement_income)
+            if 'error' in plan:
+                return plan
+
+            if distribution not in RETURN_DISTRIBUTIONS:
+                return {'error': f"Distribution must be one of: {', '.join(RETURN_DISTRIBUTIONS)}"}
+
+            if monthly_contribution is None:
+                monthly_contribution = plan['monthly_contribution_needed']
+
+            plan['monte_carlo'] = simulate_retirement(
+                current_savings=float(current_savings),
+                monthly_contribution=float(monthly_contribution),
+                years=plan['years_to_retirement'],
+                target_balance=plan['total_needed'],
+                annual_return=float(annual_return),
+                annual_volatility=float(annual_volatility),
+                distribution=distribution,
+                paths=int(paths),
+                seed=None if seed is None else int(seed)
+            )
+            plan['monte_carlo']['monthly_contribution'] = float(monthly_contribution)
+            return plan
+
+        except Exception as e:
+            return {'error': f'Error simulating retirement: {str(e)}'}
+    
+    @investment_memo('compound_interest')
     def calculate_compound_interest(self, principal: float, monthly_contribution: float, 
                                   annual_rate: float, years: int) -> Dict[str, Any]:
         """Calculate compound interest growth"""
@@ -170,67 +316,94 @@ class InvestmentService:
         except Exception as e:
             return {'error': f'Error calculating compound interest: {str(e)}'}
     
+    def get_compound_interest_schedule(self, principal: float, monthly_contribution: float, annual_rate: float,
+                                       years: int, offset: int = 0, limit: int = 120) -> Dict[str, Any]:
+        """Month-by-month balance, contributions and interest, one page at a time"""
+        try:
+            years = int(years)
+            if not 0 < years <= SCHEDULE_MAX_YEARS:
+                return {'error': f'Years must be between 1 and {SCHEDULE_MAX_YEARS}'}
+            offset = max(0, int(offset))
+            limit = max(1, min(int(limit), SCHEDULE_PAGE_MAX))
+
+            key = (float(principal), float(monthly_contribution), float(annual_rate), years)
+            found, schedule = schedule_cache.get(key)
+            if not found:
+                schedule = compound_growth_schedule(key[0], key[1], key[2], years * 12)
+                schedule_cache.set(key, schedule)
+
+            total_months = years * 12
+            end = min(offset + limit, total_months)
+            rows = [{
+                'month': month + 1,
+                'year': month // 12 + 1,
+                'balance': round(float(schedule['balance'][month]), 2),
+                'contributions': round(float(schedule['contributions'][month]), 2),
+                'interest': round(float(schedule['interest'][month]), 2),
+                'total_interest': round(float(schedule['total_interest'][month]), 2)
+            } for month in range(offset, end)]
+
+            return {
+                'schedule': rows,
+                'offset': offset,
+                'limit': limit,
+                'total_months': total_months,
+                'next_offset': end if end < total_months else None,
+                'final_balance': round(float(schedule['balance'][-1]), 2)
+            }
+
+        except Exception as e:
+            return {'error': f'Error building compound interest schedule: {str(e)}'}
+    
+    @investment_memo('tax_optimization')
     def calculate_tax_optimization(self, income: float, filing_status: str, 
-                                 deductions: float = 0, credits: float = 0) -> Dict[str, Any]:
+                                 deductions: float = 0, credits: float = 0,
+                                 tax_year: Optional[int] = None) -> Dict[str, Any]:
         """Calculate tax optimization strategies"""
         try:
-            # 2024 tax brackets (single filer)
-            tax_brackets = [
-                (0, 11000, 0.10),
-                (11000, 44725, 0.12),
-                (44725, 95375, 0.22),
-                (95375, 182050, 0.24),
-                (182050, 231250, 0.32),
-                (231250, 578125, 0.35),
-                (578125, float('inf'), 0.37)
-            ]
-            
-            # Adjust brackets for different filing status
-            if filing_status == "married_joint":
-                # Rough adjustment - in practice, use exact brackets
-                tax_brackets = [(bracket[0] * 2, bracket[1] * 2, bracket[2]) for bracket in tax_brackets]
-            
-            # Calculate taxable income
-            standard_deduction = 13850  # 2024 single filer
-            if filing_status == "married_joint":
-                standard_deduction = 27700
+            table = get_tax_table(tax_year, filing_status)
+            standard_deduction = table.standard_deduction
             
             taxable_income = max(0, income - max(standard_deduction, deductions))
             
             # Calculate tax
-            total_tax = 0
-            tax_breakdown = []
-            
-            for bracket in tax_brackets:
-                if taxable_income <= bracket[0]:
-                    break
-                
-                bracket_income = min(taxable_income, bracket[1]) - bracket[0]
-                if bracket_income > 0:
-                    bracket_tax = bracket_income * bracket[2]
-                    total_tax += bracket_tax
-                    tax_breakdown.append({
-                        'bracket': f"{bracket[0]:,.0f} - {bracket[1]:,.0f}",
-                        'rate': f"{bracket[2]*100:.0f}%",
-                        'income': bracket_income,
-                        'tax': bracket_tax
-                    })
+            total_tax = table.tax(taxable_income)
+            tax_breakdown = [{
+                'bracket': f"{row['floor']:,.0f} - {row['ceiling']:,.0f}",
+                'rate': f"{row['rate']*100:.0f}%",
+                'income': row['income'],
+                'tax': row['tax']
+            } for row in table.breakdown(taxable_income)]
             
             # Apply credits
             final_tax = max(0, total_tax - credits)
             effective_rate = final_tax / income if income > 0 else 0
-            marginal_rate = tax_brackets[-1][2]  # Highest bracket rate
+            marginal_rate = table.marginal_rate(taxable_income) if income >= max(standard_deduction, deductions) else 0
+            
+            # Tax saved by each candidate pre-tax 401k contribution, evaluated in one pass
+            contributions = np.arange(0, min(MAX_401K_CONTRIBUTION, max(0, income)) + 1, TAX_CONTRIBUTION_STEP, dtype=float)
+            candidates = evaluate_taxes(income - contributions, deductions, credits, table.year, filing_status)
+            contribution_analysis = [{
+                'contribution': float(contribution),
+                'final_tax': round(float(tax), 2),
+                'tax_saved': round(final_tax - float(tax), 2)
+            } for contribution, tax in zip(contributions, candidates['final_tax'])]
             
             # Optimization recommendations
             recommendations = []
             if effective_rate > 0.20:
                 recommendations.append("Consider maxing out 401k contributions to reduce taxable income")
+            if marginal_rate >= 0.22:
+                recommendations.append(f"Each pre-tax dollar saved avoids {marginal_rate*100:.0f}% federal tax")
             if income > 100000:
                 recommendations.append("Consider Roth IRA conversions in lower income years")
             if deductions < standard_deduction:
                 recommendations.append("Consider itemizing deductions if they exceed standard deduction")
             
             return {
+                'tax_year': table.year,
+                'filing_status': filing_status,
+                'standard_deduction': standard_deduction,
                 'taxable_income': taxable_income,
                 'total_tax': total_tax,
                 'credits': credits,
@@ -238,12 +411,44 @@ class InvestmentService:
                 'effective_rate': effective_rate,
                 'marginal_rate': marginal_rate,
                 'tax_breakdown': tax_breakdown,
+                'contribution_analysis': contribution_analysis,
                 'recommendations': recommendations
             }
             
         except Exception as e:
             return {'error': f'Error calculating tax optimization: {str(e)}'}
     
+    def calculate_tax_curve(self, filing_status: str = 'single', tax_year: Optional[int] = None,
+                            incomes: Optional[List[float]] = None, deductions: Any = 0,
+                            credits: float = 0) -> Dict[str, Any]:
+        """Tax, effective and marginal rates over many incomes or candidate deductions
+
+        ``incomes`` and ``deductions`` may each be a number or a list; lists
+        must have the same length (or one of them a single value).
+        """
+        try:
+            if incomes is None:
+                incomes = list(range(0, 500001, 5000))
+            incomes = np.atleast_1d(np.asarray(incomes, dtype=float))
+            deductions = np.asarray(deductions, dtype=float)
+            size = np.broadcast_shapes(incomes.shape, deductions.shape)[0]
+            if size > TAX_CURVE_MAX_POINTS:
+                return {'error': f'At most {TAX_CURVE_MAX_POINTS} points per curve'}
+
+            result = evaluate_taxes(incomes, deductions, credits, tax_year, filing_status)
+            table = get_tax_table(tax_year, filing_status)
+            return {
+                'tax_year': table.year,
+                'filing_status': filing_status,
+                'standard_deduction': table.standard_deduction,
+                'income': np.broadcast_to(incomes, (size,)).tolist(),
+                'deductions': np.broadcast_to(deductions, (size,)).tolist(),
+                **{name: np.round(values, 4 if name.endswith('rate') else 2).tolist() for name, values in result.items()}
+            }
+
+        except Exception as e:
+            return {'error': f'Error calculating tax curve: {str(e)}'}
+    
     def calculate_what_if_scenarios(self, base_income: float, base_expenses: float, 
                                   scenarios: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calculate what-if scenarios for financial planning"""
@@ -290,6 +495,74 @@ class InvestmentService:
         except Exception as e:
             return {'error': f'Error calculating what-if scenarios: {str(e)}'}
     
+    def calculate_what_if_grid(self, base_income: float, base_expenses: float,
+                               grid: Dict[str, Any]) -> Dict[str, Any]:
+        """Evaluate every combination of income, expense, return and horizon values
+
+        Each axis in ``grid`` is a list of values or a range
+        ``{'start', 'stop', 'num'}`` / ``{'start', 'stop', 'step'}`` (stop inclusive).
+        Metrics are nested lists indexed in ``dimensions`` order; cells where
+        the emergency fund is never reached are null.
+        """
+        try:
+            axes = {}
+            for name, default in WHAT_IF_GRID_AXES.items():
+                axes[name] = self._grid_axis((grid or {}).get(name), default)
+                if axes[name].size == 0:
+                    return {'error': f'Grid axis {name} has no values'}
+
+            cells = math.prod(axis.size for axis in axes.values())
+            if cells > WHAT_IF_GRID_MAX_CELLS:
+                return {'error': f'Grid has {cells} cells; the maximum is {WHAT_IF_GRID_MAX_CELLS}'}
+
+            results = what_if_grid(
+                float(base_income), float(base_expenses),
+                axes['income_multiplier'], axes['expense_multiplier'],
+                axes['annual_return'], axes['horizon_years']
+            )
+
+            return {
+                'dimensions': list(WHAT_IF_GRID_AXES),
+                'axes': {name: axis.tolist() for name, axis in axes.items()},
+                'cells': cells,
+                'base_scenario': {
+                    'income': base_income,
+                    'expenses': base_expenses,
+                    'monthly_savings': base_income - base_expenses
+                },
+                'metrics': {name: self._grid_to_list(values) for name, values in results.items()}
+            }
+
+        except Exception as e:
+            return {'error': f'Error calculating what-if grid: {str(e)}'}
+    
+    def _grid_axis(self, spec: Any, default: List[float]) -> np.ndarray:
+        """Turn a list or start/stop range spec into axis values"""
+        if spec is None:
+            return np.asarray(default, dtype=np.float64)
+        if isinstance(spec, dict):
+            start, stop = float(spec['start']), float(spec['stop'])
+            if 'num' in spec:
+                num = int(spec['num'])
+            else:
+                step = float(spec['step'])
+                if step <= 0:
+                    raise ValueError('Range step must be positive')
+                num = int(math.floor(abs(stop - start) / step + 1e-9)) + 1
+                stop = start + (num - 1) * step * (1 if stop >= start else -1)
+            if not 0 < num <= WHAT_IF_AXIS_MAX_POINTS:
+                raise ValueError(f'Range must have between 1 and {WHAT_IF_AXIS_MAX_POINTS} points')
+            return np.linspace(start, stop, num)
+        if isinstance(spec, (int, float)):
+            spec = [spec]
+        return np.asarray(spec, dtype=np.float64)[:WHAT_IF_AXIS_MAX_POINTS]
+    
+    def _grid_to_list(self, values: np.ndarray) -> List[Any]:
+        """Round to cents and replace non-finite cells with None for JSON"""
+        rounded = np.round(values, 2).astype(object)
+        rounded[~np.isfinite(values)] = None
+        return rounded.tolist()
+    
     def get_investment_recommendations(self, age: int, income: float, risk_tolerance: str, 
                                      current_investments: float = 0) -> Dict[str, Any]:
         """Get personalized investment recommendations"""
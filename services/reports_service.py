@@ -6,7 +6,7 @@ import os
 import io
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -18,6 +18,8 @@ import plotly.express as px
 import base64
 from io import BytesIO
 import logging
+from core.utils.money import from_cents
+from core.transaction_frame import TransactionFrame
 
 class ReportsService:
     """Reports service for generating PDF reports and Excel exports"""
@@ -166,7 +168,7 @@ class ReportsService:
     def generate_excel_export(self, user_profile: Dict[str, Any], 
                              savings_goals: List[Dict[str, Any]], 
                              transactions: List[Dict[str, Any]]) -> bytes:
-        """Generate Excel export of financial data"""
+        """Generate Excel export of financial data (full transaction rows, not a frame)"""
         try:
             # Create Excel writer
             output = io.BytesIO()
@@ -256,7 +258,7 @@ class ReportsService:
     
     def generate_email_summary(self, user_profile: Dict[str, Any], 
                               savings_goals: List[Dict[str, Any]], 
-                              recent_transactions: List[Dict[str, Any]]) -> Dict[str, Any]:
+                              recent_transactions: Union[List[Dict[str, Any]], TransactionFrame]) -> Dict[str, Any]:
         """Generate email summary for user"""
         try:
             # Calculate key metrics
@@ -276,12 +278,11 @@ class ReportsService:
             goals_progress = (achieved_goals / total_goals * 100) if total_goals > 0 else 0
             
             # Recent spending analysis
-            spending_by_category = {}
-            for transaction in recent_transactions:
-                if transaction.get('transaction_type') == 'expense':
-                    category = transaction.get('category', 'Other')
-                    amount = transaction.get('amount', 0)
-                    spending_by_category[category] = spending_by_category.get(category, 0) + amount
+            expenses = TransactionFrame.coerce(recent_transactions).of_type('expense')
+            spending_by_category = {
+                category: from_cents(cents)
+                for category, cents in expenses.sum_by_category('Other').items()
+            }
             
             # Generate insights
             insights = []
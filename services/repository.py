@@ -0,0 +1,93 @@
+"""
+Typed repository for BusinessThis
+Each use case declares the columns, ordering and row limit it reads, so only
+those are fetched, and reads can return model objects instead of raw dicts
+"""
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple, Type, TypeVar, Callable
+import logging
+from config.supabase_config import get_supabase_client
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar('ModelT')
+
+@dataclass(frozen=True)
+class ReadSpec:
+    """The columns, ordering and row limit one use case reads from a table"""
+    table: str
+    columns: Tuple[str, ...]
+    order_by: Tuple[Tuple[str, bool], ...] = ()  # (column, descending)
+    limit: Optional[int] = None
+
+    @property
+    def select(self) -> str:
+        return ', '.join(self.columns)
+
+    def apply(self, query, limit: Optional[int] = None):
+        """Add this spec's ordering and limit (capped at the spec's own limit) to a filtered query"""
+        for column, descending in self.order_by:
+            query = query.order(column, desc=descending)
+        if limit is not None and self.limit is not None:
+            limit = min(limit, self.limit)
+        limit = limit if limit is not None else self.limit
+        return query.limit(limit) if limit is not None else query
+
+# Column sets shared by several reads
+USER_COLUMNS = ('id', 'email', 'full_name', 'subscription_tier', 'subscription_status', 'subscription_expires_at',
+                'ai_usage_count', 'ai_usage_limit', 'created_at', 'updated_at', 'last_login', 'is_active')
+PROFILE_COLUMNS = ('id', 'user_id', 'monthly_income', 'fixed_expenses', 'variable_expenses', 'emergency_fund_target',
+                   'emergency_fund_current', 'total_debt', 'credit_score', 'risk_tolerance', 'age', 'retirement_age',
+                   'created_at', 'updated_at')
+GOAL_COLUMNS = ('id', 'user_id', 'name', 'target_amount', 'current_amount', 'target_date', 'monthly_contribution',
+                'priority', 'is_achieved', 'achieved_at', 'created_at', 'updated_at')
+TRANSACTION_COLUMNS = ('id', 'user_id', 'amount', 'description', 'category', 'transaction_type', 'date',
+                       'account_name', 'is_recurring', 'recurring_frequency')
+SUBSCRIPTION_COLUMNS = ('id', 'user_id', 'stripe_subscription_id', 'paypal_subscription_id', 'plan_name', 'status', 'current_period_start', 'current_period_end',
+                        'cancel_at_period_end', 'created_at')
+
+# Reads by use case
+USER = ReadSpec('users', USER_COLUMNS, limit=1)
+USER_SUBSCRIPTION_STATUS = ReadSpec('users', ('subscription_tier', 'subscription_status', 'subscription_expires_at',
+                                              'ai_usage_count', 'ai_usage_limit'), limit=1)
+FINANCIAL_PROFILE = ReadSpec('financial_profiles', PROFILE_COLUMNS, limit=1)
+SAVINGS_GOALS = ReadSpec('savings_goals', GOAL_COLUMNS, order_by=(('priority', False),))
+RECENT_TRANSACTIONS = ReadSpec('transactions', TRANSACTION_COLUMNS, order_by=(('date', True), ('id', True)), limit=100)
+TRANSACTION_EXPORT = ReadSpec('transactions', TRANSACTION_COLUMNS, order_by=(('date', True), ('id', True)), limit=1000)
+LATEST_SUBSCRIPTION = ReadSpec('subscriptions', SUBSCRIPTION_COLUMNS, order_by=(('created_at', True),), limit=1)
+SUBSCRIPTION_LIST = ReadSpec('subscriptions', SUBSCRIPTION_COLUMNS, order_by=(('created_at', True),), limit=1000)
+RECENT_AI_USAGE = ReadSpec('ai_usage', ('id', 'request_type', 'tokens_used', 'cost', 'created_at'),
+                           order_by=(('created_at', True),), limit=100)
+SUPPORT_TICKETS = ReadSpec('support_tickets', ('id', 'user_id', 'subject', 'message', 'status', 'response',
+                                               'created_at', 'updated_at'),
+                           order_by=(('created_at', True),), limit=500)
+
+class Repository:
+    """Synchronous reads described by ``ReadSpec``s
+
+    ``filters`` are equality filters; ``build`` can narrow the query further
+    (ranges, ``in_`` lists) before the spec's ordering and limit are applied.
+    """
+
+    def __init__(self, client=None):
+        self.supabase = client or get_supabase_client()
+
+    def fetch(self, spec: ReadSpec, limit: Optional[int] = None,
+              build: Optional[Callable[[Any], Any]] = None, **filters: Any) -> List[Dict[str, Any]]:
+        """Rows matching ``filters``, limited to the spec's columns, order and limit"""
+        query = self.supabase.table(spec.table).select(spec.select)
+        for column, value in filters.items():
+            query = query.eq(column, value)
+        if build:
+            query = build(query)
+        return spec.apply(query, limit).execute().data or []
+
+    def fetch_one(self, spec: ReadSpec, **filters: Any) -> Optional[Dict[str, Any]]:
+        """First matching row, or None"""
+        rows = self.fetch(spec, limit=1, **filters)
+        return rows[0] if rows else None
+
+    def fetch_models(self, spec: ReadSpec, model: Type[ModelT], limit: Optional[int] = None,
+                     **filters: Any) -> List[ModelT]:
+        """Matching rows converted with ``model.from_dict``"""
+        return [model.from_dict(row) for row in self.fetch(spec, limit, **filters)]
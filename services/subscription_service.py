@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 import stripe
 import os
 from config.supabase_config import get_supabase_client
+from services.repository import Repository, USER_SUBSCRIPTION_STATUS, LATEST_SUBSCRIPTION
 import logging
 
 class SubscriptionService:
@@ -13,6 +14,7 @@ class SubscriptionService:
     
     def __init__(self):
         self.supabase = get_supabase_client()
+        self.repository = Repository(self.supabase)
         
         # Initialize Stripe
         stripe.api_key = os.getenv('STRIPE_SECRET_KEY')
@@ -22,18 +24,12 @@ class SubscriptionService:
         """Get user's subscription status"""
         try:
             # Get user data
-            user_result = self.supabase.table('users').select('*').eq('id', user_id).execute()
-            if not user_result.data:
+            user_data = self.repository.fetch_one(USER_SUBSCRIPTION_STATUS, id=user_id)
+            if not user_data:
                 return {'error': 'User not found'}
             
-            user_data = user_result.data[0]
-            
-            # Get subscription details
-            subscription_result = self.supabase.table('subscriptions').select('*').eq('user_id', user_id).order('created_at', desc=True).execute()
-            
-            subscription_data = None
-            if subscription_result.data:
-                subscription_data = subscription_result.data[0]
+            # Get the latest subscription's details
+            subscription_data = self.repository.fetch_one(LATEST_SUBSCRIPTION, user_id=user_id)
             
             return {
                 'user_id': user_id,
@@ -225,12 +221,10 @@ class SubscriptionService:
         """Cancel user's subscription"""
         try:
             # Get subscription record
-            subscription_result = self.supabase.table('subscriptions').select('*').eq('user_id', user_id).eq('status', 'active').execute()
+            subscription_data = self.repository.fetch_one(LATEST_SUBSCRIPTION, user_id=user_id, status='active')
             
-            if not subscription_result.data:
+            if not subscription_data:
                 return {'error': 'No active subscription found'}
-            
-            subscription_data = subscription_result.data[0]
             stripe_subscription_id = subscription_data['stripe_subscription_id']
             
             # Cancel in Stripe